@@ -1,78 +1,55 @@
 import os
 import json
-import kaggle
-import sqlite3
-import pandas as pd
-from dotenv import load_dotenv
-
-def setup_kaggle_credentials():
-    """Configure Kaggle API credentials from environment variables"""
-    load_dotenv()
-    os.environ['KAGGLE_USERNAME'] = os.getenv('KAGGLE_USERNAME')
-    os.environ['KAGGLE_KEY'] = os.getenv('KAGGLE_KEY')
-
-def safe_cleanup(directory):
-    """Safely cleanup files in directory"""
-    if not os.path.exists(directory):
-        return
-        
-    for file in os.listdir(directory):
-        file_path = os.path.join(directory, file)
-        try:
-            if os.path.isfile(file_path):
-                os.remove(file_path)
-            elif os.path.isdir(file_path):
-                os.rmdir(file_path)
-        except PermissionError:
-            print(f"Warning: Could not remove {file_path} due to permissions")
-        except Exception as e:
-            print(f"Warning: Failed to remove {file_path}: {str(e)}")
-
-
-def download_and_process():
-    """Download dataset from Kaggle and upload to S3"""
-    tmp_path = '/tmp/nba.sqlite'
-    
-    # Download dataset
-    kaggle.api.dataset_download_file(
-        'wyattowalsh/basketball',
-        'nba.sqlite',
-        path='/tmp',
-        unzip=True 
-    )
-    
-    # Process SQLite file if needed
-    conn = sqlite3.connect(tmp_path)
-    
-    # Verify table exists
-    cursor = conn.cursor()
-    cursor.execute("SELECT count(*) FROM sqlite_master WHERE type='table' AND name='game'")
-    if cursor.fetchone()[0] == 0:
-        raise ValueError("The 'game' table does not exist in the database")
-    
-    # Get table info for verification
-    cursor.execute("PRAGMA table_info(game)")
-    columns = cursor.fetchall()
-    if not columns:
-        raise ValueError("The 'game' table appears to be empty or corrupted")
-    
-    # Read data
-    query = "SELECT * FROM game"
-    df = pd.read_sql_query(query, conn)
-    
-    if df.empty:
-        raise ValueError("No data retrieved from the game table")
-
-    conn.close()
-    
-    return tmp_path
+import tempfile
 
+# The Lambda runs the same nba_analytics pipeline as the backend, installed into the deployment package
+# from requirements.txt
+from nba_analytics.db_utils import data_update_from_kaggle
+from nba_analytics.artifacts import open_object_store, precompute_and_publish
 
+def setup_kaggle_credentials():
+    """Configure Kaggle API credentials from environment variables, or a .env file when python-dotenv is available"""
+    try:
+        from dotenv import load_dotenv
+        load_dotenv()
+    except ImportError:
+        pass
+    for name in ('KAGGLE_USERNAME', 'KAGGLE_KEY'):
+        if not os.getenv(name):
+            raise ValueError(f"{name} is not set")
+
+def download_and_process(store, work_dir):
+    """
+    Download the Kaggle dataset, run the full parsing pipeline and publish the resulting artifact
+
+    Args:
+        store: Object store the artifact is published to
+        work_dir: Scratch directory, Lambda only allows writes below /tmp
+
+    Returns:
+        Tuple of (manifest, published), published is False when the store already held this version
+    """
+    game_database = data_update_from_kaggle(data_dir=os.path.join(work_dir, 'kaggle'))
+    artifact_dir = os.path.join(work_dir, 'artifact')
+    os.makedirs(artifact_dir, exist_ok=True)
+    return precompute_and_publish(game_database, store, artifact_dir)
 
 def lambda_handler(event, context):
-    # Download the dataset
+    """
+    Publish a ready-to-serve artifact (decade.sqlite, decade.json and their manifest) to the store
+    named by NBA_ARTIFACT_STORE, e.g. s3://bucket/prefix. Backends configured with the same store
+    install it by swapping in one file instead of parsing the games themselves.
+    """
+    setup_kaggle_credentials()
+
+    location = (event or {}).get('artifact_store') or os.environ['NBA_ARTIFACT_STORE']
+    with tempfile.TemporaryDirectory(dir='/tmp' if os.path.isdir('/tmp') else None) as work_dir:
+        manifest, published = download_and_process(open_object_store(location), work_dir)
 
     return {
         'statusCode': 200,
-        'body': json.dumps('Hello from Lambda!')
+        'body': json.dumps({'published': published, 'manifest': manifest})
     }
+
+if __name__ == "__main__":
+    print(lambda_handler({}, None))
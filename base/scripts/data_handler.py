@@ -1,6 +1,5 @@
 import os
-from decade_parser import parse_decade_data
-from db_utils import verify_file, data_update_from_kaggle, load_data_to_db, extract_data_from_db
+from nba_analytics.db_utils import verify_file, data_update_from_kaggle, load_data_to_db, extract_data_from_db
 
 dirname = os.path.dirname(__file__)
 db_folder_path = os.path.abspath(os.path.join(dirname, "../db"))
@@ -23,7 +22,9 @@ def fetch_decade_data():
     return decade_content
 
 def force_kaggle_update():
-    game_database = data_update_from_kaggle()   
+    from nba_analytics.decade_parser import parse_decade_data
+
+    game_database = data_update_from_kaggle(data_dir=os.path.join(db_folder_path, "temporary_kaggle_files"))
     game_db_2010s = parse_decade_data(game_database)
     
     load_data_to_db(game_db_2010s, db_path)
@@ -31,4 +32,4 @@ def force_kaggle_update():
 
 if __name__ == "__main__":
     decade_content = fetch_decade_data()
-    print(decade_content)
\ No newline at end of file
+    print(decade_content)
@@ -0,0 +1,9 @@
+"""
+Parsing, storage and statistics engine shared by the Django backend, the scripts in base/scripts
+and the precompute Lambda.
+
+Importing the package, or the modules the API reads through (seasons, db_utils, decade_table, jobs,
+artifacts, instrumentation, cache), only loads the standard library. numpy, pandas and kaggle are
+imported by the functions that need them: the parser (decade_parser), the statistics (conference_stats,
+clustering) and the Kaggle download in db_utils.data_update_from_kaggle.
+"""
@@ -0,0 +1,238 @@
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+import time
+from urllib.request import pathname2url
+from .db_utils import (
+    load_data_to_db,
+    extract_decade_table,
+    shadow_database,
+    bump_data_generation
+)
+from .jobs import NO_PROGRESS
+
+# Bumped whenever the artifact layout changes, backends refuse manifests of another format
+ARTIFACT_FORMAT = 1
+
+# Key of the manifest describing the most recently published artifact, written last so it only ever
+# points at files that are already complete
+LATEST_MANIFEST_KEY = 'latest.json'
+
+ARTIFACT_FILES = ('decade.sqlite', 'decade.json')
+
+ARTIFACT_INFO_SCHEMA = "CREATE TABLE IF NOT EXISTS ArtifactInfo (key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+
+class LocalObjectStore:
+    """Object store kept in a directory, used for local runs and tests in place of S3"""
+    def __init__(self, root):
+        self.root = root
+
+    def _path(self, key):
+        return os.path.join(self.root, *key.split('/'))
+
+    def put_file(self, key, path):
+        target = self._path(key)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        shutil.copyfile(path, target + '.partial')
+        os.replace(target + '.partial', target)
+
+    def get_file(self, key, path):
+        shutil.copyfile(self._path(key), path)
+
+    def put_bytes(self, key, data):
+        target = self._path(key)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        with open(target + '.partial', 'wb') as f:
+            f.write(data)
+        os.replace(target + '.partial', target)
+
+    def get_bytes(self, key):
+        """The object's content, None when it does not exist"""
+        try:
+            with open(self._path(key), 'rb') as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+class S3ObjectStore:
+    """
+    Object store in an S3 bucket under an optional key prefix.
+    boto3 is only imported when no client is passed in, so it stays an optional dependency of the backend.
+    """
+    def __init__(self, bucket, prefix='', client=None):
+        if client is None:
+            import boto3
+            client = boto3.client('s3')
+        self.client = client
+        self.bucket = bucket
+        self.prefix = prefix.strip('/')
+
+    def _key(self, key):
+        return f"{self.prefix}/{key}" if self.prefix else key
+
+    def put_file(self, key, path):
+        self.client.upload_file(path, self.bucket, self._key(key))
+
+    def get_file(self, key, path):
+        self.client.download_file(self.bucket, self._key(key), path)
+
+    def put_bytes(self, key, data):
+        self.client.put_object(Bucket=self.bucket, Key=self._key(key), Body=data)
+
+    def get_bytes(self, key):
+        """The object's content, None when it does not exist"""
+        try:
+            return self.client.get_object(Bucket=self.bucket, Key=self._key(key))['Body'].read()
+        except self.client.exceptions.NoSuchKey:
+            return None
+
+def open_object_store(location):
+    """
+    Object store for a location setting: 's3://bucket/prefix' or a local directory (optionally as a file:// URL)
+    """
+    if location.startswith('s3://'):
+        bucket, _, prefix = location[len('s3://'):].partition('/')
+        return S3ObjectStore(bucket, prefix)
+    return LocalObjectStore(location[len('file://'):] if location.startswith('file://') else location)
+
+def file_digest(path, chunk_size=2**20):
+    """(sha256 hex digest, size in bytes) of a file, read in chunks"""
+    digest = hashlib.sha256()
+    size = 0
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+            size += len(chunk)
+    return digest.hexdigest(), size
+
+def build_artifact(game_database, output_dir):
+    """
+    Run the full parsing pipeline and write a ready-to-serve artifact
+
+    Args:
+        game_database: Kaggle 'game' table frame, as read_game_table returns it
+        output_dir: Directory the artifact files are written to
+
+    Returns:
+        dict: The manifest. The version is derived from the parsed content, so rebuilding unchanged
+              source data yields the same version, and every file is listed with its size and sha256
+    """
+    from .decade_parser import process_filter_db, parse_range_data, compute_season_fingerprints
+
+    range_dataframe, team_objects, season_dates = process_filter_db(game_database)
+    seasons_dict = parse_range_data(range_dataframe, team_objects, season_dates)
+    fingerprints = compute_season_fingerprints(range_dataframe, season_dates)
+
+    db_path = os.path.join(output_dir, 'decade.sqlite')
+    load_data_to_db(seasons_dict, db_path, fingerprints)
+
+    # The same bytes /data/ serves, so a consumer without SQLite can use the artifact as is
+    decade_json = extract_decade_table(db_path).to_json()
+    with open(os.path.join(output_dir, 'decade.json'), 'wb') as f:
+        f.write(decade_json)
+
+    version = hashlib.sha256(decade_json).hexdigest()[:16]
+    created_at = time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+    # The database records which artifact it came from, so a backend can tell whether it is up to date
+    with sqlite3.connect(db_path) as conn:
+        conn.execute(ARTIFACT_INFO_SCHEMA)
+        conn.executemany(
+            "INSERT OR REPLACE INTO ArtifactInfo (key, value) VALUES (?, ?)",
+            [('version', version), ('created_at', created_at)]
+        )
+    conn.close()
+
+    files = {}
+    for name in ARTIFACT_FILES:
+        sha256, size = file_digest(os.path.join(output_dir, name))
+        files[name] = {'key': f"{version}/{name}", 'bytes': size, 'sha256': sha256}
+
+    return {
+        'format': ARTIFACT_FORMAT,
+        'version': version,
+        'created_at': created_at,
+        'seasons': [season for season, teams in seasons_dict.items() if teams],
+        'team_seasons': sum(len(teams) for teams in seasons_dict.values()),
+        'source_games': len(range_dataframe),
+        'files': files
+    }
+
+def publish_artifact(store, output_dir, manifest):
+    """
+    Upload the artifact files under their versioned keys, then its manifest, then the latest pointer.
+    Returns False without uploading anything when the latest artifact already has this version.
+    """
+    latest = read_latest_manifest(store)
+    if latest is not None and latest['version'] == manifest['version']:
+        return False
+
+    for name, entry in manifest['files'].items():
+        store.put_file(entry['key'], os.path.join(output_dir, name))
+    body = json.dumps(manifest, indent=2).encode()
+    store.put_bytes(f"{manifest['version']}/manifest.json", body)
+    store.put_bytes(LATEST_MANIFEST_KEY, body)
+    return True
+
+def read_latest_manifest(store):
+    """Manifest of the most recently published artifact, None when nothing was published yet"""
+    body = store.get_bytes(LATEST_MANIFEST_KEY)
+    if body is None:
+        return None
+    manifest = json.loads(body)
+    if manifest.get('format') != ARTIFACT_FORMAT:
+        raise ValueError(f"Unsupported artifact format {manifest.get('format')}, expected {ARTIFACT_FORMAT}")
+    return manifest
+
+def installed_artifact_version(db_path):
+    """Version of the artifact a decade database was installed from, None for locally built or missing files"""
+    if not os.path.exists(db_path):
+        return None
+    conn = sqlite3.connect(f"file:{pathname2url(os.path.abspath(db_path))}?mode=ro", uri=True)
+    try:
+        row = conn.execute("SELECT value FROM ArtifactInfo WHERE key = 'version'").fetchone()
+    except sqlite3.OperationalError:
+        return None
+    finally:
+        conn.close()
+    return row[0] if row else None
+
+def install_latest_artifact(store, db_path, progress=NO_PROGRESS):
+    """
+    Replace the decade database with the latest published artifact.
+    The file is downloaded next to the live one, checked against the manifest's size and sha256,
+    and swapped in with os.replace, so readers never see a partial or corrupt file.
+
+    Returns:
+        The installed manifest, or None when the database already holds the latest version
+    """
+    manifest = read_latest_manifest(store)
+    if manifest is None:
+        raise FileNotFoundError(f"No artifact has been published yet ({LATEST_MANIFEST_KEY} is missing)")
+    if installed_artifact_version(db_path) == manifest['version']:
+        return None
+
+    entry = manifest['files']['decade.sqlite']
+    with shadow_database(db_path) as shadow_path:
+        with progress.stage('download'):
+            store.get_file(entry['key'], shadow_path)
+        with progress.stage('load'):
+            sha256, size = file_digest(shadow_path)
+            if (sha256, size) != (entry['sha256'], entry['bytes']):
+                raise ValueError(f"Artifact {manifest['version']} failed verification: "
+                                 f"got {size} bytes with sha256 {sha256}, expected {entry['bytes']} bytes with {entry['sha256']}")
+
+    bump_data_generation()
+    print(f"Installed artifact {manifest['version']} into {db_path}")
+    return manifest
+
+def precompute_and_publish(game_database, store, work_dir):
+    """
+    Build the artifact for a game table in work_dir and publish it
+
+    Returns:
+        Tuple of (manifest, published), published is False when the store already held this version
+    """
+    manifest = build_artifact(game_database, work_dir)
+    return manifest, publish_artifact(store, work_dir, manifest)
@@ -0,0 +1,54 @@
+import threading
+from collections import OrderedDict
+
+class LRUCache:
+    """
+    Bounded, thread-safe least-recently-used memo.
+    Values are computed outside the cache lock, so a slow computation never blocks hits on other keys,
+    and under a per-key lock, so concurrent cold requests for one key share a single computation.
+    """
+    def __init__(self, maxsize=32):
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._key_locks = {}  # key -> lock held while the key is being computed
+
+    def _lookup(self, key):
+        # (found, value), the caller holds self._lock
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            return True, self._entries[key]
+        return False, None
+
+    def get_or_compute(self, key, compute):
+        with self._lock:
+            found, value = self._lookup(key)
+            if found:
+                return value
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            # Another thread may have computed the key while this one waited
+            with self._lock:
+                found, value = self._lookup(key)
+                if found:
+                    return value
+            try:
+                value = compute()
+                with self._lock:
+                    self._entries[key] = value
+                    self._entries.move_to_end(key)
+                    while len(self._entries) > self.maxsize:
+                        self._entries.popitem(last=False)
+            finally:
+                with self._lock:
+                    if self._key_locks.get(key) is key_lock:
+                        del self._key_locks[key]
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
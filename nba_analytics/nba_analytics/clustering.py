@@ -0,0 +1,131 @@
+import json
+import math
+import numpy as np
+
+# Features the clusters are built from, in centroid column order
+CLUSTER_FEATURES = ('relative_offensive_rating', 'relative_defensive_rating')
+
+DEFAULT_CLUSTERS = 4
+MAX_CLUSTERS = 10
+KMEANS_RESTARTS = 10
+KMEANS_MAX_ITERATIONS = 300
+KMEANS_TOLERANCE = 1e-10
+KMEANS_SEED = 0
+
+def squared_distances(points, centroids):
+    """(n, k) squared euclidean distances between every point and every centroid"""
+    return ((points[:, None, :] - centroids[None, :, :]) ** 2).sum(axis=2)
+
+def kmeans_plus_plus(points, k, rng):
+    """
+    Pick k initial centroids with k-means++ seeding: each new centroid is drawn
+    with probability proportional to its squared distance from the closest centroid so far
+    """
+    centroids = np.empty((k, points.shape[1]))
+    centroids[0] = points[rng.integers(len(points))]
+    closest = ((points - centroids[0]) ** 2).sum(axis=1)
+    for index in range(1, k):
+        total = closest.sum()
+        chosen = rng.choice(len(points), p=closest / total) if total > 0 else rng.integers(len(points))
+        centroids[index] = points[chosen]
+        closest = np.minimum(closest, ((points - centroids[index]) ** 2).sum(axis=1))
+    return centroids
+
+def _lloyd(points, centroids, max_iterations, tolerance):
+    k = len(centroids)
+    for _ in range(max_iterations):
+        labels = squared_distances(points, centroids).argmin(axis=1)
+        counts = np.bincount(labels, minlength=k)[:, None]
+        sums = np.stack(
+            [np.bincount(labels, weights=points[:, column], minlength=k) for column in range(points.shape[1])], axis=1
+        )
+        # An empty cluster keeps its previous centroid
+        updated = np.where(counts > 0, sums / np.maximum(counts, 1), centroids)
+        shift = ((updated - centroids) ** 2).sum()
+        centroids = updated
+        if shift <= tolerance:
+            break
+    distances = squared_distances(points, centroids)
+    labels = distances.argmin(axis=1)
+    return labels, centroids, distances[np.arange(len(points)), labels].sum()
+
+def kmeans(points, k, n_init=KMEANS_RESTARTS, max_iterations=KMEANS_MAX_ITERATIONS, tolerance=KMEANS_TOLERANCE, seed=KMEANS_SEED):
+    """
+    Vectorized k-means with k-means++ seeding, keeping the best of several restarts
+
+    Args:
+        points: (n, d) array of observations
+        k: Number of clusters, 1 <= k <= n
+        n_init: Number of independently seeded runs
+        max_iterations: Lloyd iterations per run
+        tolerance: Stop once the squared centroid movement falls below this
+        seed: Seed for the random generator, so results are reproducible
+
+    Returns:
+        Tuple of ((n,) labels, (k, d) centroids, inertia) for the run with the lowest inertia
+    """
+    points = np.asarray(points, dtype=np.float64)
+    if not 1 <= k <= len(points):
+        raise ValueError(f"k must be between 1 and the number of points ({len(points)})")
+
+    rng = np.random.default_rng(seed)
+    best = None
+    for _ in range(n_init):
+        result = _lloyd(points, kmeans_plus_plus(points, k, rng), max_iterations, tolerance)
+        if best is None or result[2] < best[2]:
+            best = result
+    return best
+
+def cluster_team_seasons(rows, k):
+    """
+    Cluster team-seasons on their relative offensive and defensive ratings
+
+    Args:
+        rows: Sequence of (season_id, team_name, conference, relative_offensive_rating, relative_defensive_rating)
+        k: Number of clusters
+
+    Returns:
+        Dictionary with the points and their cluster assignments, the centroids and the axis extents.
+        Clusters are numbered from the best relative net rating (offense minus defense) down.
+    """
+    points = np.array([row[3:] for row in rows], dtype=np.float64).reshape(len(rows), len(CLUSTER_FEATURES))
+    labels, centroids, inertia = kmeans(points, k)
+
+    order = np.argsort(-(centroids[:, 0] - centroids[:, 1]), kind='stable')
+    rank = np.empty(k, dtype=np.int64)
+    rank[order] = np.arange(k)
+    labels, centroids = rank[labels], centroids[order]
+    sizes = np.bincount(labels, minlength=k)
+
+    minimums, maximums = points.min(axis=0), points.max(axis=0)
+    return {
+        'k': k,
+        'features': list(CLUSTER_FEATURES),
+        'inertia': float(inertia),
+        'points': [
+            {
+                'team': team,
+                'season': season_id,
+                'conference': conference,
+                **{feature: float(value) for feature, value in zip(CLUSTER_FEATURES, point)},
+                'cluster': int(label)
+            }
+            for (season_id, team, conference, *_), point, label in zip(rows, points, labels)
+        ],
+        'centroids': [
+            {
+                'cluster': index,
+                'size': int(size),
+                **{feature: float(value) for feature, value in zip(CLUSTER_FEATURES, centroid)}
+            }
+            for index, (centroid, size) in enumerate(zip(centroids, sizes))
+        ],
+        'extents': {
+            feature: [math.floor(low), math.ceil(high)]
+            for feature, low, high in zip(CLUSTER_FEATURES, minimums, maximums)
+        }
+    }
+
+def encode_cluster_analysis(result):
+    """Compact JSON bytes for a cluster_team_seasons result, matching the API's JSON rendering"""
+    return json.dumps(result, ensure_ascii=False, allow_nan=False, separators=(',', ':')).encode()
@@ -0,0 +1,193 @@
+import math
+import numpy as np
+
+# Relative ratings compared between conferences, in the order the comparison table shows them
+COMPARISON_METRICS = ('relative_offensive_rating', 'relative_defensive_rating', 'relative_net_rating')
+
+# Continued fraction settings for the regularized incomplete beta function
+BETA_MAX_ITERATIONS = 300
+BETA_EPSILON = 1e-15
+BETA_TINY = 1e-300
+
+_lgamma = np.frompyfunc(math.lgamma, 1, 1)
+
+def _beta_continued_fraction(x, a, b):
+    """
+    Evaluate the continued fraction of the incomplete beta function with the modified Lentz method,
+    element-wise over equally shaped arrays. Iterates until every element has converged.
+    """
+    qab, qap, qam = a + b, a + 1.0, a - 1.0
+    c = np.ones_like(x)
+    d = 1.0 - qab * x / qap
+    d = np.where(np.abs(d) < BETA_TINY, BETA_TINY, d)
+    d = 1.0 / d
+    h = d.copy()
+    for m in range(1, BETA_MAX_ITERATIONS + 1):
+        m2 = 2 * m
+        for numerator in (m * (b - m) * x / ((qam + m2) * (a + m2)),
+                          -(a + m) * (qab + m) * x / ((a + m2) * (qap + m2))):
+            d = 1.0 + numerator * d
+            d = np.where(np.abs(d) < BETA_TINY, BETA_TINY, d)
+            c = 1.0 + numerator / c
+            c = np.where(np.abs(c) < BETA_TINY, BETA_TINY, c)
+            d = 1.0 / d
+            delta = d * c
+            h = h * delta
+        if np.all(np.abs(delta - 1.0) < BETA_EPSILON):
+            break
+    return h
+
+def regularized_incomplete_beta(x, a, b):
+    """
+    Regularized incomplete beta function I_x(a, b), vectorized over NumPy arrays
+
+    Args:
+        x: Points in [0, 1]
+        a, b: Positive shape parameters, broadcastable against x
+
+    Returns:
+        np.ndarray of I_x(a, b)
+    """
+    x, a, b = np.broadcast_arrays(*(np.asarray(value, dtype=np.float64) for value in (x, a, b)))
+    result = np.where(x >= 1.0, 1.0, 0.0)
+    inside = (x > 0.0) & (x < 1.0)
+    if not inside.any():
+        return result
+
+    x, a, b = x[inside], a[inside], b[inside]
+    log_front = (_lgamma(a + b) - _lgamma(a) - _lgamma(b)).astype(np.float64) \
+        + a * np.log(x) + b * np.log1p(-x)
+    front = np.exp(log_front)
+
+    # The continued fraction converges quickly only below (a + 1) / (a + b + 2), use the symmetry otherwise
+    direct = x < (a + 1.0) / (a + b + 2.0)
+    values = np.empty_like(x)
+    values[direct] = front[direct] * _beta_continued_fraction(x[direct], a[direct], b[direct]) / a[direct]
+    flipped = ~direct
+    values[flipped] = 1.0 - front[flipped] * _beta_continued_fraction(
+        1.0 - x[flipped], b[flipped], a[flipped]
+    ) / b[flipped]
+    result[inside] = values
+    return result
+
+def student_t_two_sided_p(t, df):
+    """
+    Two-sided p-value of Student's t distribution, P(|T| >= |t|) = I_{df / (df + t^2)}(df / 2, 1 / 2)
+
+    Args:
+        t: t statistics
+        df: Degrees of freedom (may be fractional, as in Welch's test)
+
+    Returns:
+        np.ndarray of p-values
+    """
+    t = np.asarray(t, dtype=np.float64)
+    df = np.asarray(df, dtype=np.float64)
+    return regularized_incomplete_beta(df / (df + t * t), df / 2.0, 0.5)
+
+def welch_t_test(mean1, var1, n1, mean2, var2, n2):
+    """
+    Welch's unequal variance t-test from group summaries, vectorized over any matching shapes
+
+    Args:
+        mean1, var1, n1: Mean, sample variance (ddof=1) and size of the first group
+        mean2, var2, n2: The same for the second group
+
+    Returns:
+        Tuple of (t statistics, Welch-Satterthwaite degrees of freedom, two-sided p-values).
+        Entries with fewer than two observations per group or zero variance are NaN.
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        se1 = var1 / n1
+        se2 = var2 / n2
+        standard_error = np.sqrt(se1 + se2)
+        t = (mean1 - mean2) / standard_error
+        df = (se1 + se2) ** 2 / (se1 ** 2 / (n1 - 1) + se2 ** 2 / (n2 - 1))
+
+    valid = (n1 >= 2) & (n2 >= 2) & (standard_error > 0) & np.isfinite(t) & np.isfinite(df)
+    t = np.where(valid, t, np.nan)
+    df = np.where(valid, df, np.nan)
+    p_values = np.full(t.shape, np.nan)
+    if valid.any():
+        p_values[valid] = student_t_two_sided_p(t[valid], df[valid])
+    return t, df, p_values
+
+def compare_conferences(season_codes, is_western, values, n_seasons):
+    """
+    West-minus-East differences and Welch t-tests for every season and metric in one pass
+
+    Args:
+        season_codes: (n,) int array mapping each team-season row to its season index
+        is_western: (n,) bool array, True for Western conference rows
+        values: (n, m) float array of metric values
+        n_seasons: Number of seasons
+
+    Returns:
+        Dictionary of (n_seasons, m) arrays: diff, t, df and p_value,
+        plus (n_seasons,) arrays western_teams and eastern_teams
+    """
+    values = np.asarray(values, dtype=np.float64)
+    # Group index 2 * season + conference, so one bincount per metric covers every season and conference
+    groups = 2 * np.asarray(season_codes) + np.asarray(is_western, dtype=np.int64)
+    size = 2 * n_seasons
+
+    counts = np.bincount(groups, minlength=size).astype(np.float64)
+    sums = np.stack([np.bincount(groups, weights=column, minlength=size) for column in values.T], axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        means = sums / counts[:, None]
+        squared = (values - means[groups]) ** 2
+        squares = np.stack([np.bincount(groups, weights=column, minlength=size) for column in squared.T], axis=1)
+        variances = squares / (counts[:, None] - 1)
+
+    east, west = slice(0, size, 2), slice(1, size, 2)
+    n_east, n_west = counts[east][:, None], counts[west][:, None]
+    t, df, p_values = welch_t_test(means[west], variances[west], n_west, means[east], variances[east], n_east)
+    return {
+        'diff': means[west] - means[east],
+        't': t,
+        'df': df,
+        'p_value': p_values,
+        'western_teams': counts[west].astype(np.int64),
+        'eastern_teams': counts[east].astype(np.int64)
+    }
+
+def _finite_or_none(value, digits):
+    return round(float(value), digits) if np.isfinite(value) else None
+
+def build_conference_comparison(season_ids, season_codes, conference_ids, values):
+    """
+    Format compare_conferences output for the API
+
+    Args:
+        season_ids: Season IDs in chronological order
+        season_codes: (n,) season index of each row into season_ids, any sequence
+        conference_ids: (n,) conference ID of each row ('W' or 'E'), any sequence
+        values: (n, len(COMPARISON_METRICS)) metric values, any nested sequence
+
+    Returns:
+        Dictionary with the metric names and one entry per season holding
+        team counts and per-metric diff, t, df and p_value (None when not testable)
+    """
+    result = compare_conferences(
+        np.asarray(season_codes, dtype=np.int64),
+        np.asarray(conference_ids, dtype='<U1') == 'W',
+        np.asarray(values, dtype=np.float64).reshape(-1, len(COMPARISON_METRICS)),
+        len(season_ids)
+    )
+    seasons = []
+    for index, season_id in enumerate(season_ids):
+        seasons.append({
+            'season': season_id,
+            'western_teams': int(result['western_teams'][index]),
+            'eastern_teams': int(result['eastern_teams'][index]),
+            'metrics': {
+                metric: {
+                    'diff': _finite_or_none(result['diff'][index, column], 4),
+                    't': _finite_or_none(result['t'][index, column], 4),
+                    'df': _finite_or_none(result['df'][index, column], 2),
+                    'p_value': _finite_or_none(result['p_value'][index, column], 6)
+                }
+                for column, metric in enumerate(COMPARISON_METRICS)
+            }
+        })
+    return {'metrics': list(COMPARISON_METRICS), 'seasons': seasons}
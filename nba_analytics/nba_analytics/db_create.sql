@@ -18,6 +18,11 @@
 -- Foreign keys to both Teams and Seasons tables
 -- Unique constraint on team_id + season_id combination
 
+-- SeasonFingerprints table:
+-- Primary key: season_id
+-- Row count and content hash of the source games behind each season,
+-- used to only recompute changed seasons on incremental rebuilds
+
 
 -- Create Seasons table
 CREATE TABLE Seasons (
@@ -57,12 +62,17 @@ CREATE TABLE TeamStats (
     UNIQUE(team_id, season_id)
 );
 
+-- Create SeasonFingerprints table
+CREATE TABLE SeasonFingerprints (
+    season_id TEXT PRIMARY KEY,
+    row_count INTEGER NOT NULL,
+    content_hash TEXT NOT NULL,
+    FOREIGN KEY (season_id) REFERENCES Seasons(season_id)
+);
+
 -- Insert basic conference data
 INSERT INTO Conferences (conference_id, conference_name) VALUES
 ('W', 'Western'),
 ('E', 'Eastern');
 
--- Create indexes for better query performance
-CREATE INDEX idx_teamstats_season ON TeamStats(season_id);
-CREATE INDEX idx_teamstats_team ON TeamStats(team_id);
-CREATE INDEX idx_teams_conference ON Teams(conference_id);
+-- Secondary indexes live in db_indexes.sql, full loads build them once every row is inserted
@@ -0,0 +1,6 @@
+-- Secondary indexes for better query performance
+-- Kept apart from db_create.sql so full loads insert into index-free tables and build each index once at the end
+
+CREATE INDEX IF NOT EXISTS idx_teamstats_season ON TeamStats(season_id);
+CREATE INDEX IF NOT EXISTS idx_teamstats_team ON TeamStats(team_id);
+CREATE INDEX IF NOT EXISTS idx_teams_conference ON Teams(conference_id);
@@ -0,0 +1,51 @@
+-- Materialized aggregates written alongside TeamStats at load time
+-- Kept apart from db_create.sql so incremental updates can add them to databases built before they existed
+
+-- SeasonSummary table:
+-- Primary key: season_id
+-- League-wide team count, means and standard deviations of the season averages,
+-- and extents of the relative ratings
+-- Foreign key to Seasons table
+
+-- ConferenceSeasonSummary table:
+-- Primary key: summary_id (autoincrementing)
+-- Team count, means and standard deviations of the relative ratings per season and conference
+-- Foreign keys to both Seasons and Conferences tables
+-- Unique constraint on season_id + conference_id combination
+
+
+-- Create SeasonSummary table
+CREATE TABLE IF NOT EXISTS SeasonSummary (
+    season_id TEXT PRIMARY KEY,
+    team_count INTEGER NOT NULL,
+    mean_offensive_rating REAL NOT NULL,
+    mean_defensive_rating REAL NOT NULL,
+    mean_net_rating REAL NOT NULL,
+    std_offensive_rating REAL,
+    std_defensive_rating REAL,
+    std_net_rating REAL,
+    min_relative_offensive_rating REAL NOT NULL,
+    max_relative_offensive_rating REAL NOT NULL,
+    min_relative_defensive_rating REAL NOT NULL,
+    max_relative_defensive_rating REAL NOT NULL,
+    min_relative_net_rating REAL NOT NULL,
+    max_relative_net_rating REAL NOT NULL,
+    FOREIGN KEY (season_id) REFERENCES Seasons(season_id)
+);
+
+-- Create ConferenceSeasonSummary table
+CREATE TABLE IF NOT EXISTS ConferenceSeasonSummary (
+    summary_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    season_id TEXT,
+    conference_id TEXT,
+    team_count INTEGER NOT NULL,
+    mean_relative_offensive_rating REAL NOT NULL,
+    mean_relative_defensive_rating REAL NOT NULL,
+    mean_relative_net_rating REAL NOT NULL,
+    std_relative_offensive_rating REAL,
+    std_relative_defensive_rating REAL,
+    std_relative_net_rating REAL,
+    FOREIGN KEY (season_id) REFERENCES Seasons(season_id),
+    FOREIGN KEY (conference_id) REFERENCES Conferences(conference_id),
+    UNIQUE(season_id, conference_id)
+);
@@ -0,0 +1,823 @@
+import os
+import tempfile
+import time
+import sqlite3
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from urllib.request import pathname2url
+# numpy, pandas, kaggle, zipfile and the parser are imported by the functions that need them, so the
+# read path serving the API never loads them
+from .seasons import (
+    SOURCE_COLUMNS,
+    FIRST_SEASON,
+    LAST_SEASON,
+    CALENDAR_SEASON_TYPES,
+    CONFERENCE_NAMES,
+    season_start_year,
+    SEASON_SUMMARY_COLUMNS,
+    CONFERENCE_SUMMARY_COLUMNS
+)
+from .decade_table import DecadeTable
+from .jobs import NO_PROGRESS
+from .instrumentation import instrumented, timed
+
+dirname = os.path.dirname(__file__)
+
+# Bumped whenever this process writes new data, so readers can tell their cached copy is stale
+_data_generation = 0
+_data_generation_lock = threading.Lock()
+
+# General sql and file utility functions
+
+@contextmanager
+def sqlite_connection(db_path, timeout=30):
+    """Context manager for SQLite connections with timeout and error handling"""
+    conn = None
+    try:
+        conn = sqlite3.connect(db_path, timeout=timeout)
+        yield conn
+    except sqlite3.OperationalError as e:
+        if "database is locked" in str(e):
+            raise Exception("Database is locked. Please try again later.") from e
+        raise
+    finally:
+        if conn:
+            conn.close()
+
+class ReadConnectionPool:
+    """
+    Reusable read-only SQLite connections, one per thread and database file.
+    Connections are opened with mode=ro URIs and tuned pragmas, keep their prepared statement
+    cache across requests, and are reopened when the file is replaced by a shadow swap.
+    """
+    PRAGMAS = (
+        "PRAGMA query_only = ON",
+        "PRAGMA mmap_size = 268435456",  # 256 MiB
+        "PRAGMA cache_size = -16384",  # 16 MiB
+        "PRAGMA temp_store = MEMORY",
+    )
+
+    def __init__(self, timeout=30, cached_statements=128):
+        self.timeout = timeout
+        self.cached_statements = cached_statements
+        self._local = threading.local()
+        self._metrics_lock = threading.Lock()
+        self._metrics = {'hits': 0, 'misses': 0, 'wait_seconds': 0.0}
+
+    def _open(self, db_path):
+        uri = f"file:{pathname2url(os.path.abspath(db_path))}?mode=ro"
+        conn = sqlite3.connect(uri, uri=True, timeout=self.timeout, cached_statements=self.cached_statements)
+        for pragma in self.PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
+    @contextmanager
+    def connection(self, db_path):
+        started = time.perf_counter()
+        connections = self._local.__dict__.setdefault('connections', {})
+        stat = os.stat(db_path)
+        identity = (stat.st_dev, stat.st_ino)
+
+        entry = connections.get(db_path)
+        hit = entry is not None and entry[0] == identity
+        if not hit:
+            if entry is not None:
+                entry[1].close()
+            entry = connections[db_path] = (identity, self._open(db_path))
+        self._record(hit, time.perf_counter() - started)
+
+        try:
+            yield entry[1]
+        except sqlite3.OperationalError as e:
+            if "database is locked" in str(e):
+                raise Exception("Database is locked. Please try again later.") from e
+            raise
+        except sqlite3.DatabaseError:
+            # Never hand a connection that hit a database error to the next request
+            connections.pop(db_path, None)
+            entry[1].close()
+            raise
+
+    def _record(self, hit, wait_seconds):
+        with self._metrics_lock:
+            self._metrics['hits' if hit else 'misses'] += 1
+            self._metrics['wait_seconds'] += wait_seconds
+
+    def metrics(self):
+        with self._metrics_lock:
+            return dict(self._metrics)
+
+    def close(self):
+        """Close the calling thread's connections"""
+        for identity, conn in self._local.__dict__.pop('connections', {}).values():
+            conn.close()
+
+read_pool = ReadConnectionPool()
+
+def read_connection(db_path):
+    """Pooled read-only connection for the query helpers, see ReadConnectionPool"""
+    return read_pool.connection(db_path)
+
+def verify_file(file_path, min_size=1024):  # 1KB minimum
+    """Verify file exists and meets minimum size requirements"""
+    if not os.path.exists(file_path):
+        raise FileNotFoundError(f"File not found at {file_path}")
+    
+    file_size = os.path.getsize(file_path)
+    if file_size < min_size:
+        raise ValueError(f"File is too small ({file_size} bytes). Minimum size is {min_size} bytes")
+    
+    return file_size
+
+def bump_data_generation():
+    """Mark every cached copy of the decade data in this process as stale"""
+    global _data_generation
+    with _data_generation_lock:
+        _data_generation += 1
+        return _data_generation
+
+def get_data_generation():
+    return _data_generation
+
+def data_version(db_path):
+    """
+    Identify the current contents of the database file.
+    Changes whenever this process loads new data or the file is replaced or modified on disk.
+    """
+    stat = os.stat(db_path)
+    return (_data_generation, stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+def safe_cleanup(directory):
+    """Safely cleanup files in directory"""
+    if not os.path.exists(directory):
+        return
+        
+    for file in os.listdir(directory):
+        file_path = os.path.join(directory, file)
+        try:
+            if os.path.isfile(file_path):
+                os.remove(file_path)
+            elif os.path.isdir(file_path):
+                os.rmdir(file_path)
+        except PermissionError:
+            print(f"Warning: Could not remove {file_path} due to permissions")
+        except Exception as e:
+            print(f"Warning: Failed to remove {file_path}: {str(e)}")
+
+# Large buffers keep the decompression loop out of Python for most of the archive
+ZIP_CHUNK_SIZE = 4 * 2**20
+
+def extract_zip_member(zip_path, member_name, destination, chunk_size=ZIP_CHUNK_SIZE):
+    """
+    Decompress a single archive member to disk in one streaming pass, skipping every other member.
+    The CRC-32 is updated chunk by chunk while reading and a mismatch raises zipfile.BadZipFile,
+    so the archive never has to be decompressed a second time just to verify it.
+    The member is written to a temporary name and only renamed once it is complete and verified.
+
+    Args:
+        zip_path: Path of the zip archive
+        member_name: File name of the member, matched against the base name of every archive entry
+        destination: Directory the member is written to
+        chunk_size: Bytes decompressed per read
+
+    Returns:
+        Tuple of (path of the extracted file, bytes written, seconds taken)
+    """
+    import zipfile
+
+    started = time.perf_counter()
+    with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+        info = next(
+            (entry for entry in zip_ref.infolist()
+             if not entry.is_dir() and os.path.basename(entry.filename) == member_name),
+            None
+        )
+        if info is None:
+            raise FileNotFoundError(f"{member_name} not found in {zip_path}")
+
+        target_path = os.path.join(destination, member_name)
+        partial_path = target_path + ".partial"
+        written = 0
+        try:
+            # ZipExtFile checks the running CRC against the header once the member is fully read
+            with zip_ref.open(info) as source, open(partial_path, 'wb') as target:
+                while True:
+                    chunk = source.read(chunk_size)
+                    if not chunk:
+                        break
+                    target.write(chunk)
+                    written += len(chunk)
+            if written != info.file_size:
+                raise zipfile.BadZipFile(f"{member_name} is truncated: {written} of {info.file_size} bytes")
+            os.replace(partial_path, target_path)
+        except BaseException:
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
+            raise
+    return target_path, written, time.perf_counter() - started
+
+# Kaggle based utility functions
+def data_update_from_kaggle(max_retries=3, retry_delay=1, progress=NO_PROGRESS, data_dir=None):
+    # The kaggle package authenticates on import
+    import kaggle
+    kaggle.api.authenticate()
+
+    # Scratch directory for the download, emptied again once the game table is read
+    data_dir = data_dir or os.path.join(tempfile.gettempdir(), "nba_kaggle_files")
+    os.makedirs(data_dir, exist_ok=True)
+    
+    conn = None
+    attempts = 0
+    
+    try:
+        with progress.stage('download'), timed('download'):
+            # Download with retry logic
+            while attempts < max_retries:
+                try:
+                    kaggle.api.dataset_download_file(
+                        'wyattowalsh/basketball', 
+                        'nba.sqlite', 
+                        path=data_dir,
+                        force=True 
+                    )
+                    break
+                except Exception as e:
+                    attempts += 1
+                    if attempts == max_retries:
+                        raise Exception(f"Failed to download after {max_retries} attempts") from e
+                    print(f"Download attempt {attempts} failed. Retrying in {retry_delay} seconds...")
+                    time.sleep(retry_delay)
+        
+        with progress.stage('extract'):
+            zip_path = os.path.join(data_dir, 'nba.sqlite.zip')
+            verify_file(zip_path)
+        
+            # Stream the one member we need to disk, its CRC is checked as it is decompressed
+            with timed('unzip') as timer:
+                sql_path, size, seconds = extract_zip_member(zip_path, 'nba.sqlite', data_dir)
+                timer.rows = size
+            print(f"Extracted {size:,} bytes in {seconds:.1f}s ({size / 2**20 / max(seconds, 1e-9):.1f} MiB/s)")
+            # The archive is no longer needed, drop it before the database is read to halve peak disk use
+            os.remove(zip_path)
+        
+            file_size = verify_file(sql_path)
+            print(f"SQLite database size: {file_size:,} bytes")
+
+            # Use context manager for database connection
+            with sqlite_connection(sql_path) as conn:
+                # Verify table exists
+                cursor = conn.cursor()
+                cursor.execute("SELECT count(*) FROM sqlite_master WHERE type='table' AND name='game'")
+                if cursor.fetchone()[0] == 0:
+                    raise ValueError("The 'game' table does not exist in the database")
+            
+                # Get table info for verification
+                cursor.execute("PRAGMA table_info(game)")
+                columns = cursor.fetchall()
+                if not columns:
+                    raise ValueError("The 'game' table appears to be empty or corrupted")
+                missing_columns = set(SOURCE_COLUMNS) - {column[1] for column in columns}
+                if missing_columns:
+                    raise ValueError(f"The 'game' table is missing columns: {', '.join(sorted(missing_columns))}")
+            
+                # Read data
+                df = read_game_table(conn)
+            
+                if df.empty:
+                    raise ValueError("No data retrieved from the game table")
+                
+                print(f"Successfully retrieved {len(df)} rows")
+                print(df.head())
+            
+                return df
+
+    except Exception as e:
+        print(f"Error during processing: {str(e)}")
+        raise
+
+    finally:
+        safe_cleanup(data_dir)
+
+# Compact dtypes for the projected game columns, box score counts fit float32 exactly
+GAME_TABLE_DTYPES = {
+    column: ('category' if column.startswith(('season_id', 'team_id', 'team_name')) else 'float32')
+    for column in SOURCE_COLUMNS if column != 'game_date'
+}
+
+@instrumented('read_game_table', rows=len)
+def read_game_table(conn, first_season=FIRST_SEASON, last_season=LAST_SEASON, chunksize=20000):
+    """
+    Read only the columns and seasons the parser uses from the Kaggle 'game' table.
+    season_id is '<season type><start year>', so the filter keeps the calendar season types of the
+    requested start years. It runs inside SQLite and every chunk is narrowed to compact dtypes as it arrives,
+    so the full-width table is never materialized in memory.
+    """
+    import pandas as pd
+
+    query = f"""SELECT {', '.join(SOURCE_COLUMNS)} FROM game
+        WHERE substr(season_id, 1, 1) IN ({', '.join('?' * len(CALENDAR_SEASON_TYPES))})
+        AND CAST(substr(season_id, 2) AS INTEGER) BETWEEN ? AND ?"""
+    params = (*CALENDAR_SEASON_TYPES, first_season, last_season)
+    numeric_dtypes = {column: dtype for column, dtype in GAME_TABLE_DTYPES.items() if dtype != 'category'}
+    chunks = [
+        chunk.astype(numeric_dtypes)
+        for chunk in pd.read_sql_query(query, conn, params=params, chunksize=chunksize)
+    ]
+    if not chunks:
+        return pd.DataFrame({column: pd.Series(dtype=GAME_TABLE_DTYPES.get(column, object)) for column in SOURCE_COLUMNS})
+    # Categories are assigned once all chunks are joined so they share one set of codes
+    return pd.concat(chunks, ignore_index=True).astype(GAME_TABLE_DTYPES)
+
+# NBA Database parsing utility functions
+def create_schema(conn, indexes=True):
+    """Create the database schema, without the secondary indexes when indexes is False (see create_indexes)."""
+    cursor = conn.cursor()   
+    with open(os.path.join(dirname, "db_create.sql"), 'r') as f:
+        schema = f.read()
+        cursor.executescript(schema)
+        cursor.executemany(
+        "INSERT OR IGNORE INTO Conferences (conference_id, conference_name) VALUES (?, ?)",
+        [('W', 'Western'), ('E', 'Eastern')]
+        )
+    create_summary_schema(conn)
+    conn.commit()
+    if indexes:
+        create_indexes(conn)
+
+def create_indexes(conn):
+    """Create the secondary indexes if they do not exist yet."""
+    with open(os.path.join(dirname, "db_indexes.sql"), 'r') as f:
+        conn.executescript(f.read())
+
+# A shadow file is thrown away if the build fails and only swapped in once complete, so it needs no
+# rollback journal on disk and no fsync per commit. shadow_database syncs it once before the swap
+SHADOW_BUILD_PRAGMAS = (
+    "PRAGMA synchronous = OFF",
+    "PRAGMA journal_mode = MEMORY",
+)
+
+def tune_shadow_connection(conn):
+    for pragma in SHADOW_BUILD_PRAGMAS:
+        conn.execute(pragma)
+
+def create_summary_schema(conn):
+    """Create the summary tables if they do not exist yet."""
+    with open(os.path.join(dirname, "db_summary.sql"), 'r') as f:
+        conn.executescript(f.read())
+
+# The insert functions write in the caller's transaction, load_data_to_db and upsert_season_data commit once
+@instrumented('insert_seasons', rows=lambda count: count)
+def insert_seasons(conn, seasons_data):
+    """Insert seasons into the database, returning the number of rows written."""
+    cursor = conn.cursor()
+    seasons = [(season, season_start_year(season), season_start_year(season) + 1)
+              for season in seasons_data.keys()]
+    cursor.executemany(
+        "INSERT OR IGNORE INTO Seasons (season_id, start_year, end_year) VALUES (?, ?, ?)",
+        seasons
+    )
+    return len(seasons)
+
+@instrumented('insert_teams', rows=lambda count: count)
+def insert_teams(conn, data):
+    """Insert teams into the database, one row per name and conference the name played in."""
+    cursor = conn.cursor()
+    # Collect unique teams with their conferences
+    teams = set()
+    for season_data in data.values():
+        for team_data in season_data:
+            teams.add((team_data['team'], team_data['conference'][0]))  # Use first letter of conference as ID
+    # Insert teams that are not stored yet, Teams has no unique constraint on the name
+    cursor.executemany(
+        """INSERT INTO Teams (team_name, conference_id)
+        SELECT ?, ? WHERE NOT EXISTS (SELECT 1 FROM Teams WHERE team_name = ? AND conference_id = ?)""",
+        [(team_name, conference_id, team_name, conference_id) for team_name, conference_id in teams]
+    )
+    return len(teams)
+
+@instrumented('insert_team_stats', rows=lambda count: count)
+def insert_team_stats(conn, data):
+    """
+    Insert team statistics into the database, returning the number of rows written.
+    Plain INSERTs: the table is either new or the seasons' stored rows were deleted first.
+    """
+    cursor = conn.cursor()
+    
+    # Get team_id mapping, franchises that changed conference have a row per conference
+    cursor.execute("SELECT team_id, team_name, conference_id FROM Teams")
+    team_mapping = {(name, conference_id): id for id, name, conference_id in cursor.fetchall()}
+    
+    # Prepare stats data
+    stats_data = []
+    for season_id, season_data in data.items():
+        for team_data in season_data:
+            team_id = team_mapping[(team_data['team'], team_data['conference'][0])]
+            stats_data.append((
+                team_id,
+                season_id,
+                float(team_data['average_offensive_rating']),
+                float(team_data['average_defensive_rating']),
+                float(team_data['average_net_rating']),
+                float(team_data['average_plus_minus']),
+                float(team_data['relative_net_rating']),
+                float(team_data['relative_offensive_rating']),
+                float(team_data['relative_defensive_rating'])
+            ))
+    
+    # Insert stats
+    cursor.executemany("""
+        INSERT INTO TeamStats (
+            team_id, season_id,
+            average_offensive_rating, average_defensive_rating,
+            average_net_rating, average_plus_minus,
+            relative_net_rating, relative_offensive_rating,
+            relative_defensive_rating
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """, stats_data)
+    
+    return len(stats_data)
+
+@instrumented('insert_season_fingerprints', rows=lambda count: count)
+def insert_season_fingerprints(conn, fingerprints):
+    """Insert or update the source fingerprints of seasons, returning the number of rows written."""
+    cursor = conn.cursor()
+    cursor.executemany(
+        "INSERT OR REPLACE INTO SeasonFingerprints (season_id, row_count, content_hash) VALUES (?, ?, ?)",
+        [(season_id, int(row_count), content_hash) for season_id, (row_count, content_hash) in fingerprints.items()]
+    )
+    return len(fingerprints)
+
+@instrumented('insert_season_summaries', rows=lambda count: count)
+def insert_season_summaries(conn, data):
+    """
+    Insert the season and conference summaries of every season in data, returning the number of rows written.
+    The seasons' stored summaries have to be deleted first.
+    """
+    from .decade_parser import compute_season_summaries
+
+    season_summaries, conference_summaries = compute_season_summaries(data)
+    cursor = conn.cursor()
+    cursor.executemany(
+        f"""INSERT INTO SeasonSummary (season_id, {', '.join(SEASON_SUMMARY_COLUMNS)})
+        VALUES (?, {', '.join('?' * len(SEASON_SUMMARY_COLUMNS))})""",
+        [(season_id, *summary) for season_id, summary in season_summaries.items()]
+    )
+    cursor.executemany(
+        f"""INSERT INTO ConferenceSeasonSummary (season_id, conference_id, {', '.join(CONFERENCE_SUMMARY_COLUMNS)})
+        VALUES (?, ?, {', '.join('?' * len(CONFERENCE_SUMMARY_COLUMNS))})""",
+        [(season_id, conference_id, *summary) for (season_id, conference_id), summary in conference_summaries.items()]
+    )
+    return len(season_summaries) + len(conference_summaries)
+
+def load_season_fingerprints(db_path):
+    """
+    Read the stored season fingerprints.
+    Returns an empty dict when the database or the fingerprint table does not exist yet.
+    """
+    if not os.path.exists(db_path):
+        return {}
+    with read_connection(db_path) as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT count(*) FROM sqlite_master WHERE type='table' AND name='SeasonFingerprints'")
+        if cursor.fetchone()[0] == 0:
+            return {}
+        cursor.execute("SELECT season_id, row_count, content_hash FROM SeasonFingerprints")
+        return {season_id: (row_count, content_hash) for season_id, row_count, content_hash in cursor.fetchall()}
+
+@contextmanager
+def shadow_database(db_path, copy_existing=False):
+    """
+    Build the next version of a database next to it and publish it atomically.
+    Yields the path of a shadow file (db_path + '.new'). When the block succeeds the shadow replaces
+    db_path with os.replace, so readers see either the old or the new file, never a half-written one,
+    and connections opened before the swap keep reading the version they opened.
+    """
+    shadow_path = db_path + ".new"
+    for stale_path in (shadow_path, shadow_path + "-journal"):
+        if os.path.exists(stale_path):
+            os.remove(stale_path)
+
+    if copy_existing and os.path.exists(db_path):
+        with sqlite_connection(db_path) as source, sqlite_connection(shadow_path) as shadow:
+            source.backup(shadow)
+
+    try:
+        yield shadow_path
+        # Builds may skip syncing their commits, the file is made durable once before it goes live
+        with open(shadow_path, 'rb') as f:
+            os.fsync(f.fileno())
+        os.replace(shadow_path, db_path)
+    except BaseException:
+        if os.path.exists(shadow_path):
+            os.remove(shadow_path)
+        raise
+
+@instrumented('load_data_to_db', rows=lambda count: count)
+def load_data_to_db(data_object, db_path, fingerprints=None): 
+    """
+    Build a fresh database from parsed seasons and swap it in, returning the number of rows written.
+    Every row goes into index-free tables in one transaction and the secondary indexes are built
+    once at the end, instead of being maintained row by row.
+    """
+    started = time.perf_counter()
+    # Build a fresh database in a shadow file so the live one keeps serving reads
+    with shadow_database(db_path) as shadow_path:
+        with sqlite_connection(shadow_path) as conn:
+            try:
+                tune_shadow_connection(conn)
+                create_schema(conn, indexes=False)
+                
+                # Insert data
+                rows = insert_seasons(conn, data_object)
+                rows += insert_teams(conn, data_object)
+                rows += insert_team_stats(conn, data_object)
+                rows += insert_season_summaries(conn, data_object)
+                if fingerprints:
+                    rows += insert_season_fingerprints(conn, fingerprints)
+                conn.commit()
+                create_indexes(conn)
+                
+            except Exception as e:
+                print(f"Error loading data: {e}")
+                conn.rollback()
+                raise
+
+    bump_data_generation()
+    seconds = time.perf_counter() - started
+    print(f"Successfully loaded {rows} rows into {db_path} in {seconds:.3f}s ({rows / seconds:,.0f} rows/s)")
+    return rows
+
+def clear_artifact_info(conn):
+    """
+    Forget which artifact the database was installed from, once its contents were changed locally.
+    Otherwise it would keep reporting that version and the next artifact install would be skipped.
+    """
+    cursor = conn.cursor()
+    cursor.execute("SELECT count(*) FROM sqlite_master WHERE type='table' AND name='ArtifactInfo'")
+    if cursor.fetchone()[0]:
+        cursor.execute("DELETE FROM ArtifactInfo")
+
+@instrumented('upsert_season_data')
+def upsert_season_data(data_object, fingerprints, db_path, removed_seasons=()):
+    """
+    Replace the stored rows of the seasons in data_object without touching any other season.
+    Seasons in removed_seasons no longer have source games and are deleted.
+    The changes are applied to a copy of the database which then replaces it atomically.
+    """
+    with shadow_database(db_path, copy_existing=True) as shadow_path:
+        with sqlite_connection(shadow_path) as conn:
+            try:
+                tune_shadow_connection(conn)
+                create_summary_schema(conn)
+                insert_seasons(conn, data_object)
+                insert_teams(conn, data_object)
+
+                # Stale rows are deleted in the same transaction the new ones are inserted in
+                cursor = conn.cursor()
+                for table in ("TeamStats", "SeasonSummary", "ConferenceSeasonSummary"):
+                    cursor.executemany(
+                        f"DELETE FROM {table} WHERE season_id = ?",
+                        [(season_id,) for season_id in list(data_object) + list(removed_seasons)]
+                    )
+                for table in ("SeasonFingerprints", "Seasons"):
+                    cursor.executemany(
+                        f"DELETE FROM {table} WHERE season_id = ?",
+                        [(season_id,) for season_id in removed_seasons]
+                    )
+                insert_team_stats(conn, data_object)
+                insert_season_summaries(conn, data_object)
+                insert_season_fingerprints(conn, fingerprints)
+                clear_artifact_info(conn)
+                conn.commit()
+
+            except Exception as e:
+                print(f"Error updating data: {e}")
+                conn.rollback()
+                raise
+
+    bump_data_generation()
+    print(f"Successfully updated seasons {', '.join(list(data_object) + list(removed_seasons))} in {db_path}")
+
+# Shared projection for every TeamStats read, rows are turned into dicts by team_stats_row_to_dict
+TEAM_STATS_QUERY = """
+        SELECT 
+            s.season_id,
+            t.team_name,
+            t.conference_id,
+            ts.average_offensive_rating,
+            ts.average_defensive_rating,
+            ts.average_net_rating,
+            ts.average_plus_minus,
+            ts.relative_net_rating,
+            ts.relative_offensive_rating,
+            ts.relative_defensive_rating
+        FROM TeamStats ts
+        JOIN Teams t ON ts.team_id = t.team_id
+        JOIN Seasons s ON ts.season_id = s.season_id
+        JOIN Conferences c ON t.conference_id = c.conference_id
+"""
+
+def team_stats_row_to_dict(row):
+    """
+    Format one TEAM_STATS_QUERY row like the parser's team dictionaries.
+    Ratings stay plain floats, which compare and serialize like the parser's numpy floats.
+    """
+    season_id, team_name, conf_id, *stats = row
+    return {
+        'team': team_name,
+        'conference': CONFERENCE_NAMES[conf_id],
+        'average_offensive_rating': stats[0],
+        'average_defensive_rating': stats[1],
+        'average_net_rating': stats[2],
+        'average_plus_minus': stats[3],
+        'relative_net_rating': stats[4],
+        'relative_offensive_rating': stats[5],
+        'relative_defensive_rating': stats[6]
+    }
+
+def extract_data_from_db(db_path):
+    """
+    Extract data from the SQLite database and format it exactly like the original dictionary.
+    Returns a dictionary with the same structure as the input data.
+    """
+
+    with read_connection(db_path) as conn:
+        cursor = conn.cursor()
+        
+        # Initialize the result dictionary using defaultdict
+        result = defaultdict(list)
+        
+        # Query to get all data for each season
+        cursor.execute(TEAM_STATS_QUERY + "ORDER BY s.season_id, t.team_name")
+        
+        # Process each row and build the dictionary
+        for row in cursor.fetchall():
+            result[row[0]].append(team_stats_row_to_dict(row))
+    
+    # Convert defaultdict to regular dict
+    return dict(result)
+
+def extract_decade_table(db_path):
+    """
+    Extract the decade into a columnar DecadeTable, the compact equivalent of extract_data_from_db.
+    """
+    with read_connection(db_path) as conn:
+        cursor = conn.cursor()
+        cursor.execute(TEAM_STATS_QUERY + "ORDER BY s.season_id, t.team_name")
+        return DecadeTable.from_rows(
+            (season_id, team_name, CONFERENCE_NAMES[conf_id], *stats)
+            for season_id, team_name, conf_id, *stats in cursor
+        )
+
+def iter_decade_seasons(db_path, batch_size=256):
+    """
+    Stream the decade one season at a time from a single server-side cursor.
+    Yields (season_id, [team dictionaries]) in the same order as extract_data_from_db,
+    holding at most one season plus one batch of rows in memory.
+    """
+    with read_connection(db_path) as conn:
+        cursor = conn.cursor()
+        cursor.execute(TEAM_STATS_QUERY + "ORDER BY s.season_id, t.team_name")
+
+        season_id, season_data = None, []
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            for row in rows:
+                if row[0] != season_id and season_data:
+                    yield season_id, season_data
+                    season_data = []
+                season_id = row[0]
+                season_data.append(team_stats_row_to_dict(row))
+        if season_data:
+            yield season_id, season_data
+
+def extract_season_from_db(db_path, season_id):
+    """
+    Extract a single season through the idx_teamstats_season index.
+    Returns the season's team dictionaries, or None when the season has no stats.
+    """
+    with read_connection(db_path) as conn:
+        cursor = conn.cursor()
+        cursor.execute(TEAM_STATS_QUERY + "WHERE ts.season_id = ? ORDER BY t.team_name", (season_id,))
+        season_data = [team_stats_row_to_dict(row) for row in cursor.fetchall()]
+    return season_data or None
+
+def extract_seasons_from_db(db_path):
+    """List the seasons that have stats, read from Seasons in chronological order."""
+    with read_connection(db_path) as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT s.season_id FROM Seasons s
+            WHERE EXISTS (SELECT 1 FROM TeamStats ts WHERE ts.season_id = s.season_id)
+            ORDER BY s.start_year, s.end_year
+        """)
+        return [row[0] for row in cursor.fetchall()]
+
+
+def extract_conference_ratings(db_path):
+    """
+    Read the relative ratings the conference comparison needs as plain lists,
+    build_conference_comparison converts them to arrays.
+
+    Returns:
+        Tuple of (season_ids in chronological order, season index of each row,
+        conference ID of each row, (relative offensive, defensive, net rating) of each row)
+    """
+    with read_connection(db_path) as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT s.season_id, t.conference_id,
+                   ts.relative_offensive_rating, ts.relative_defensive_rating, ts.relative_net_rating
+            FROM TeamStats ts
+            JOIN Teams t ON ts.team_id = t.team_id
+            JOIN Seasons s ON ts.season_id = s.season_id
+            ORDER BY s.start_year, s.end_year, s.season_id, t.team_name
+        """)
+        return conference_ratings_from_rows(cursor.fetchall())
+
+def conference_ratings_from_rows(rows):
+    """
+    Split (season_id, conference_id, relative offensive, defensive, net rating) rows in chronological
+    order into the extract_conference_ratings tuple
+    """
+    season_ids = list(dict.fromkeys(row[0] for row in rows))
+    season_index = {season_id: index for index, season_id in enumerate(season_ids)}
+    season_codes = [season_index[row[0]] for row in rows]
+    conference_ids = [row[1] for row in rows]
+    values = [row[2:] for row in rows]
+    return season_ids, season_codes, conference_ids, values
+
+def extract_cluster_rows(db_path, seasons=None):
+    """
+    Read (season_id, team_name, conference, relative_offensive_rating, relative_defensive_rating)
+    for every team-season, or only those in the given seasons, in /data/ order.
+    """
+    query = """
+        SELECT s.season_id, t.team_name, t.conference_id,
+               ts.relative_offensive_rating, ts.relative_defensive_rating
+        FROM TeamStats ts
+        JOIN Teams t ON ts.team_id = t.team_id
+        JOIN Seasons s ON ts.season_id = s.season_id
+    """
+    parameters = ()
+    if seasons:
+        parameters = tuple(seasons)
+        query += f"WHERE ts.season_id IN ({', '.join('?' * len(parameters))}) "
+    query += "ORDER BY s.season_id, t.team_name"
+
+    with read_connection(db_path) as conn:
+        return [
+            (season_id, team_name, CONFERENCE_NAMES[conf_id], offensive, defensive)
+            for season_id, team_name, conf_id, offensive, defensive in conn.execute(query, parameters)
+        ]
+
+def extract_season_summary(db_path, season_id):
+    """
+    Read one season's materialized summary and its per-conference summaries by primary/unique key.
+    Databases built before the summary tables existed fall back to aggregating the season's TeamStats.
+    Returns None when the season has no stats.
+    """
+    with read_connection(db_path) as conn:
+        cursor = conn.cursor()
+        try:
+            cursor.execute(
+                f"SELECT {', '.join(SEASON_SUMMARY_COLUMNS)} FROM SeasonSummary WHERE season_id = ?", (season_id,)
+            )
+            season_summary = cursor.fetchone()
+            cursor.execute(
+                f"""SELECT conference_id, {', '.join(CONFERENCE_SUMMARY_COLUMNS)} FROM ConferenceSeasonSummary
+                WHERE season_id = ? ORDER BY conference_id DESC""", (season_id,)
+            )
+            conference_summaries = {row[0]: row[1:] for row in cursor.fetchall()}
+        except sqlite3.OperationalError:
+            season_summary = None
+
+    if season_summary is None:
+        return summarize_season(season_id, extract_season_from_db(db_path, season_id))
+    return format_season_summary(season_id, season_summary, conference_summaries)
+
+def summarize_season(season_id, season_data):
+    """Aggregate one season's team dictionaries when no summary is materialized, None when the season has no stats"""
+    if season_data is None:
+        return None
+    from .decade_parser import compute_season_summaries
+    season_summaries, conference_rows = compute_season_summaries({season_id: season_data})
+    conference_summaries = {conference_id: summary for (_, conference_id), summary in conference_rows.items()}
+    return format_season_summary(season_id, season_summaries[season_id], conference_summaries)
+
+def format_season_summary(season_id, season_summary, conference_summaries):
+    """
+    Format a SEASON_SUMMARY_COLUMNS row and {conference_id: CONFERENCE_SUMMARY_COLUMNS row}
+    as the /stats/<season_id>/summary/ body
+    """
+    return {
+        'season': season_id,
+        **dict(zip(SEASON_SUMMARY_COLUMNS, season_summary)),
+        'conferences': {
+            CONFERENCE_NAMES[conference_id]: dict(zip(CONFERENCE_SUMMARY_COLUMNS, summary))
+            for conference_id, summary in sorted(conference_summaries.items(), reverse=True)
+        }
+    }
@@ -0,0 +1,503 @@
+import hashlib
+import multiprocessing
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from multiprocessing import shared_memory
+from .instrumentation import instrumented
+from .seasons import (
+    DEFAULT_SEASON_DATES,
+    FIRST_SEASON,
+    LAST_SEASON,
+    CALENDAR_SEASON_TYPES,
+    CONFERENCE_NAMES,
+    season_name,
+    season_start_year,
+    get_conference_id,
+    SOURCE_COLUMNS,
+    RELATIVE_METRICS,
+    SEASON_SUMMARY_COLUMNS,
+    CONFERENCE_SUMMARY_COLUMNS
+)
+
+class TeamObject:
+    def __init__(self, name, id, conference):
+        self.name = name
+        self.id = id
+        self.conference = conference
+
+    @staticmethod
+    def convert_to_datetime(date_input):
+        """
+        Convert various date formats to datetime object
+        """
+        if isinstance(date_input, pd.Timestamp):
+            return date_input.to_pydatetime()
+        elif isinstance(date_input, str):
+            return datetime.strptime(date_input, "%Y-%m-%d")
+        elif isinstance(date_input, datetime):
+            return date_input
+        else:
+            raise ValueError(f"Unsupported date format: {type(date_input)}")
+
+    @staticmethod
+    def get_season_dates(season, season_dates):
+        """
+        Get the start and end dates for a specific season
+        Args:
+            season (str): Season in format "YYYY-YY"
+            season_dates (dict): Season calendar, as returned by process_filter_db
+        Returns:
+            dict: Dictionary containing start and end dates for the season
+        """
+        return season_dates.get(season)
+
+    @staticmethod
+    def get_season_boundaries(season_dates):
+        """
+        Get the sorted season start and end dates of a calendar
+        Args:
+            season_dates (dict): {season: {"start": "YYYY-MM-DD", "end": "YYYY-MM-DD"}}, as returned by process_filter_db
+        Returns:
+            tuple: (season names, start dates, end dates) with the dates as datetime64 arrays
+        """
+        seasons = sorted(season_dates, key=lambda season: season_dates[season]["start"])
+        starts = np.array([season_dates[season]["start"] for season in seasons], dtype='datetime64[ns]')
+        ends = np.array([season_dates[season]["end"] for season in seasons], dtype='datetime64[ns]')
+        return seasons, starts, ends
+
+    @staticmethod
+    def get_season_indices(dates, season_dates):
+        """
+        Find the season every date falls into with a binary search over the season boundaries
+        Args:
+            dates: Array-like of dates in any format pandas understands
+            season_dates (dict): Season calendar, as returned by process_filter_db
+        Returns:
+            np.ndarray: Position in get_season_boundaries(season_dates) for each date, -1 if outside every season
+        """
+        seasons, starts, ends = TeamObject.get_season_boundaries(season_dates)
+        dates = pd.to_datetime(pd.Series(dates)).to_numpy(dtype='datetime64[ns]')
+        positions = np.searchsorted(starts, dates, side='right') - 1
+        in_season = (positions >= 0) & (dates <= ends[np.maximum(positions, 0)])
+        return np.where(in_season, positions, -1)
+
+    @staticmethod
+    def is_date_in_season(date_input, season, season_dates):
+        """
+        Check if a given date falls within a specific season
+        Args:
+            date_input: Date in string, Timestamp, or datetime format
+            season (str): Season in format "YYYY-YY"
+            season_dates (dict): Season calendar, as returned by process_filter_db
+        Returns:
+            bool: True if date is within season, False otherwise
+        """
+        if season not in season_dates:
+            return False
+
+        seasons = TeamObject.get_season_boundaries(season_dates)[0]
+        position = TeamObject.get_season_indices([TeamObject.convert_to_datetime(date_input)], season_dates)[0]
+        return position >= 0 and seasons[position] == season
+
+def build_season_calendar(dataframe, first_season=FIRST_SEASON, last_season=LAST_SEASON):
+    """
+    Derive the season calendar from the games themselves
+    Args:
+        dataframe (pd.DataFrame): Games with season_id and game_date (already datetimes)
+    Returns:
+        dict: {season: {"start", "end"}} running from each season's first to last calendar game,
+              sorted by start date. Sources without a season_id fall back to DEFAULT_SEASON_DATES
+    """
+    if 'season_id' not in dataframe.columns:
+        return {season: dates for season, dates in DEFAULT_SEASON_DATES.items()
+                if first_season <= season_start_year(season) <= last_season}
+
+    season_ids = dataframe['season_id'].astype(str)
+    start_years = pd.to_numeric(season_ids.str[1:], errors='coerce')
+    in_calendar = season_ids.str[0].isin(CALENDAR_SEASON_TYPES) & start_years.between(first_season, last_season)
+    bounds = dataframe['game_date'][in_calendar].groupby(start_years[in_calendar].astype(np.int64)).agg(['min', 'max'])
+    bounds = bounds.sort_values('min')
+    return {
+        season_name(start_year): {"start": start.strftime("%Y-%m-%d"), "end": end.strftime("%Y-%m-%d")}
+        for start_year, start, end in zip(bounds.index, bounds['min'], bounds['max'])
+    }
+
+@instrumented('process_filter_db', rows=lambda result: len(result[0]))
+def process_filter_db(dataframe=None, first_season=FIRST_SEASON, last_season=LAST_SEASON):
+    """
+    Filter the games to the parsed seasons and find the teams that played in them
+    Returns:
+        tuple: (games inside the calendar, team objects, season calendar). The calendar is derived from
+               the games by build_season_calendar and is passed on to every later stage
+    """
+    # Create DataFrame for summary and filter data 
+    if dataframe is None:
+        raise ValueError("The dataframe must be provided")
+    
+    summary_df = dataframe
+    summary_df['game_date'] = pd.to_datetime(summary_df['game_date'])
+
+    # Every later season lookup runs against the calendar of the games being parsed
+    season_dates = build_season_calendar(summary_df, first_season, last_season)
+    seasons, starts, ends = TeamObject.get_season_boundaries(season_dates)
+    if not seasons:
+        return summary_df.iloc[0:0], [], season_dates
+    range_dataframe = summary_df[(summary_df['game_date'] >= starts.min()) & (summary_df['game_date'] <= ends.max())]
+
+    # Find every unique team in the dataset and pass them to the TeamObject with their name and id,
+    # keeping teams that belong to a conference in at least one of the parsed seasons
+    season_positions = TeamObject.get_season_indices(range_dataframe['game_date'], season_dates)
+    home_teams = pd.DataFrame({
+        'team_id': np.asarray(range_dataframe['team_id_home'], dtype=object),
+        'team_name': np.asarray(range_dataframe['team_name_home'], dtype=object),
+        'position': season_positions,
+    })[season_positions >= 0].drop_duplicates()
+
+    team_objects = []
+    for team, team_seasons in home_teams.groupby('team_id', sort=False):
+        conferences = [
+            (position, team_name, get_conference_id(team_name, season_start_year(seasons[position])))
+            for team_name, position in zip(team_seasons['team_name'], team_seasons['position'])
+        ]
+        conferences = sorted(entry for entry in conferences if entry[2] is not None)
+        if conferences:
+            # A franchise is named and placed by its most recent season
+            position, team_name, conference_id = conferences[-1]
+            team_objects.append(TeamObject(team_name, team, CONFERENCE_NAMES[conference_id]))
+
+    return range_dataframe, team_objects, season_dates
+
+# Per-game metrics stored for every team-game, in the order they are reported
+GAME_METRIC_COLUMNS = ['plus_minus', 'offensive_rating', 'defensive_rating', 'net_rating', 'possessions']
+
+def calculate_possessions(fga, fta, fgm, tov, oreb, opp_dreb):
+    """
+    Estimate possessions for one side of a game. Works on scalars or whole columns
+    """
+    orb_denom = np.maximum(oreb + opp_dreb, 1)  # Avoid division by zero
+    orb_pct = np.divide(oreb, orb_denom)
+    return fga + 0.4 * fta + -1.07 * orb_pct * (fga - fgm) + tov
+
+def compute_team_game_ratings(range_dataframe):
+    """
+    Compute possession-based metrics for every game in a single columnar pass
+    Args:
+        range_dataframe (pd.DataFrame): Games in the Kaggle 'game' table layout
+    Returns:
+        pd.DataFrame: Long-format team-game frame with two rows per game (home first, then away),
+                      holding game_date, team_id, team_name, is_home and the GAME_METRIC_COLUMNS
+    """
+    def column(name):
+        return range_dataframe[name].to_numpy(dtype=np.float64)
+
+    home_poss = calculate_possessions(column('fga_home'), column('fta_home'), column('fgm_home'),
+                                      column('tov_home'), column('oreb_home'), column('dreb_away'))
+    away_poss = calculate_possessions(column('fga_away'), column('fta_away'), column('fgm_away'),
+                                      column('tov_away'), column('oreb_away'), column('dreb_home'))
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        home_rating = np.multiply(np.divide(column('pts_home'), home_poss), 100)
+        away_rating = np.multiply(np.divide(column('pts_away'), away_poss), 100)
+    possessions = (home_poss + away_poss) / 2
+
+    game_count = len(range_dataframe)
+    # Interleave home and away rows so every team keeps its games in source order
+    team_games = pd.DataFrame({
+        'game_date': np.repeat(range_dataframe['game_date'].to_numpy(), 2),
+        'team_id': np.column_stack([range_dataframe['team_id_home'].to_numpy(),
+                                    range_dataframe['team_id_away'].to_numpy()]).ravel(),
+        'team_name': np.column_stack([np.asarray(range_dataframe['team_name_home'], dtype=object),
+                                      np.asarray(range_dataframe['team_name_away'], dtype=object)]).ravel(),
+        'is_home': np.tile([True, False], game_count),
+        'plus_minus': np.column_stack([column('plus_minus_home'), column('plus_minus_away')]).ravel(),
+        'offensive_rating': np.column_stack([home_rating, away_rating]).ravel(),
+        'defensive_rating': np.column_stack([away_rating, home_rating]).ravel(),
+        'possessions': np.repeat(possessions, 2),
+    })
+    team_games['net_rating'] = team_games['offensive_rating'] - team_games['defensive_rating']
+
+    return team_games[['game_date', 'team_id', 'team_name', 'is_home'] + GAME_METRIC_COLUMNS]
+
+@instrumented('generate_dataframe_metrics', rows=len)
+def generate_dataframe_metrics(range_dataframe, team_objects, season_dates):
+    """
+    Generate possession-based metrics for every game played by a known team
+    Args:
+        range_dataframe (pd.DataFrame): Games returned by process_filter_db
+        team_objects (list): Teams returned by process_filter_db
+        season_dates (dict): Season calendar returned by process_filter_db
+    Returns:
+        pd.DataFrame: Team-game frame from compute_team_game_ratings restricted to team_objects,
+                      with team_order, team, conference and season_index columns added
+    """
+    team_games = compute_team_game_ratings(range_dataframe)
+
+    team_order = pd.Series(range(len(team_objects)), index=[team.id for team in team_objects])
+    team_games['team_order'] = team_games['team_id'].map(team_order)
+    team_games = team_games[team_games['team_order'].notna()].astype({'team_order': np.int64})
+    # A team only keeps its last game on any given date
+    team_games = team_games.drop_duplicates(['team_id', 'game_date'], keep='last')
+
+    # Label every game with its season in one pass instead of scanning each season per team
+    team_games['season_index'] = TeamObject.get_season_indices(team_games['game_date'], season_dates)
+
+    # Teams are labeled per season with the name they played under and the conference they played in,
+    # resolved once per distinct (name, season) pair
+    seasons = TeamObject.get_season_boundaries(season_dates)[0]
+    pairs = team_games[['team_name', 'season_index']].drop_duplicates()
+    pairs['conference'] = [
+        CONFERENCE_NAMES.get(get_conference_id(team_name, season_start_year(seasons[position]))) if position >= 0 else None
+        for team_name, position in zip(pairs['team_name'], pairs['season_index'])
+    ]
+    team_games = team_games.merge(pairs, on=['team_name', 'season_index'], how='left')
+    team_games['team'] = team_games['team_name']
+    # In-season games under a name without a conference that season are not counted
+    team_games = team_games[(team_games['season_index'] < 0) | team_games['conference'].notna()]
+
+    return team_games
+
+# Season averages reported for every team, mapped from the per-game metric they average
+SEASON_METRIC_COLUMNS = {
+    'average_offensive_rating': 'offensive_rating',
+    'average_defensive_rating': 'defensive_rating',
+    'average_net_rating': 'net_rating',
+    'average_plus_minus': 'plus_minus',
+}
+
+@instrumented('generate_individual_season_metrics', rows=lambda seasons_dict: sum(len(teams) for teams in seasons_dict.values()))
+def generate_individual_season_metrics(team_games, season_dates):
+    # Generate possession-based metrics for every team in each season of the calendar
+    seasons, starts, ends = TeamObject.get_season_boundaries(season_dates)
+    seasons_dict = {season: [] for season in season_dates.keys()}
+
+    team_games = team_games[team_games['season_index'] >= 0]
+    metrics = team_games[list(SEASON_METRIC_COLUMNS.values())]
+    group_keys = [team_games['season_index'], team_games['team_order']]
+    averages = metrics.groupby(group_keys).mean()
+    # A missing box score value makes the whole season average missing, like np.mean
+    averages = averages.mask(metrics.isna().groupby(group_keys).any())
+    labels = team_games.groupby(group_keys)[['team', 'conference']].first()
+
+    for (season_index, team_order), team_label, team_averages in zip(
+            averages.index, labels.itertuples(index=False), averages.itertuples(index=False)):
+        team_data = {"team": team_label.team, "conference": team_label.conference}
+        team_data.update(zip(SEASON_METRIC_COLUMNS, team_averages))
+        seasons_dict[seasons[season_index]].append(team_data)
+    return seasons_dict
+
+@instrumented('generate_relative_metrics')
+def generate_relative_metrics(seasons_dict):
+    # Add relative net rating to each season
+    for season, teams_data in seasons_dict.items():
+        mean_net_rating = np.mean([team_data['average_net_rating'] for team_data in teams_data])
+        mean_offensive_rating = np.mean([team_data['average_offensive_rating'] for team_data in teams_data])
+        mean_defensive_rating = np.mean([team_data['average_defensive_rating'] for team_data in teams_data])
+        
+        for team_data in teams_data:
+            team_data['relative_net_rating'] = team_data['average_net_rating'] - mean_net_rating
+            team_data['relative_offensive_rating'] = team_data['average_offensive_rating'] - mean_offensive_rating
+            team_data['relative_defensive_rating'] = team_data['average_defensive_rating'] - mean_defensive_rating
+    
+def _sample_std(values):
+    # Sample standard deviation of every column in one pass, undefined (None) for fewer than two teams
+    if len(values) < 2:
+        return (None,) * values.shape[1]
+    return tuple(float(value) for value in values.std(axis=0, ddof=1))
+
+def compute_season_summaries(seasons_dict):
+    """
+    Aggregate the parsed team metrics of every season
+    Args:
+        seasons_dict (dict): {season: [team metrics, ...]} as returned by parse_range_data
+    Returns:
+        tuple: ({season: SEASON_SUMMARY_COLUMNS values}, {(season, conference_id): CONFERENCE_SUMMARY_COLUMNS values}),
+        seasons without teams are left out
+    """
+    averages = ('average_offensive_rating', 'average_defensive_rating', 'average_net_rating')
+    season_summaries, conference_summaries = {}, {}
+    for season, teams_data in seasons_dict.items():
+        if not teams_data:
+            continue
+        season_averages = np.array([[team_data[column] for column in averages] for team_data in teams_data], dtype=np.float64)
+        relative = np.array([[team_data[column] for column in RELATIVE_METRICS] for team_data in teams_data], dtype=np.float64)
+
+        season_summaries[season] = (
+            len(teams_data),
+            *(float(value) for value in season_averages.mean(axis=0)),
+            *_sample_std(season_averages),
+            *(float(bound) for low, high in zip(relative.min(axis=0), relative.max(axis=0)) for bound in (low, high)),
+        )
+
+        conference_ids = np.array([team_data['conference'][0] for team_data in teams_data])
+        for conference_id in np.unique(conference_ids):
+            conference_relative = relative[conference_ids == conference_id]
+            conference_summaries[(season, str(conference_id))] = (
+                len(conference_relative),
+                *(float(value) for value in conference_relative.mean(axis=0)),
+                *_sample_std(conference_relative),
+            )
+    return season_summaries, conference_summaries
+
+@instrumented('compute_season_fingerprints')
+def compute_season_fingerprints(range_dataframe, season_dates):
+    """
+    Fingerprint the source rows of every season so unchanged seasons can be skipped on rebuild
+    Args:
+        range_dataframe (pd.DataFrame): Games returned by process_filter_db
+        season_dates (dict): Season calendar returned by process_filter_db
+    Returns:
+        dict: {season: (row_count, content_hash)} for every season with at least one game
+    """
+    seasons, starts, ends = TeamObject.get_season_boundaries(season_dates)
+    season_positions = TeamObject.get_season_indices(range_dataframe['game_date'], season_dates)
+
+    # Hash a dtype-stable copy so compact source dtypes do not change the fingerprint
+    source = range_dataframe[[column for column in SOURCE_COLUMNS if column in range_dataframe.columns]]
+    source = source.astype({
+        column: np.float64 for column in source.columns if pd.api.types.is_numeric_dtype(source[column])
+    }).astype({column: object for column in source.columns if isinstance(source[column].dtype, pd.CategoricalDtype)})
+    row_hashes = pd.util.hash_pandas_object(source, index=False).to_numpy()
+
+    fingerprints = {}
+    for position in np.unique(season_positions[season_positions >= 0]):
+        # Sorting makes the hash independent of the order rows come back from the source
+        season_hashes = np.sort(row_hashes[season_positions == position])
+        content_hash = hashlib.sha256(season_hashes.tobytes()).hexdigest()
+        fingerprints[seasons[position]] = (len(season_hashes), content_hash)
+    return fingerprints
+
+# Box score columns copied into the shared float64 block for parallel parsing, in block column order
+PARTITION_FLOAT_COLUMNS = [column for column in SOURCE_COLUMNS if column not in
+                           ('season_id', 'game_date', 'team_id_home', 'team_name_home', 'team_id_away', 'team_name_away')]
+
+def _shared_array(array):
+    # Copy an array into a new shared memory block, the caller owns (and must unlink) the block
+    block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+    return block
+
+def _parse_season_partition(partition):
+    """
+    Worker side of parse_range_data's parallel mode: rebuild one season's games from the shared blocks
+    and run the rating and aggregation stages on them
+    Returns:
+        tuple: (season, [team metrics, ...]) before relative metrics are added
+    """
+    season, season_dates, team_labels, team_names, (int_name, float_name), shape, start, stop = partition
+
+    int_block = shared_memory.SharedMemory(name=int_name)
+    float_block = shared_memory.SharedMemory(name=float_name)
+    try:
+        ints = np.ndarray((shape, 5), dtype=np.int64, buffer=int_block.buf)[start:stop]
+        floats = np.ndarray((shape, len(PARTITION_FLOAT_COLUMNS)), dtype=np.float64, buffer=float_block.buf)[start:stop]
+        games = pd.DataFrame(floats, columns=PARTITION_FLOAT_COLUMNS)
+        games['game_date'] = ints[:, 0].astype('datetime64[ns]')
+        # Team ids were replaced by positions in team_objects, -1 for teams outside them
+        games['team_id_home'] = ints[:, 1]
+        games['team_id_away'] = ints[:, 2]
+        names = np.array(team_names, dtype=object)
+        games['team_name_home'] = names[ints[:, 3]]
+        games['team_name_away'] = names[ints[:, 4]]
+        team_objects = [TeamObject(name, order, conference) for order, (name, conference) in enumerate(team_labels)]
+
+        team_games = generate_dataframe_metrics(games, team_objects, season_dates)
+        return season, generate_individual_season_metrics(team_games, season_dates)[season]
+    finally:
+        int_block.close()
+        float_block.close()
+
+@instrumented('parse_seasons_parallel')
+def _parse_seasons_in_parallel(range_dataframe, team_objects, season_dates, seasons, workers):
+    """
+    Partition the games by season and aggregate the partitions in a process pool.
+    The games are copied once into two shared memory blocks, sorted by season, so each worker
+    only receives a block name and its row range instead of a pickled DataFrame.
+    Returns None when there are fewer than two seasons to split the work over.
+    """
+    season_names = TeamObject.get_season_boundaries(season_dates)[0]
+    season_positions = TeamObject.get_season_indices(range_dataframe['game_date'], season_dates)
+    wanted = [position for position in np.unique(season_positions[season_positions >= 0])
+              if seasons is None or season_names[position] in seasons]
+    if len(wanted) < 2:
+        return None
+
+    # A stable sort keeps every season's games in source order, which the duplicate-date handling relies on
+    order = np.argsort(season_positions, kind='stable')
+    sorted_positions = season_positions[order]
+    team_index = pd.Index([team.id for team in team_objects])
+    home_names = np.asarray(range_dataframe['team_name_home'], dtype=object)
+    away_names = np.asarray(range_dataframe['team_name_away'], dtype=object)
+    team_names, name_codes = np.unique(np.concatenate([home_names, away_names]).astype(str), return_inverse=True)
+    ints = np.column_stack([
+        pd.to_datetime(range_dataframe['game_date']).to_numpy(dtype='datetime64[ns]').view(np.int64),
+        team_index.get_indexer(np.asarray(range_dataframe['team_id_home'], dtype=object)),
+        team_index.get_indexer(np.asarray(range_dataframe['team_id_away'], dtype=object)),
+        name_codes[:len(home_names)],
+        name_codes[len(home_names):],
+    ])[order]
+    floats = range_dataframe[PARTITION_FLOAT_COLUMNS].to_numpy(dtype=np.float64)[order]
+
+    blocks = []
+    try:
+        blocks = [_shared_array(ints), _shared_array(floats)]
+        block_names = tuple(block.name for block in blocks)
+        team_labels = [(team.name, team.conference) for team in team_objects]
+        partitions = [
+            (season_names[position], season_dates, team_labels, list(team_names), block_names, len(ints),
+             np.searchsorted(sorted_positions, position, side='left'),
+             np.searchsorted(sorted_positions, position, side='right'))
+            for position in wanted
+        ]
+        # Spawned, not forked: updates run on a job thread of a multithreaded server, and a forked child could
+        # inherit locks (sqlite, logging, the metrics registry) held by other threads and deadlock on them
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(partitions)), mp_context=multiprocessing.get_context('spawn')
+        ) as executor:
+            return dict(executor.map(_parse_season_partition, partitions))
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+def parse_range_data(range_dataframe, team_objects, season_dates, seasons=None, workers=1):
+    """
+    Run the metric stages over games already filtered by process_filter_db
+    Args:
+        range_dataframe (pd.DataFrame): Games returned by process_filter_db
+        team_objects (list): Teams returned by process_filter_db
+        season_dates (dict): Season calendar returned by process_filter_db
+        seasons (iterable, optional): Only parse these seasons, every season when omitted
+        workers (int, optional): Parse seasons in this many processes, results are identical to the serial path
+    Returns:
+        dict: {season: [team metrics, ...]}
+    """
+    parsed = None
+    if workers > 1:
+        parsed = _parse_seasons_in_parallel(
+            range_dataframe, team_objects, season_dates, None if seasons is None else set(seasons), workers
+        )
+
+    if parsed is not None:
+        # Same keys and order as the serial path, seasons without games stay empty
+        seasons_dict = {season: parsed.get(season, []) for season in season_dates.keys()}
+    else:
+        # Generate possession-based metrics for each game
+        team_games = generate_dataframe_metrics(range_dataframe, team_objects, season_dates)
+
+        # Generate possession-based metrics for each team in each season
+        seasons_dict = generate_individual_season_metrics(team_games, season_dates)
+    if seasons is not None:
+        seasons_dict = {season: seasons_dict[season] for season in seasons if season in seasons_dict}
+    
+    # Add relative net rating to each season
+    generate_relative_metrics(seasons_dict)
+    
+    return seasons_dict
+
+def parse_decade_data(unfiltered_data, workers=1):
+    # Process data and filter based on date
+    range_dataframe, team_objects, season_dates = process_filter_db(unfiltered_data)
+    
+    return parse_range_data(range_dataframe, team_objects, season_dates, workers=workers)
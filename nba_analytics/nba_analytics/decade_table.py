@@ -0,0 +1,164 @@
+import json
+import math
+from array import array
+from collections.abc import Mapping
+
+# Stat columns stored for every team-season, in the order they are serialized
+STAT_COLUMNS = (
+    'average_offensive_rating',
+    'average_defensive_rating',
+    'average_net_rating',
+    'average_plus_minus',
+    'relative_net_rating',
+    'relative_offensive_rating',
+    'relative_defensive_rating',
+)
+
+class TeamSeasonRow(Mapping):
+    """
+    Read-only view of one team-season inside a DecadeTable.
+    Behaves like the team dictionaries the parser produces without materializing them.
+    """
+    __slots__ = ('_table', '_index')
+
+    def __init__(self, table, index):
+        self._table = table
+        self._index = index
+
+    @property
+    def team(self):
+        return self._table.team_names[self._table.team_codes[self._index]]
+
+    @property
+    def conference(self):
+        return self._table.conference_names[self._table.conference_codes[self._index]]
+
+    def __getitem__(self, key):
+        if key == 'team':
+            return self.team
+        if key == 'conference':
+            return self.conference
+        try:
+            column = STAT_COLUMNS.index(key)
+        except ValueError:
+            raise KeyError(key) from None
+        return self._table.stats[self._index * len(STAT_COLUMNS) + column]
+
+    def __iter__(self):
+        yield 'team'
+        yield 'conference'
+        yield from STAT_COLUMNS
+
+    def __len__(self):
+        return 2 + len(STAT_COLUMNS)
+
+class DecadeTable(Mapping):
+    """
+    Columnar store of team-season stats, mapping season_id to that season's rows.
+    Stats live in one contiguous float64 array (row-major, len(STAT_COLUMNS) values per row),
+    team and conference are small integer codes into name lists, and each season is an offset
+    slice of the rows, so a decade costs a handful of buffers instead of thousands of objects.
+    """
+    def __init__(self):
+        self.season_ids = []
+        self.season_offsets = array('q', [0])
+        self.team_names = []
+        self.team_codes = array('H')
+        self.conference_names = []
+        self.conference_codes = array('B')
+        self.stats = array('d')
+        self._season_positions = {}
+        self._team_lookup = {}
+        self._conference_lookup = {}
+
+    @staticmethod
+    def _code(lookup, names, name):
+        code = lookup.get(name)
+        if code is None:
+            code = lookup[name] = len(names)
+            names.append(name)
+        return code
+
+    def append(self, season_id, team, conference, stats):
+        """Add one row, rows of a season must be appended consecutively"""
+        if not self.season_ids or self.season_ids[-1] != season_id:
+            if season_id in self._season_positions:
+                raise ValueError(f"Rows of season {season_id} must be appended consecutively")
+            self._season_positions[season_id] = len(self.season_ids)
+            self.season_ids.append(season_id)
+            self.season_offsets.append(self.season_offsets[-1])
+        self.team_codes.append(self._code(self._team_lookup, self.team_names, team))
+        self.conference_codes.append(self._code(self._conference_lookup, self.conference_names, conference))
+        self.stats.extend(stats)
+        self.season_offsets[-1] += 1
+
+    @classmethod
+    def from_rows(cls, rows):
+        """Build from (season_id, team, conference, *stats) rows ordered by season"""
+        table = cls()
+        for season_id, team, conference, *stats in rows:
+            table.append(season_id, team, conference, stats)
+        return table
+
+    @classmethod
+    def from_seasons_dict(cls, seasons_dict):
+        """Build from the {season: [team dictionaries]} shape produced by the parser"""
+        return cls.from_rows(
+            (season_id, team_data['team'], team_data['conference'], *(team_data[column] for column in STAT_COLUMNS))
+            for season_id, teams_data in seasons_dict.items()
+            for team_data in teams_data
+        )
+
+    def season_slice(self, season_id):
+        position = self._season_positions[season_id]
+        return range(self.season_offsets[position], self.season_offsets[position + 1])
+
+    def __getitem__(self, season_id):
+        return [TeamSeasonRow(self, index) for index in self.season_slice(season_id)]
+
+    def __iter__(self):
+        return iter(self.season_ids)
+
+    def __len__(self):
+        return len(self.season_ids)
+
+    def __contains__(self, season_id):
+        return season_id in self._season_positions
+
+    @property
+    def row_count(self):
+        return len(self.team_codes)
+
+    def to_dict(self):
+        """Materialize the {season: [team dictionaries]} shape"""
+        return {season_id: [dict(row) for row in self[season_id]] for season_id in self.season_ids}
+
+    def to_json(self):
+        """
+        Encode straight from the arrays into the same compact JSON the API renders for to_dict().
+        Every float is formatted in one C-level json pass and names are encoded once per distinct value,
+        rows are then assembled column-wise without building any per-row objects.
+        """
+        values = self.stats.tolist()
+        if not all(map(math.isfinite, values)):
+            raise ValueError("Out of range float values are not JSON compliant")
+
+        width = len(STAT_COLUMNS)
+        formatted = json.dumps(values)[1:-1].split(', ') if values else []
+        teams = [json.dumps(name, ensure_ascii=False) for name in self.team_names]
+        conferences = [json.dumps(name, ensure_ascii=False) for name in self.conference_names]
+        row_template = '{"team":%s,"conference":%s,' + ','.join(f'"{column}":%s' for column in STAT_COLUMNS) + '}'
+
+        rows = list(map(
+            row_template.__mod__,
+            zip(
+                map(teams.__getitem__, self.team_codes),
+                map(conferences.__getitem__, self.conference_codes),
+                *(formatted[column::width] for column in range(width))
+            )
+        ))
+        seasons = [
+            f'{json.dumps(season_id, ensure_ascii=False)}:[{",".join(rows[start:stop])}]'
+            for season_id, start, stop in zip(self.season_ids, self.season_offsets, self.season_offsets[1:])
+        ]
+        return ('{' + ','.join(seasons) + '}').encode()
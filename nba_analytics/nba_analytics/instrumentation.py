@@ -0,0 +1,258 @@
+import cProfile
+import functools
+import os
+import re
+import tempfile
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+# Per-stage peak memory needs tracemalloc, which slows every allocation down, so it is opt-in.
+# Peaks are process-wide: stages running concurrently in other threads count towards each other.
+TRACE_MEMORY = os.getenv('NBA_TRACE_MEMORY', '') == '1'
+
+# cProfile dumps are written here, see profile_to
+PROFILE_DIR = os.getenv('NBA_PROFILE_DIR', os.path.join(tempfile.gettempdir(), 'nba_profiles'))
+
+class Timer:
+    """Handed out by MetricsRegistry.timer, the timed block may set rows to report its throughput"""
+    __slots__ = ('rows', 'seconds', 'peak_bytes')
+
+    def __init__(self):
+        self.rows = None
+        self.seconds = None
+        self.peak_bytes = None
+
+class _MemoryFrames(threading.local):
+    def __init__(self):
+        # Peak seen by each open timer before a nested timer reset tracemalloc's peak
+        self.stack = []
+
+class MetricsRegistry:
+    """
+    Thread-safe in-process timings, keyed on a metric family and label set.
+    Every series keeps a count, total and maximum duration, total rows, and the rows per second
+    and peak memory of its most recent run.
+    """
+    def __init__(self, trace_memory=TRACE_MEMORY):
+        self.trace_memory = trace_memory
+        self._lock = threading.Lock()
+        self._series = {}
+        self._memory = _MemoryFrames()
+
+    @contextmanager
+    def timer(self, family, **labels):
+        """
+        Time the block and record it under family with the given labels, failures included.
+
+        Args:
+            family: Metric family, 'stage' for pipeline steps and 'request' for views
+            labels: Label values identifying the series, e.g. stage='insert_teams'
+        """
+        timer = Timer()
+        tracing = self._enter_memory()
+        started = time.perf_counter()
+        error = False
+        try:
+            yield timer
+        except BaseException:
+            error = True
+            raise
+        finally:
+            timer.seconds = time.perf_counter() - started
+            if tracing:
+                timer.peak_bytes = self._exit_memory()
+            self.record(family, timer.seconds, timer.rows, timer.peak_bytes, error, **labels)
+
+    def _enter_memory(self):
+        if not self.trace_memory:
+            return False
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        stack = self._memory.stack
+        if stack:
+            # Keep the outer timers' peaks before this timer restarts the measurement
+            peak = tracemalloc.get_traced_memory()[1]
+            for index, seen in enumerate(stack):
+                stack[index] = max(seen, peak)
+        tracemalloc.reset_peak()
+        stack.append(0)
+        return True
+
+    def _exit_memory(self):
+        stack = self._memory.stack
+        peak = max(tracemalloc.get_traced_memory()[1], stack.pop())
+        if stack:
+            stack[-1] = max(stack[-1], peak)
+        else:
+            tracemalloc.stop()
+        return peak
+
+    def record(self, family, seconds, rows=None, peak_bytes=None, error=False, **labels):
+        key = (family, tuple(sorted(labels.items())))
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = {
+                    'count': 0, 'errors': 0, 'seconds_total': 0.0, 'seconds_max': 0.0, 'seconds_last': 0.0,
+                    'rows_total': None, 'rows_per_second': None, 'peak_bytes': None
+                }
+            series['count'] += 1
+            series['errors'] += int(error)
+            series['seconds_total'] += seconds
+            series['seconds_max'] = max(series['seconds_max'], seconds)
+            series['seconds_last'] = seconds
+            if rows is not None:
+                series['rows_total'] = (series['rows_total'] or 0) + rows
+                series['rows_per_second'] = rows / seconds if seconds > 0 else None
+            if peak_bytes is not None:
+                series['peak_bytes'] = peak_bytes
+
+    def snapshot(self):
+        """{(family, ((label, value), ...)): series} copy of every recorded series"""
+        with self._lock:
+            return {key: dict(series) for key, series in self._series.items()}
+
+    def clear(self):
+        with self._lock:
+            self._series.clear()
+
+metrics = MetricsRegistry()
+
+def timed(stage, registry=None):
+    """Context manager timing one pipeline stage, see MetricsRegistry.timer"""
+    return (registry or metrics).timer('stage', stage=stage)
+
+def instrumented(stage, rows=None):
+    """
+    Decorator timing every call of a pipeline function as a stage
+
+    Args:
+        stage: Stage name reported in the metrics
+        rows: Optional callable taking the function's result and returning the number of rows it handled
+    """
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with timed(stage) as timer:
+                result = function(*args, **kwargs)
+                if rows is not None:
+                    timer.rows = rows(result)
+                return result
+        return wrapper
+    return decorator
+
+def peak_rss_bytes():
+    """High-water mark of the process' resident memory, None where the platform does not report it"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if os.uname().sysname == 'Darwin' else peak * 1024
+
+# Exposed metric suffix: (series key, metric type, help)
+METRIC_HELP = {
+    'seconds': (None, 'summary', "Wall time in seconds"),
+    'seconds_max': ('seconds_max', 'gauge', "Longest wall time in seconds"),
+    'seconds_last': ('seconds_last', 'gauge', "Wall time of the most recent run in seconds"),
+    'errors_total': ('errors', 'counter', "Runs that raised"),
+    'rows_total': ('rows_total', 'counter', "Rows handled"),
+    'rows_per_second': ('rows_per_second', 'gauge', "Rows per second of the most recent run"),
+    'peak_bytes': ('peak_bytes', 'gauge', "Peak traced memory of the most recent run in bytes"),
+}
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+def _labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in labels) + '}'
+
+def _sanitize(name):
+    return re.sub(r'[^a-zA-Z0-9_]', '_', name)
+
+def render_prometheus(registry=None, extra=(), prefix='nba'):
+    """
+    Render the registry in the Prometheus text exposition format (version 0.0.4)
+
+    Args:
+        registry: MetricsRegistry to render, the process-wide one by default
+        extra: Iterable of (name, type, help, value) samples appended as unlabelled metrics
+        prefix: Prefix of every metric name
+
+    Returns:
+        str: The exposition text
+    """
+    families = {}
+    for (family, labels), series in sorted((registry or metrics).snapshot().items()):
+        families.setdefault(family, []).append((labels, series))
+
+    lines = []
+    for family, entries in families.items():
+        base = f"{prefix}_{_sanitize(family)}"
+        for suffix, (key, metric_type, help_text) in METRIC_HELP.items():
+            name = f"{base}_{suffix}"
+            samples = []
+            for labels, series in entries:
+                if key is None:
+                    samples.append(f"{name}_count{_labels(labels)} {series['count']}")
+                    samples.append(f"{name}_sum{_labels(labels)} {series['seconds_total']!r}")
+                elif series[key] is not None:
+                    samples.append(f"{name}{_labels(labels)} {series[key]!r}")
+            if samples:
+                lines.append(f"# HELP {name} {help_text} per {family}")
+                lines.append(f"# TYPE {name} {metric_type}")
+                lines.extend(samples)
+
+    rss = peak_rss_bytes()
+    samples = list(extra)
+    if rss is not None:
+        samples.append(('process_peak_rss_bytes', 'gauge', "High-water mark of resident memory in bytes", rss))
+    for name, metric_type, help_text, value in samples:
+        name = f"{prefix}_{_sanitize(name)}"
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {metric_type}")
+        lines.append(f"{name} {value!r}")
+    return '\n'.join(lines) + '\n'
+
+# cProfile only follows the thread that enabled it, and from Python 3.12 on only one profiler
+# can be active per process, so profiles are taken one at a time
+_profile_lock = threading.Lock()
+
+@contextmanager
+def profile_to(name, directory=None, wait=0):
+    """
+    Run the block under cProfile and dump the stats to <directory>/<name>-<timestamp>.prof
+
+    Args:
+        name: Prefix of the profile file name
+        directory: Directory to write to, PROFILE_DIR by default
+        wait: Seconds to wait for a profile that is already running to finish
+
+    Yields:
+        The path the profile is written to (readable with pstats or snakeviz),
+        or None when another block is still being profiled and this one runs unprofiled
+    """
+    if not _profile_lock.acquire(timeout=wait):
+        yield None
+        return
+    try:
+        directory = directory or PROFILE_DIR
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"{_sanitize(name)}-{time.strftime('%Y%m%dT%H%M%S')}-{time.time_ns() % 10**9:09d}.prof")
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield path
+        finally:
+            profiler.disable()
+            profiler.dump_stats(path)
+    finally:
+        _profile_lock.release()
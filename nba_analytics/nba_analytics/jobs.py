@@ -0,0 +1,301 @@
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import traceback
+import uuid
+from contextlib import contextmanager, nullcontext
+
+
+# Stages every data update reports, in the order they run
+UPDATE_STAGES = ('download', 'extract', 'parse', 'load')
+
+# Stages of each job kind, kinds not listed report UPDATE_STAGES
+JOB_STAGES = {
+    'kaggle-update': UPDATE_STAGES,
+    'artifact-update': ('download', 'load'),
+}
+
+# A running job that has not reported progress for this long is treated as abandoned. Jobs whose worker
+# died on this host are treated so right away, see owner_alive
+STALE_JOB_SECONDS = 2 * 60 * 60
+
+JOBS_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS Jobs (
+        job_id TEXT PRIMARY KEY,
+        kind TEXT NOT NULL,
+        status TEXT NOT NULL,
+        options TEXT NOT NULL,
+        stage TEXT,
+        stages TEXT NOT NULL,
+        error TEXT,
+        owner_pid INTEGER,
+        owner_host TEXT,
+        created_at REAL NOT NULL,
+        updated_at REAL NOT NULL,
+        finished_at REAL
+    );
+    CREATE INDEX IF NOT EXISTS idx_jobs_status ON Jobs(status, created_at);
+"""
+
+def owner_alive(owner_pid, owner_host):
+    """
+    Whether the process that started a job may still be running it.
+    Only a process on this host can be checked, any other owner is assumed alive and left to STALE_JOB_SECONDS.
+    """
+    # os.kill(pid, 0) sends CTRL_C_EVENT on Windows instead of probing the process
+    if owner_pid is None or owner_host != socket.gethostname() or os.name == 'nt':
+        return True
+    try:
+        os.kill(owner_pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        # The pid belongs to a process of another user, so it is alive
+        return True
+    return True
+
+class JobStore:
+    """
+    SQLite-backed job table shared by every worker process.
+    Starting a job takes a write lock (BEGIN IMMEDIATE), so at most one update runs across
+    threads, processes and gunicorn workers and concurrent callers are handed the running job instead.
+    """
+    def __init__(self, path, stale_after=STALE_JOB_SECONDS):
+        self.path = path
+        self.stale_after = stale_after
+        self._schema_ready = False
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        try:
+            conn.row_factory = sqlite3.Row
+            if not self._schema_ready:
+                conn.executescript(JOBS_SCHEMA)
+                # Job tables created before owners were recorded with their host
+                if 'owner_host' not in {row['name'] for row in conn.execute("PRAGMA table_info(Jobs)")}:
+                    try:
+                        conn.execute("ALTER TABLE Jobs ADD COLUMN owner_host TEXT")
+                    except sqlite3.OperationalError:
+                        pass  # Added by another process in the meantime
+                self._schema_ready = True
+            yield conn
+        finally:
+            conn.close()
+
+    def _abandoned_reason(self, job, now):
+        # Why a running job can no longer finish, None while it may still be running
+        if not owner_alive(job['owner_pid'], job['owner_host']):
+            return f"Abandoned: owner process {job['owner_pid']} exited"
+        if now - job['updated_at'] >= self.stale_after:
+            return "Abandoned: no progress reported"
+        return None
+
+    def _fail_abandoned(self, conn, now):
+        """
+        Mark running jobs whose worker died or stopped reporting progress as failed.
+        The caller holds the write lock.
+
+        Returns:
+            The running jobs that are still active, newest first
+        """
+        active = []
+        for job in conn.execute(
+            "SELECT job_id, owner_pid, owner_host, updated_at FROM Jobs WHERE status = 'running' ORDER BY created_at DESC"
+        ).fetchall():
+            reason = self._abandoned_reason(job, now)
+            if reason is None:
+                active.append(job)
+                continue
+            conn.execute(
+                "UPDATE Jobs SET status = 'failed', error = ?, finished_at = ?, updated_at = ? WHERE job_id = ?",
+                (reason, now, now, job['job_id'])
+            )
+        return active
+
+    def acquire(self, kind, options=None):
+        """
+        Register a new running job unless one is already running.
+        Running jobs whose worker died (e.g. an OOM kill or a gunicorn restart) no longer count.
+
+        Returns:
+            Tuple of (job_id, created). created is False when an active job was found,
+            in which case job_id identifies that job.
+        """
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                active = self._fail_abandoned(conn, now)
+                if active:
+                    conn.execute("COMMIT")
+                    return active[0]['job_id'], False
+
+                job_id = uuid.uuid4().hex
+                conn.execute(
+                    """INSERT INTO Jobs (job_id, kind, status, options, stages, owner_pid, owner_host, created_at, updated_at)
+                    VALUES (?, ?, 'running', ?, '{}', ?, ?, ?, ?)""",
+                    (job_id, kind, json.dumps(options or {}), os.getpid(), socket.gethostname(), now, now)
+                )
+                conn.execute("COMMIT")
+                return job_id, True
+            except BaseException:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                raise
+
+    def fail_abandoned(self):
+        """Mark abandoned running jobs as failed, so status reads stop reporting them as running"""
+        now = time.time()
+        with self._connect() as conn:
+            running = conn.execute(
+                "SELECT job_id, owner_pid, owner_host, updated_at FROM Jobs WHERE status = 'running'"
+            ).fetchall()
+            # Only take the write lock when there is something to mark
+            if all(self._abandoned_reason(job, now) is None for job in running):
+                return
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._fail_abandoned(conn, now)
+                conn.execute("COMMIT")
+            except BaseException:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                raise
+
+    def _update_stages(self, job_id, update):
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute("SELECT stages FROM Jobs WHERE job_id = ?", (job_id,)).fetchone()
+                stages = json.loads(row['stages'])
+                stage = update(stages)
+                conn.execute(
+                    "UPDATE Jobs SET stages = ?, stage = ?, updated_at = ? WHERE job_id = ?",
+                    (json.dumps(stages), stage, time.time(), job_id)
+                )
+                conn.execute("COMMIT")
+            except BaseException:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                raise
+
+    def start_stage(self, job_id, stage):
+        def update(stages):
+            stages[stage] = {'status': 'running', 'started_at': time.time()}
+            return stage
+        self._update_stages(job_id, update)
+
+    def finish_stage(self, job_id, stage, failed=False):
+        def update(stages):
+            entry = stages[stage]
+            entry['finished_at'] = time.time()
+            entry['seconds'] = round(entry['finished_at'] - entry['started_at'], 3)
+            entry['status'] = 'failed' if failed else 'succeeded'
+            return stage
+        self._update_stages(job_id, update)
+
+    def complete(self, job_id, error=None):
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE Jobs SET status = ?, error = ?, finished_at = ?, updated_at = ? WHERE job_id = ?",
+                ('failed' if error else 'succeeded', error, now, now, job_id)
+            )
+
+    def get(self, job_id=None):
+        """
+        Describe one job, or the most recent one when job_id is omitted.
+        Returns None when there is no such job.
+        """
+        self.fail_abandoned()
+        with self._connect() as conn:
+            if job_id is None:
+                row = conn.execute("SELECT * FROM Jobs ORDER BY created_at DESC LIMIT 1").fetchone()
+            else:
+                row = conn.execute("SELECT * FROM Jobs WHERE job_id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+
+        stages = json.loads(row['stages'])
+        stage_names = JOB_STAGES.get(row['kind'], UPDATE_STAGES)
+        finished = row['finished_at'] or time.time()
+        return {
+            'job_id': row['job_id'],
+            'kind': row['kind'],
+            'status': row['status'],
+            'options': json.loads(row['options']),
+            'stage': row['stage'],
+            'stages_completed': sum(1 for stage in stages.values() if stage['status'] == 'succeeded'),
+            'stages_total': len(stage_names),
+            'stages': [{'name': name, **stages[name]} for name in stage_names if name in stages],
+            'error': row['error'],
+            'created_at': row['created_at'],
+            'finished_at': row['finished_at'],
+            'elapsed_seconds': round(finished - row['created_at'], 3)
+        }
+
+    def is_running(self):
+        self.fail_abandoned()
+        with self._connect() as conn:
+            row = conn.execute("SELECT count(*) FROM Jobs WHERE status = 'running'").fetchone()
+        return row[0] > 0
+
+class JobProgress:
+    """Handed to the job target so each stage's start, end and duration is recorded on the job"""
+    def __init__(self, store, job_id):
+        self.store = store
+        self.job_id = job_id
+
+    @contextmanager
+    def stage(self, name):
+        self.store.start_stage(self.job_id, name)
+        try:
+            yield
+        except BaseException:
+            self.store.finish_stage(self.job_id, name, failed=True)
+            raise
+        self.store.finish_stage(self.job_id, name)
+
+class _NoProgress:
+    def stage(self, name):
+        return nullcontext()
+
+# Default progress for code paths that run outside a job
+NO_PROGRESS = _NoProgress()
+
+def start_job(store, kind, target, options=None, on_finish=None):
+    """
+    Run target(progress) on a background thread unless a job is already running.
+
+    Args:
+        store: JobStore holding the job table
+        kind: Job type recorded on the job
+        target: Callable taking a JobProgress
+        options: JSON-serializable options recorded on the job
+        on_finish: Optional callable run after the job ends, whether it succeeded or not
+
+    Returns:
+        Tuple of (job_id, created), as JobStore.acquire
+    """
+    job_id, created = store.acquire(kind, options)
+    if not created:
+        return job_id, False
+
+    def run():
+        error = None
+        try:
+            target(JobProgress(store, job_id))
+        except Exception as e:
+            traceback.print_exc()
+            error = f"{type(e).__name__}: {e}"
+        finally:
+            store.complete(job_id, error)
+            if on_finish is not None:
+                on_finish()
+
+    threading.Thread(target=run, name=f"job-{job_id}", daemon=True).start()
+    return job_id, True
@@ -0,0 +1,111 @@
+"""
+Season calendar, franchise-to-conference mapping and the column layouts shared by the parser,
+the database loader and the API. Only the standard library is imported here, so the read path
+can use these without loading pandas or numpy.
+"""
+import csv
+import os
+
+# Calendar of the 2010s, used when the source games carry no season_id to derive the calendar from
+DEFAULT_SEASON_DATES = {
+    "2009-10": {"start": "2009-10-27", "end": "2010-06-17"},
+    "2010-11": {"start": "2010-10-26", "end": "2011-06-12"},
+    "2011-12": {"start": "2011-12-25", "end": "2012-06-21"},
+    "2012-13": {"start": "2012-10-30", "end": "2013-06-20"},
+    "2013-14": {"start": "2013-10-29", "end": "2014-06-15"},
+    "2014-15": {"start": "2014-10-28", "end": "2015-06-16"},
+    "2015-16": {"start": "2015-10-27", "end": "2016-06-19"},
+    "2016-17": {"start": "2016-10-25", "end": "2017-06-12"},
+    "2017-18": {"start": "2017-10-17", "end": "2018-06-08"},
+    "2018-19": {"start": "2018-10-16", "end": "2019-06-13"}
+}
+
+# Seasons to parse, by the year they start in, configurable to serve any era
+FIRST_SEASON = int(os.getenv('NBA_FIRST_SEASON', '2009'))
+LAST_SEASON = int(os.getenv('NBA_LAST_SEASON', '2018'))
+
+# Season types of the source season_id ('<type><start year>') that make up a season's calendar:
+# regular season, playoffs and play-in tournament
+CALENDAR_SEASON_TYPES = ('2', '4', '5')
+
+CONFERENCE_NAMES = {'W': 'Western', 'E': 'Eastern'}
+
+def season_name(start_year):
+    """Name of the season starting in start_year, e.g. 1999 -> '1999-00'"""
+    return f"{start_year}-{(start_year + 1) % 100:02d}"
+
+def season_start_year(season):
+    """Year a season named 'YYYY-YY' starts in"""
+    return int(season.split('-')[0])
+
+def load_franchise_conferences(path=os.path.join(os.path.dirname(__file__), "franchise_conferences.csv")):
+    """
+    Read the franchise-to-conference mapping table
+    Returns:
+        dict: {team name: [(first season, last season, conference id), ...]} sorted by first season,
+              seasons are start years and an open-ended last season is stored as None
+    Before the 1970-71 season the league was split into divisions, which are mapped to the conference they became
+    """
+    franchises = {}
+    with open(path, newline='') as f:
+        for row in csv.DictReader(f):
+            last_season = int(row['last_season']) if row['last_season'] else None
+            franchises.setdefault(row['team_name'], []).append(
+                (int(row['first_season']), last_season, row['conference_id'])
+            )
+    return {name: sorted(spans) for name, spans in franchises.items()}
+
+FRANCHISE_CONFERENCES = load_franchise_conferences()
+
+def get_conference_id(team_name, start_year):
+    """Conference id ('W' or 'E') of a team name in the season starting in start_year, None if unmapped"""
+    for first_season, last_season, conference_id in FRANCHISE_CONFERENCES.get(team_name, ()):
+        if first_season <= start_year and (last_season is None or start_year <= last_season):
+            return conference_id
+    return None
+
+def get_conference_teams(first_season=FIRST_SEASON, last_season=LAST_SEASON):
+    """
+    Team names that played in each conference at some point between two seasons
+    Returns:
+        tuple: (western team names, eastern team names)
+    """
+    teams = {'W': set(), 'E': set()}
+    for team_name, spans in FRANCHISE_CONFERENCES.items():
+        for span_first, span_last, conference_id in spans:
+            if span_first <= last_season and (span_last is None or first_season <= span_last):
+                teams[conference_id].add(team_name)
+    return teams['W'], teams['E']
+
+# Teams in the configured season range
+WESTERN_CONFERENCE_TEAMS, EASTERN_CONFERENCE_TEAMS = get_conference_teams()
+ALL_NBA_TEAMS = WESTERN_CONFERENCE_TEAMS.union(EASTERN_CONFERENCE_TEAMS)
+
+# Columns of the Kaggle 'game' table that feed into the parsed metrics and the season calendar
+SOURCE_COLUMNS = [
+    'season_id', 'game_date', 'team_id_home', 'team_name_home', 'team_id_away', 'team_name_away',
+    'fga_home', 'fgm_home', 'fta_home', 'oreb_home', 'dreb_home', 'tov_home', 'pts_home', 'plus_minus_home',
+    'fga_away', 'fgm_away', 'fta_away', 'oreb_away', 'dreb_away', 'tov_away', 'pts_away', 'plus_minus_away'
+]
+
+def get_team_object():
+    return { 
+        "Western Conference": list(WESTERN_CONFERENCE_TEAMS), 
+        "Eastern Conference": list(EASTERN_CONFERENCE_TEAMS)
+        }
+
+# Aggregates materialized per season (league-wide) and per season and conference at load time
+RELATIVE_METRICS = ('relative_offensive_rating', 'relative_defensive_rating', 'relative_net_rating')
+SEASON_SUMMARY_COLUMNS = (
+    'team_count',
+    'mean_offensive_rating', 'mean_defensive_rating', 'mean_net_rating',
+    'std_offensive_rating', 'std_defensive_rating', 'std_net_rating',
+    'min_relative_offensive_rating', 'max_relative_offensive_rating',
+    'min_relative_defensive_rating', 'max_relative_defensive_rating',
+    'min_relative_net_rating', 'max_relative_net_rating',
+)
+CONFERENCE_SUMMARY_COLUMNS = (
+    'team_count',
+    'mean_relative_offensive_rating', 'mean_relative_defensive_rating', 'mean_relative_net_rating',
+    'std_relative_offensive_rating', 'std_relative_defensive_rating', 'std_relative_net_rating',
+)
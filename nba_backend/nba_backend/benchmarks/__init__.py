@@ -0,0 +1,7 @@
+import os
+
+def setup_django():
+    """Configure Django for benchmarks that render responses or use the test client"""
+    import django
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'nba_backend.settings')
+    django.setup()
@@ -0,0 +1,69 @@
+"""
+Compare the rows/sec of the original per-table-commit load, the bulk load_data_to_db (one transaction,
+deferred indexes, shadow build pragmas) and the multi-row INSERT ORM loader over synthetic seasons
+
+    python -m benchmarks.bulk_load --seasons 1000 --teams 30
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from . import setup_django
+setup_django()
+from django.core.management import call_command
+from nba_api.loaders import BULK_BATCH_SIZE, load_data_to_orm
+from nba_analytics.db_utils import load_data_to_db, extract_decade_table
+from .decade_table import make_seasons_dict
+from .legacy import legacy_load_data_to_db
+from .orm_read import default_database
+
+def count_rows(path):
+    """Rows a load writes into the decade tables, to compare loaders at the same row count"""
+    import sqlite3
+    with sqlite3.connect(path) as conn:
+        return sum(
+            conn.execute(f"SELECT count(*) FROM {table}").fetchone()[0]
+            for table in ('Seasons', 'Teams', 'TeamStats', 'SeasonSummary', 'ConferenceSeasonSummary')
+        )
+
+def _timed(function, *args, **kwargs):
+    started = time.perf_counter()
+    function(*args, **kwargs)
+    return time.perf_counter() - started
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--seasons', type=int, default=1000, help="Number of synthetic seasons")
+    parser.add_argument('--teams', type=int, default=30, help="Teams per season")
+    parser.add_argument('--batch-size', type=int, default=BULK_BATCH_SIZE, help="Maximum rows per ORM loader INSERT")
+    args = parser.parse_args()
+
+    seasons_dict = make_seasons_dict(args.seasons, args.teams)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        paths = {name: os.path.join(tmp_dir, f'{name}.sqlite') for name in ('legacy', 'bulk', 'orm')}
+        with redirect_stdout(sys.stderr):
+            timings = {
+                'legacy': _timed(legacy_load_data_to_db, seasons_dict, paths['legacy']),
+                'bulk': _timed(load_data_to_db, seasons_dict, paths['bulk']),
+            }
+            with default_database(paths['orm']):
+                call_command('migrate', verbosity=0)
+                timings['orm'] = _timed(load_data_to_orm, seasons_dict, batch_size=args.batch_size)
+
+        expected = extract_decade_table(paths['legacy']).to_json()
+        assert all(extract_decade_table(path).to_json() == expected for path in paths.values()), "Loaders differ"
+
+        rows = count_rows(paths['legacy'])
+        print(f"{rows:,} rows ({args.seasons} seasons x {args.teams} teams)")
+        labels = {
+            'legacy': "per-table commits, indexes first",
+            'bulk': "load_data_to_db",
+            'orm': f"load_data_to_orm, batch {args.batch_size}",
+        }
+        for name, seconds in timings.items():
+            print(f"{labels[name]:<34}{seconds:8.3f}s {rows / seconds:12,.0f} rows/s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Compare memory and /data/ serialization time of the dict-of-list-of-dicts decade data
+with the columnar DecadeTable
+
+    python -m benchmarks.decade_table --seasons 75 --teams 30
+"""
+import argparse
+import time
+import tracemalloc
+import numpy as np
+from . import setup_django
+setup_django()
+from rest_framework.renderers import JSONRenderer
+from nba_analytics.decade_table import DecadeTable, STAT_COLUMNS
+
+def make_seasons_dict(n_seasons, n_teams, seed=0):
+    """Decade-shaped data with float values, as extract_data_from_db returns it"""
+    rng = np.random.default_rng(seed)
+    return {
+        f"{1946 + season}-{(1947 + season) % 100:02d}": [
+            {
+                'team': f"Team {team}",
+                'conference': 'Western' if team % 2 else 'Eastern',
+                **{column: float(value) for column, value in zip(STAT_COLUMNS, rng.normal(0, 5, len(STAT_COLUMNS)))}
+            }
+            for team in range(n_teams)
+        ]
+        for season in range(n_seasons)
+    }
+
+def _allocated(build):
+    tracemalloc.start()
+    result = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size
+
+def _best_time(function, repeat=5):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--seasons', type=int, default=75, help="Number of seasons")
+    parser.add_argument('--teams', type=int, default=30, help="Teams per season")
+    args = parser.parse_args()
+
+    source = make_seasons_dict(args.seasons, args.teams)
+    seasons_dict, dict_bytes = _allocated(lambda: make_seasons_dict(args.seasons, args.teams))
+    table, table_bytes = _allocated(lambda: DecadeTable.from_seasons_dict(source))
+    assert table.to_json() == JSONRenderer().render(seasons_dict)
+
+    dict_time = _best_time(lambda: JSONRenderer().render(seasons_dict))
+    table_time = _best_time(table.to_json)
+    print(f"{args.seasons * args.teams:,} team-seasons")
+    print(f"dict of dicts: {dict_bytes / 2**10:8.1f} KiB  JSON {dict_time * 1000:7.2f} ms")
+    print(f"DecadeTable:   {table_bytes / 2**10:8.1f} KiB  JSON {table_time * 1000:7.2f} ms")
+    print(f"Memory {dict_bytes / table_bytes:.1f}x lower, serialization {dict_time / table_time:.1f}x faster")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Benchmark time and peak memory of reading the Kaggle 'game' table, comparing the
+original SELECT * with the column-projected, date-filtered read_game_table
+
+    python -m benchmarks.extraction --games 65000
+"""
+import argparse
+import os
+import sqlite3
+import tempfile
+import time
+import tracemalloc
+import pandas as pd
+from nba_analytics.db_utils import read_game_table
+from .synthetic import make_game_frame
+
+def write_game_database(path, n_games):
+    """Write a synthetic Kaggle-shaped 'game' table to a SQLite file"""
+    with sqlite3.connect(path) as conn:
+        make_game_frame(n_games).to_sql('game', conn, index=False)
+
+def _measure(read):
+    tracemalloc.start()
+    started = time.perf_counter()
+    dataframe = read()
+    elapsed = time.perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak, dataframe.memory_usage(deep=True).sum(), len(dataframe)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--games', type=int, default=65000, help="Number of synthetic games to generate")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'nba.sqlite')
+        write_game_database(path, args.games)
+        with sqlite3.connect(path) as conn:
+            results = {
+                'SELECT *': _measure(lambda: pd.read_sql_query("SELECT * FROM game", conn)),
+                'read_game_table': _measure(lambda: read_game_table(conn)),
+            }
+
+    for name, (elapsed, peak, frame_bytes, rows) in results.items():
+        print(f"{name:16} {elapsed:7.3f}s  peak {peak / 2**20:8.1f} MiB  frame {frame_bytes / 2**20:7.1f} MiB  {rows:,} rows")
+    baseline, projected = results['SELECT *'], results['read_game_table']
+    print(f"Load time {baseline[0] / projected[0]:.1f}x faster, peak memory {baseline[1] / projected[1]:.1f}x lower")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Benchmark the columnar rating engine and groupby season aggregation against the
+original iterrows loop and per-season date scanning
+
+    python -m benchmarks.game_ratings --games 65000
+"""
+import argparse
+import time
+from nba_analytics.decade_parser import (
+    process_filter_db,
+    generate_dataframe_metrics,
+    generate_individual_season_metrics
+)
+from nba_analytics.seasons import FIRST_SEASON, LAST_SEASON
+from .legacy import legacy_generate_dataframe_metrics, legacy_generate_individual_season_metrics
+from .synthetic import make_game_frame
+
+def _timed(function, *args):
+    started = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - started, result
+
+def _max_difference(expected, actual):
+    difference = 0.0
+    for season, teams in expected.items():
+        assert [team['team'] for team in teams] == [team['team'] for team in actual[season]], f"Teams differ in {season}"
+        for expected_team, actual_team in zip(teams, actual[season]):
+            for metric, value in expected_team.items():
+                if metric not in ('team', 'conference'):
+                    difference = max(difference, abs(float(value) - float(actual_team[metric])))
+    return difference
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--games', type=int, default=65000, help="Number of synthetic games to generate")
+    parser.add_argument('--skip-legacy', action='store_true', help="Only time the columnar implementation")
+    args = parser.parse_args()
+
+    dataframe = make_game_frame(args.games)
+    range_dataframe, team_objects, season_dates = process_filter_db(dataframe)
+    print(f"Synthetic frame: {len(dataframe):,} games, {len(range_dataframe):,} inside {FIRST_SEASON} - {LAST_SEASON} seasons")
+
+    metrics_time, team_games = _timed(generate_dataframe_metrics, range_dataframe, team_objects, season_dates)
+    seasons_time, seasons_dict = _timed(generate_individual_season_metrics, team_games, season_dates)
+    print(f"Columnar game ratings:    {metrics_time:.3f}s")
+    print(f"Groupby season averages:  {seasons_time:.3f}s")
+
+    if not args.skip_legacy:
+        legacy_metrics_time, legacy_teams = _timed(legacy_generate_dataframe_metrics, range_dataframe, team_objects)
+        legacy_seasons_time, legacy_seasons = _timed(legacy_generate_individual_season_metrics, legacy_teams, season_dates)
+        print(f"Legacy iterrows ratings:  {legacy_metrics_time:.3f}s ({legacy_metrics_time / metrics_time:.0f}x slower)")
+        print(f"Legacy season scanning:   {legacy_seasons_time:.3f}s ({legacy_seasons_time / seasons_time:.0f}x slower)")
+        print(f"Max abs difference in season averages: {_max_difference(legacy_seasons, seasons_dict):.3g}")
+
+if __name__ == "__main__":
+    main()
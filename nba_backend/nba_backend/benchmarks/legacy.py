@@ -0,0 +1,86 @@
+import numpy as np
+from datetime import datetime
+from nba_analytics.decade_parser import TeamObject
+from nba_analytics.decade_table import STAT_COLUMNS
+from nba_analytics.db_utils import (
+    sqlite_connection,
+    create_schema,
+    insert_seasons,
+    insert_teams,
+    insert_season_summaries
+)
+
+# Original row-at-a-time implementations of the parsing stages, kept only as benchmark baselines
+
+def legacy_generate_dataframe_metrics(range_dataframe, team_objects):
+    # Per-team iterrows loop filling a {game_date: stats} dictionary per team
+    team_games_by_date = []
+    for team in team_objects:
+        games = {}
+        team_games = range_dataframe[(range_dataframe['team_id_home'] == team.id) | (range_dataframe['team_id_away'] == team.id)]
+        for index, game in team_games.iterrows():
+            side, other = ('home', 'away') if game['team_id_home'] == team.id else ('away', 'home')
+            team_orb_pct = np.divide(game[f'oreb_{side}'], np.maximum(game[f'oreb_{side}'] + game[f'dreb_{other}'], 1))
+            opp_orb_pct = np.divide(game[f'oreb_{other}'], np.maximum(game[f'oreb_{other}'] + game[f'dreb_{side}'], 1))
+            team_poss = np.sum([game[f'fga_{side}'], 0.4 * game[f'fta_{side}'],
+                                -1.07 * team_orb_pct * (game[f'fga_{side}'] - game[f'fgm_{side}']), game[f'tov_{side}']])
+            opp_poss = np.sum([game[f'fga_{other}'], 0.4 * game[f'fta_{other}'],
+                               -1.07 * opp_orb_pct * (game[f'fga_{other}'] - game[f'fgm_{other}']), game[f'tov_{other}']])
+            game_stats = {
+                'plus_minus': game[f'plus_minus_{side}'],
+                'offensive_rating': np.multiply(np.divide(game[f'pts_{side}'], team_poss), 100),
+                'defensive_rating': np.multiply(np.divide(game[f'pts_{other}'], opp_poss), 100),
+            }
+            game_stats['net_rating'] = game_stats['offensive_rating'] - game_stats['defensive_rating']
+            game_stats['possessions'] = np.mean([team_poss, opp_poss])
+            games[game['game_date']] = game_stats
+        team_games_by_date.append((team, games))
+    return team_games_by_date
+
+def legacy_is_date_in_season(date_input, season, season_dates):
+    # Re-parses both season bounds for every call
+    bounds = season_dates[season]
+    date = TeamObject.convert_to_datetime(date_input)
+    season_start = datetime.strptime(bounds["start"], "%Y-%m-%d")
+    season_end = datetime.strptime(bounds["end"], "%Y-%m-%d")
+    return season_start <= date <= season_end
+
+def legacy_generate_individual_season_metrics(team_games_by_date, season_dates):
+    # Scans every game for every season, then averages per-season Python lists
+    seasons_dict = {season: [] for season in season_dates.keys()}
+    for team, team_games in team_games_by_date:
+        for season in season_dates:
+            games = [stats for date, stats in team_games.items() if legacy_is_date_in_season(date, season, season_dates)]
+            if not games:
+                continue
+            seasons_dict[season].append({
+                "team": team.name,
+                "conference": team.conference,
+                "average_offensive_rating": np.mean([game['offensive_rating'] for game in games]),
+                "average_defensive_rating": np.mean([game['defensive_rating'] for game in games]),
+                "average_net_rating": np.mean([game['net_rating'] for game in games]),
+                "average_plus_minus": np.mean([game['plus_minus'] for game in games]),
+            })
+    return seasons_dict
+
+def legacy_load_data_to_db(data_object, db_path):
+    # Indexes in place before the inserts, a commit per table, INSERT OR REPLACE for the stats
+    # and the default synchronous and journal settings
+    with sqlite_connection(db_path) as conn:
+        create_schema(conn)
+        insert_seasons(conn, data_object)
+        conn.commit()
+        insert_teams(conn, data_object)
+        conn.commit()
+        team_mapping = {(name, conference_id): id for id, name, conference_id in
+                        conn.execute("SELECT team_id, team_name, conference_id FROM Teams")}
+        conn.executemany(
+            f"""INSERT OR REPLACE INTO TeamStats (team_id, season_id, {', '.join(STAT_COLUMNS)})
+            VALUES (?, ?, {', '.join('?' * len(STAT_COLUMNS))})""",
+            [(team_mapping[(team_data['team'], team_data['conference'][0])], season_id,
+              *(float(team_data[column]) for column in STAT_COLUMNS))
+             for season_id, season_data in data_object.items() for team_data in season_data]
+        )
+        conn.commit()
+        insert_season_summaries(conn, data_object)
+        conn.commit()
@@ -0,0 +1,93 @@
+"""
+Compare the sqlite3 read path with the ORM read layer in nba_api.queries over a synthetic decade
+database, checking both return the same data. TeamStatsSerializer over model instances is timed
+as well, as the reference the values_list projections replace
+
+    python -m benchmarks.orm_read --games 65000 --first-season 1946 --last-season 2022
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from contextlib import contextmanager, redirect_stdout
+from . import setup_django
+setup_django()
+from django.db import DEFAULT_DB_ALIAS, connections
+from nba_api import queries
+from nba_api.serializers import TeamStatsSerializer
+from nba_analytics.db_utils import (
+    load_data_to_db,
+    extract_decade_table,
+    iter_decade_seasons,
+    extract_season_from_db,
+    extract_seasons_from_db
+)
+from nba_analytics.decade_parser import process_filter_db, parse_range_data
+from nba_analytics.seasons import FIRST_SEASON, LAST_SEASON
+from .synthetic import make_game_frame
+
+@contextmanager
+def default_database(path):
+    """Point Django's default SQLite connection at another database file for the duration of the block"""
+    connection = connections[DEFAULT_DB_ALIAS]
+    previous = connection.settings_dict['NAME']
+    connection.close()
+    connection.settings_dict['NAME'] = path
+    try:
+        yield
+    finally:
+        connection.close()
+        connection.settings_dict['NAME'] = previous
+
+def best_time(function, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = function()
+        timings.append(time.perf_counter() - started)
+    return min(timings), result
+
+def read_cases(path, season_id):
+    """(name, sqlite3 reader, ORM reader) of every read the endpoints make"""
+    return [
+        ('decade_table', lambda: extract_decade_table(path).to_json(), lambda: queries.decade_table().to_json()),
+        ('decade_seasons', lambda: list(iter_decade_seasons(path)), lambda: list(queries.iter_decade_seasons())),
+        ('season_list', lambda: extract_seasons_from_db(path), queries.season_list),
+        ('season', lambda: extract_season_from_db(path, season_id), lambda: queries.season_data(season_id)),
+    ]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--games', type=int, default=65000, help="Number of synthetic games")
+    parser.add_argument('--first-season', type=int, default=FIRST_SEASON, help="First season start year")
+    parser.add_argument('--last-season', type=int, default=LAST_SEASON, help="Last season start year")
+    parser.add_argument('--repeat', type=int, default=5, help="Runs per reader, the best is reported")
+    args = parser.parse_args()
+
+    games = make_game_frame(args.games, args.first_season, args.last_season)
+    range_dataframe, team_objects, season_dates = process_filter_db(games, args.first_season, args.last_season)
+    seasons_dict = parse_range_data(range_dataframe, team_objects, season_dates)
+    season_id = max(seasons_dict, key=lambda season: len(seasons_dict[season]))
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'decade.sqlite')
+        with redirect_stdout(sys.stderr):
+            load_data_to_db(seasons_dict, path)
+        print(f"{sum(len(teams) for teams in seasons_dict.values())} team-seasons over {len(seasons_dict)} seasons")
+
+        with default_database(path):
+            for name, sqlite_reader, orm_reader in read_cases(path, season_id):
+                sqlite_time, sqlite_result = best_time(sqlite_reader, args.repeat)
+                orm_time, orm_result = best_time(orm_reader, args.repeat)
+                assert orm_result == sqlite_result, f"ORM {name} differs from the sqlite3 reader"
+                print(f"{name:<16} sqlite3 {sqlite_time * 1000:8.2f} ms   ORM {orm_time * 1000:8.2f} ms"
+                      f"   ({orm_time / sqlite_time:.2f}x)")
+
+            serializer_time, _ = best_time(
+                lambda: TeamStatsSerializer(queries.team_stats_queryset(), many=True).data, args.repeat
+            )
+            print(f"{'ModelSerializer':<16} {serializer_time * 1000:8.2f} ms for every team-season as model instances")
+
+if __name__ == "__main__":
+    main()
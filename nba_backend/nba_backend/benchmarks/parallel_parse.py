@@ -0,0 +1,38 @@
+"""
+Compare serial parsing with the process-pool parallel mode of parse_range_data,
+checking that both produce identical seasons
+
+    python -m benchmarks.parallel_parse --games 65000 --workers 4
+"""
+import argparse
+import os
+import time
+from nba_analytics.decade_parser import process_filter_db, parse_range_data
+from nba_analytics.seasons import FIRST_SEASON, LAST_SEASON
+from .synthetic import make_game_frame
+
+def _timed(function, *args, **kwargs):
+    started = time.perf_counter()
+    result = function(*args, **kwargs)
+    return time.perf_counter() - started, result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--games', type=int, default=65000, help="Number of synthetic games")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help="Worker processes for the parallel run")
+    args = parser.parse_args()
+
+    games = make_game_frame(args.games, FIRST_SEASON, LAST_SEASON)
+    range_dataframe, team_objects, season_dates = process_filter_db(games)
+
+    serial_time, serial = _timed(parse_range_data, range_dataframe, team_objects, season_dates)
+    parallel_time, parallel = _timed(parse_range_data, range_dataframe, team_objects, season_dates, workers=args.workers)
+    assert parallel == serial, "Parallel parse differs from the serial parse"
+
+    print(f"{len(range_dataframe):,} games over {sum(1 for teams in serial.values() if teams)} seasons, {os.cpu_count()} CPUs")
+    print(f"serial:              {serial_time * 1000:8.1f} ms")
+    print(f"parallel ({args.workers:2d} workers): {parallel_time * 1000:8.1f} ms")
+    print(f"Speedup {serial_time / parallel_time:.2f}x, results identical")
+
+if __name__ == "__main__":
+    main()
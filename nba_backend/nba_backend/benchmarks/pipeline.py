@@ -0,0 +1,215 @@
+"""
+Time and memory-track every stage of the ingest, parse, load and serve pipeline over a
+synthetic Kaggle 'game' table, emitting the results as JSON so runs can be compared across commits
+
+    python -m benchmarks.pipeline --games 100000 --output results.json
+    python -m benchmarks.pipeline --games 100000 --baseline results.json
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager, redirect_stdout
+from . import setup_django
+setup_django()
+from django.test import Client
+from django.test.utils import setup_test_environment
+from django.urls import reverse
+from nba_api.response_cache import response_cache
+from nba_api.utils import data_handler
+from nba_analytics.db_utils import load_data_to_db, extract_data_from_db
+from nba_analytics.decade_parser import (
+    process_filter_db,
+    generate_dataframe_metrics,
+    generate_individual_season_metrics,
+    generate_relative_metrics
+)
+from nba_analytics.seasons import FIRST_SEASON, LAST_SEASON
+from .synthetic import make_game_frame
+
+def measure(function, *args, memory=True):
+    """
+    Run function once for wall time and, when memory is set, once more under tracemalloc for its peak allocation
+    Returns:
+        Tuple of (result, {'seconds', 'peak_bytes'}), peak_bytes is None without memory tracking
+    """
+    started = time.perf_counter()
+    result = function(*args)
+    seconds = time.perf_counter() - started
+
+    peak = None
+    if memory:
+        tracemalloc.start()
+        try:
+            function(*args)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return result, {'seconds': round(seconds, 6), 'peak_bytes': peak}
+
+@contextmanager
+def serving_database(path):
+    """Point the data handler and the response cache at another decade database for the duration of the block"""
+    previous = data_handler.db_path, response_cache.path
+    data_handler.db_path = response_cache.path = path
+    data_handler.decade_cache.clear()
+    data_handler.cluster_cache.clear()
+    response_cache.invalidate()
+    try:
+        yield
+    finally:
+        data_handler.db_path, response_cache.path = previous
+        data_handler.decade_cache.clear()
+        data_handler.cluster_cache.clear()
+        response_cache.invalidate()
+
+def view_requests(season_id):
+    """(name, url) of every read endpoint, the update endpoints are left out as they start a Kaggle download"""
+    return [
+        ('nba-data', reverse('nba-data')),
+        ('nba-data-ndjson', reverse('nba-data') + '?format=ndjson'),
+        ('team-list', reverse('team-list')),
+        ('season-list', reverse('season-list')),
+        ('season-stats', reverse('season-stats', kwargs={'season_id': season_id})),
+        ('season-summary', reverse('season-summary', kwargs={'season_id': season_id})),
+        ('conference-comparison', reverse('conference-comparison')),
+        ('cluster-analysis', reverse('cluster-analysis')),
+    ]
+
+def benchmark_views(path, season_id, repeat=5):
+    """
+    Request every read endpoint through the Django test client
+    Returns:
+        dict: {view: {'status', 'bytes', 'cold_seconds', 'warm_seconds', 'peak_bytes'}}. Cold requests run with
+              every process cache cleared, warm is the best of repeat requests answered from the caches
+    """
+    client = Client()
+
+    def get(url):
+        response = client.get(url)
+        body = b''.join(response.streaming_content) if response.streaming else response.content
+        return response.status_code, len(body)
+
+    results = {}
+    with serving_database(path):
+        for name, url in view_requests(season_id):
+            response_cache.invalidate()
+            data_handler.decade_cache.clear()
+            data_handler.cluster_cache.clear()
+            (status_code, size), cold = measure(get, url, memory=False)
+
+            warm_timings = []
+            for _ in range(repeat):
+                warm_timings.append(measure(get, url, memory=False)[1]['seconds'])
+
+            response_cache.invalidate()
+            data_handler.decade_cache.clear()
+            data_handler.cluster_cache.clear()
+            peak = measure(get, url)[1]['peak_bytes']
+
+            results[name] = {
+                'status': status_code,
+                'bytes': size,
+                'cold_seconds': cold['seconds'],
+                'warm_seconds': min(warm_timings),
+                'peak_bytes': peak
+            }
+    return results
+
+def run_pipeline(n_games, first_season=FIRST_SEASON, last_season=LAST_SEASON, repeat=5, memory=True, seed=0):
+    """
+    Benchmark every pipeline stage and read endpoint over n_games synthetic games
+    Returns:
+        dict: JSON-serializable results with 'meta', 'stages' and 'views'
+    """
+    games = make_game_frame(n_games, first_season, last_season, seed=seed)
+    stages = {}
+
+    (range_dataframe, team_objects, season_dates), stages['process_filter_db'] = measure(
+        process_filter_db, games, first_season, last_season, memory=memory
+    )
+    team_games, stages['generate_dataframe_metrics'] = measure(
+        generate_dataframe_metrics, range_dataframe, team_objects, season_dates, memory=memory
+    )
+    seasons_dict, stages['generate_individual_season_metrics'] = measure(
+        generate_individual_season_metrics, team_games, season_dates, memory=memory
+    )
+    _, stages['generate_relative_metrics'] = measure(generate_relative_metrics, seasons_dict, memory=memory)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'decade.sqlite')
+        # load_data_to_db reports on stdout, which would end up in the JSON output
+        with redirect_stdout(sys.stderr):
+            _, stages['load_data_to_db'] = measure(load_data_to_db, seasons_dict, path, memory=memory)
+        _, stages['extract_data_from_db'] = measure(extract_data_from_db, path, memory=memory)
+
+        season_id = next(season for season, teams in seasons_dict.items() if teams)
+        views = benchmark_views(path, season_id, repeat=repeat)
+
+    return {
+        'meta': {
+            'games': n_games,
+            'games_in_range': len(range_dataframe),
+            'team_seasons': sum(len(teams) for teams in seasons_dict.values()),
+            'seasons': [first_season, last_season],
+            'commit': _git_commit(),
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'cpus': os.cpu_count(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z')
+        },
+        'stages': stages,
+        'views': views
+    }
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def compare(baseline, results):
+    """Lines with the time ratio of every stage and view against a baseline run, above 1 is slower"""
+    lines = []
+    for section, key in (('stages', 'seconds'), ('views', 'cold_seconds'), ('views', 'warm_seconds')):
+        for name, entry in results[section].items():
+            before = baseline.get(section, {}).get(name, {}).get(key)
+            if before:
+                lines.append(f"{section}.{name}.{key}: {before:.4f}s -> {entry[key]:.4f}s ({entry[key] / before:.2f}x)")
+    return lines
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--games', type=int, default=65000, help="Number of synthetic games, from 1k up to 1M")
+    parser.add_argument('--first-season', type=int, default=FIRST_SEASON, help="First season start year")
+    parser.add_argument('--last-season', type=int, default=LAST_SEASON, help="Last season start year")
+    parser.add_argument('--repeat', type=int, default=5, help="Warm requests per view")
+    parser.add_argument('--no-memory', action='store_true', help="Skip the tracemalloc runs")
+    parser.add_argument('--output', help="Write the JSON results to this file instead of stdout")
+    parser.add_argument('--baseline', help="Earlier JSON results to compare against, the comparison goes to stderr")
+    args = parser.parse_args()
+
+    setup_test_environment()
+    results = run_pipeline(args.games, args.first_season, args.last_season, repeat=args.repeat, memory=not args.no_memory)
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        print('\n'.join(compare(baseline, results)), file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Measure what a gunicorn/uWSGI worker pays before serving its first request: a fresh interpreter
+sets up Django and loads every URL, under python -X importtime, reporting wall time, import time
+per top-level package and peak RSS. The update scenario also imports the engine an update loads
+
+    python -m benchmarks.startup --repeat 5
+    python -m benchmarks.startup --repeat 5 --output startup.json
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+WORKER_SCRIPT = """
+import json, os, resource, sys
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'nba_backend.settings')
+import django
+django.setup()
+import nba_backend.urls
+{extra}
+print(json.dumps({{'maxrss': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, 'modules': sorted(sys.modules)}}))
+"""
+
+SCENARIOS = {
+    'read': '',
+    # kaggle authenticates on import and raises without credentials, after its own imports are paid for
+    'update': (
+        "import nba_analytics.decade_parser, nba_analytics.conference_stats, nba_analytics.clustering\n"
+        "try:\n    import kaggle\nexcept Exception:\n    pass"
+    ),
+}
+
+# Modules the read path must not load
+ENGINE_MODULES = ('numpy', 'pandas', 'kaggle')
+
+# ru_maxrss is in KiB on Linux and in bytes on macOS
+MAXRSS_UNIT = 1 if sys.platform == 'darwin' else 1024
+
+def parse_importtime(output):
+    """
+    Read python -X importtime output
+    Returns:
+        list: (module, self microseconds, cumulative microseconds) in import order
+    """
+    imports = []
+    for line in output.splitlines():
+        if not line.startswith('import time:') or line.rstrip().endswith('imported package'):
+            continue
+        self_us, cumulative_us, module = line[len('import time:'):].split('|')
+        imports.append((module.strip(), int(self_us), int(cumulative_us)))
+    return imports
+
+def package_times(imports):
+    """Self import time summed per top-level package in seconds, slowest first"""
+    totals = {}
+    for module, self_us, _ in imports:
+        package = module.split('.')[0]
+        totals[package] = totals.get(package, 0) + self_us
+    return {package: round(us / 1e6, 6) for package, us in sorted(totals.items(), key=lambda item: -item[1])}
+
+def run_worker(extra='', cwd=None):
+    """
+    Start one interpreter running WORKER_SCRIPT
+    Returns:
+        dict: {'wall_seconds', 'import_seconds', 'rss_bytes', 'packages', 'engine_loaded'}
+    """
+    cwd = cwd or os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', WORKER_SCRIPT.format(extra=extra)],
+        capture_output=True, text=True, check=True, cwd=cwd
+    )
+    wall_seconds = time.perf_counter() - started
+
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+    imports = parse_importtime(result.stderr)
+    return {
+        'wall_seconds': round(wall_seconds, 6),
+        'import_seconds': round(sum(self_us for _, self_us, _ in imports) / 1e6, 6),
+        'rss_bytes': report['maxrss'] * MAXRSS_UNIT,
+        'packages': package_times(imports),
+        'engine_loaded': [name for name in ENGINE_MODULES if name in report['modules']]
+    }
+
+def run_startup(repeat=5):
+    """Best of repeat runs of every scenario, by wall time"""
+    return {
+        name: min((run_worker(extra) for _ in range(repeat)), key=lambda run: run['wall_seconds'])
+        for name, extra in SCENARIOS.items()
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=5, help="Interpreter starts per scenario")
+    parser.add_argument('--top', type=int, default=8, help="Packages listed per scenario")
+    parser.add_argument('--output', help="Also write the JSON results to this file")
+    args = parser.parse_args()
+
+    results = run_startup(args.repeat)
+    for name, run in results.items():
+        print(f"{name}: {run['wall_seconds']:.3f}s wall, {run['import_seconds']:.3f}s importing, "
+              f"{run['rss_bytes'] / 2**20:.1f} MiB peak RSS, engine loaded: {', '.join(run['engine_loaded']) or 'none'}")
+        for package, seconds in list(run['packages'].items())[:args.top]:
+            print(f"    {package:<24}{seconds * 1000:8.1f} ms")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(json.dumps(results, indent=2) + '\n')
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+import numpy as np
+import pandas as pd
+from nba_analytics.seasons import (
+    WESTERN_CONFERENCE_TEAMS,
+    EASTERN_CONFERENCE_TEAMS,
+    FIRST_SEASON,
+    LAST_SEASON,
+    get_conference_id
+)
+
+# Synthetic data shaped like the Kaggle 'game' table, used by the benchmarks
+
+SIDE_COLUMNS = [
+    'fgm', 'fga', 'fg_pct', 'fg3m', 'fg3a', 'fg3_pct', 'ftm', 'fta', 'ft_pct',
+    'oreb', 'dreb', 'reb', 'ast', 'stl', 'blk', 'tov', 'pf', 'pts', 'plus_minus', 'video_available'
+]
+
+def _team_pool():
+    # Synthetic teams keep one name for every season, so only names in the league for the whole configured range are used
+    names = [
+        name for name in sorted(WESTERN_CONFERENCE_TEAMS) + sorted(EASTERN_CONFERENCE_TEAMS)
+        if all(get_conference_id(name, year) for year in range(FIRST_SEASON, LAST_SEASON + 1))
+    ]
+    ids = [str(1610612700 + index) for index in range(len(names))]
+    abbreviations = [''.join(word[0] for word in name.split())[:3].upper() for name in names]
+    return np.array(ids), np.array(names), np.array(abbreviations)
+
+def _box_score(rng, n_games):
+    """Generate one side of a box score for every game"""
+    fga = rng.normal(85, 6, n_games).round().clip(60, 120)
+    fgm = rng.binomial(fga.astype(np.int64), 0.46).astype(np.float64)
+    fg3a = rng.normal(25, 6, n_games).round().clip(5, 50)
+    fg3m = np.minimum(rng.binomial(fg3a.astype(np.int64), 0.35), fgm).astype(np.float64)
+    fta = rng.normal(22, 5, n_games).round().clip(5, 45)
+    ftm = rng.binomial(fta.astype(np.int64), 0.76).astype(np.float64)
+    oreb = rng.normal(10, 3, n_games).round().clip(0, 25)
+    dreb = rng.normal(33, 4, n_games).round().clip(15, 50)
+    return {
+        'fgm': fgm, 'fga': fga, 'fg_pct': fgm / fga,
+        'fg3m': fg3m, 'fg3a': fg3a, 'fg3_pct': fg3m / fg3a,
+        'ftm': ftm, 'fta': fta, 'ft_pct': ftm / fta,
+        'oreb': oreb, 'dreb': dreb, 'reb': oreb + dreb,
+        'ast': rng.normal(23, 4, n_games).round(),
+        'stl': rng.normal(8, 2, n_games).round(),
+        'blk': rng.normal(5, 2, n_games).round(),
+        'tov': rng.normal(14, 3, n_games).round().clip(3, 30),
+        'pf': rng.normal(20, 3, n_games).round(),
+        'pts': 2 * fgm + fg3m + ftm,
+        'video_available': np.zeros(n_games),
+    }
+
+def make_game_frame(n_games=65000, first_season=1946, last_season=2022, seed=0):
+    """
+    Build a Kaggle-shaped 'game' DataFrame with n_games rows spread evenly over the
+    given range of seasons, each season running from late October to mid June
+    """
+    rng = np.random.default_rng(seed)
+    team_ids, team_names, abbreviations = _team_pool()
+
+    season_years = np.arange(first_season, last_season + 1)
+    season_start_year = np.sort(rng.choice(season_years, n_games))
+    day_offsets = rng.integers(0, 235, n_games)
+    game_dates = pd.to_datetime(np.char.add(season_start_year.astype(str), '-10-20')) + pd.to_timedelta(day_offsets, unit='D')
+
+    home = rng.integers(0, len(team_ids), n_games)
+    away = (home + rng.integers(1, len(team_ids), n_games)) % len(team_ids)
+    home_box = _box_score(rng, n_games)
+    away_box = _box_score(rng, n_games)
+    home_box['plus_minus'] = home_box['pts'] - away_box['pts']
+    away_box['plus_minus'] = away_box['pts'] - home_box['pts']
+
+    frame = {
+        'season_id': np.char.add('2', season_start_year.astype(str)),
+        'team_id_home': team_ids[home],
+        'team_abbreviation_home': abbreviations[home],
+        'team_name_home': team_names[home],
+        'game_id': np.char.zfill(np.arange(n_games).astype(str), 10),
+        'game_date': game_dates.strftime('%Y-%m-%d 00:00:00'),
+        'matchup_home': np.char.add(np.char.add(abbreviations[home], ' vs. '), abbreviations[away]),
+        'wl_home': np.where(home_box['plus_minus'] > 0, 'W', 'L'),
+        'min': np.full(n_games, 240),
+    }
+    for column in SIDE_COLUMNS:
+        frame[f'{column}_home'] = home_box[column]
+    frame.update({
+        'team_id_away': team_ids[away],
+        'team_abbreviation_away': abbreviations[away],
+        'team_name_away': team_names[away],
+        'matchup_away': np.char.add(np.char.add(abbreviations[away], ' @ '), abbreviations[home]),
+        'wl_away': np.where(away_box['plus_minus'] > 0, 'W', 'L'),
+    })
+    for column in SIDE_COLUMNS:
+        frame[f'{column}_away'] = away_box[column]
+    frame['season_type'] = np.full(n_games, 'Regular Season')
+
+    return pd.DataFrame(frame)
@@ -0,0 +1,76 @@
+"""
+Compare the original testzip + extractall double pass with the single streaming pass of
+extract_zip_member over a deflated archive holding a synthetic 'game' database and a CSV export
+
+    python -m benchmarks.unzip --games 65000
+"""
+import argparse
+import os
+import shutil
+import sqlite3
+import tempfile
+import time
+import zipfile
+from nba_analytics.db_utils import extract_zip_member
+from .synthetic import make_game_frame
+
+def write_archive(directory, n_games):
+    """Zip a synthetic nba.sqlite together with a CSV copy of its game table, as the Kaggle archive holds both"""
+    games = make_game_frame(n_games)
+    sql_path = os.path.join(directory, 'source.sqlite')
+    with sqlite3.connect(sql_path) as conn:
+        games.to_sql('game', conn, index=False)
+    csv_path = os.path.join(directory, 'game.csv')
+    games.to_csv(csv_path, index=False)
+
+    zip_path = os.path.join(directory, 'nba.sqlite.zip')
+    with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zip_ref:
+        zip_ref.write(sql_path, 'nba.sqlite')
+        zip_ref.write(csv_path, 'csv/game.csv')
+    os.remove(sql_path)
+    os.remove(csv_path)
+    return zip_path
+
+def legacy_extract(zip_path, destination):
+    with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+        if zip_ref.testzip() is not None:
+            raise zipfile.BadZipFile("Zip file is corrupted")
+        zip_ref.extractall(destination)
+
+def _timed(function, *args):
+    started = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - started
+
+def _directory_bytes(directory):
+    return sum(os.path.getsize(os.path.join(root, name)) for root, _, names in os.walk(directory) for name in names)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--games', type=int, default=65000, help="Number of synthetic games in the archived database")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        zip_path = write_archive(tmp_dir, args.games)
+        with zipfile.ZipFile(zip_path) as zip_ref:
+            member = zip_ref.getinfo('nba.sqlite')
+            total = sum(info.file_size for info in zip_ref.infolist())
+        print(f"Archive {os.path.getsize(zip_path):,} bytes, {total:,} uncompressed, nba.sqlite {member.file_size:,}")
+
+        legacy_dir = os.path.join(tmp_dir, 'legacy')
+        streaming_dir = os.path.join(tmp_dir, 'streaming')
+        os.makedirs(legacy_dir)
+        os.makedirs(streaming_dir)
+        legacy_time = _timed(legacy_extract, zip_path, legacy_dir)
+        streaming_time = _timed(extract_zip_member, zip_path, 'nba.sqlite', streaming_dir)
+
+        legacy_bytes, streaming_bytes = _directory_bytes(legacy_dir), _directory_bytes(streaming_dir)
+        # testzip decompresses every member once more before extractall decompresses them again
+        print(f"testzip + extractall: {legacy_time:7.3f}s  decompressed {2 * total:,} bytes, wrote {legacy_bytes:,}")
+        print(f"extract_zip_member:   {streaming_time:7.3f}s  decompressed {member.file_size:,} bytes, wrote {streaming_bytes:,}"
+              f"  ({member.file_size / 2**20 / streaming_time:.0f} MiB/s)")
+        print(f"{legacy_time / streaming_time:.1f}x faster")
+        shutil.rmtree(legacy_dir)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Bulk loader writing parsed seasons through the Django models, the counterpart of
+nba_analytics.db_utils.load_data_to_db for whatever DATABASES points at, e.g. a Postgres
+database served with NBA_READ_BACKEND=orm
+"""
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from nba_analytics.db_utils import bump_data_generation
+from nba_analytics.decade_table import STAT_COLUMNS
+from nba_analytics.seasons import (
+    CONFERENCE_NAMES,
+    season_start_year,
+    SEASON_SUMMARY_COLUMNS,
+    CONFERENCE_SUMMARY_COLUMNS
+)
+from .models import Season, Conference, Team, TeamStats, SeasonSummary, ConferenceSeasonSummary
+
+# Rows per INSERT statement, lowered further to the bound parameter limit of the backend
+BULK_BATCH_SIZE = 500
+
+def insert_rows(model, fields, rows, using=DEFAULT_DB_ALIAS, batch_size=BULK_BATCH_SIZE):
+    """
+    Insert value tuples into a model's table with multi-row INSERTs of up to batch_size rows
+
+    Issues the same statements as bulk_create(batch_size=...) without building a model instance
+    per row or preparing every value through its field, which dominates bulk_create's time on
+    wide tables. Values must already be what the columns store: numbers, strings and key values.
+
+    Args:
+        model: Model whose table is written
+        fields: Field names the values of each row are in, foreign keys by their field name
+        rows: Sequence of value tuples
+        using: Database alias to write to
+        batch_size: Maximum rows per INSERT
+
+    Returns:
+        Number of rows written
+    """
+    connection = connections[using]
+    quote_name = connection.ops.quote_name
+    model_fields = [model._meta.get_field(name) for name in fields]
+    batch_size = max(min(batch_size, connection.ops.bulk_batch_size(model_fields, rows)), 1)
+    row_sql = f"({', '.join(['%s'] * len(model_fields))})"
+    insert_sql = (
+        f"INSERT INTO {quote_name(model._meta.db_table)} "
+        f"({', '.join(quote_name(field.column) for field in model_fields)}) VALUES "
+    )
+    with connection.cursor() as cursor:
+        for start in range(0, len(rows), batch_size):
+            batch = rows[start:start + batch_size]
+            cursor.execute(insert_sql + ', '.join([row_sql] * len(batch)), [value for row in batch for value in row])
+    return len(rows)
+
+def unique_team_seasons(data_object):
+    """
+    Keep one entry per team and season, the last one like INSERT OR REPLACE kept. Decade files
+    written before Teams rows were reused hold a Teams row, and so a copy of every team-season,
+    per update that wrote them, which the plain INSERTs of the bulk loaders reject.
+    """
+    return {
+        season_id: list({team_data['team']: team_data for team_data in season_data}.values())
+        for season_id, season_data in data_object.items()
+    }
+
+def load_data_to_orm(data_object, using=DEFAULT_DB_ALIAS, batch_size=BULK_BATCH_SIZE):
+    """
+    Replace every stored season with the parsed seasons in one transaction
+
+    Args:
+        data_object: {season: [team dictionaries]} as the parser produces it
+        using: Database alias to write to
+        batch_size: Maximum rows per INSERT
+
+    Returns:
+        Number of rows written
+    """
+    from nba_analytics.decade_parser import compute_season_summaries
+
+    season_summaries, conference_summaries = compute_season_summaries(data_object)
+    teams = sorted({
+        (team_data['team'], team_data['conference'][0])
+        for season_data in data_object.values()
+        for team_data in season_data
+    })
+
+    with transaction.atomic(using=using):
+        # Children first, so no delete has to cascade
+        for model in (ConferenceSeasonSummary, SeasonSummary, TeamStats, Team, Season):
+            model.objects.using(using).all().delete()
+        # The default database is the decade file, which may have been installed from an artifact
+        connection = connections[using]
+        if 'ArtifactInfo' in connection.introspection.table_names():
+            with connection.cursor() as cursor:
+                cursor.execute(f"DELETE FROM {connection.ops.quote_name('ArtifactInfo')}")
+
+        Conference.objects.using(using).bulk_create(
+            [Conference(conference_id=conference_id, conference_name=name) for conference_id, name in CONFERENCE_NAMES.items()],
+            ignore_conflicts=True
+        )
+        rows = insert_rows(
+            Season, ('season_id', 'start_year', 'end_year'),
+            [(season, season_start_year(season), season_start_year(season) + 1) for season in data_object],
+            using, batch_size
+        )
+        rows += insert_rows(Team, ('team_name', 'conference'), teams, using, batch_size)
+        # Read back rather than relying on INSERTs returning primary keys, which not every backend does
+        team_ids = {
+            (team_name, conference_id): team_id
+            for team_id, team_name, conference_id in Team.objects.using(using).values_list('team_id', 'team_name', 'conference_id')
+        }
+        rows += insert_rows(
+            TeamStats, ('team', 'season', *STAT_COLUMNS),
+            [(team_ids[(team_data['team'], team_data['conference'][0])], season_id,
+              *(float(team_data[column]) for column in STAT_COLUMNS))
+             for season_id, season_data in data_object.items()
+             for team_data in season_data],
+            using, batch_size
+        )
+        rows += insert_rows(
+            SeasonSummary, ('season', *SEASON_SUMMARY_COLUMNS),
+            [(season_id, *summary) for season_id, summary in season_summaries.items()],
+            using, batch_size
+        )
+        rows += insert_rows(
+            ConferenceSeasonSummary, ('season', 'conference', *CONFERENCE_SUMMARY_COLUMNS),
+            [(season_id, conference_id, *summary) for (season_id, conference_id), summary in conference_summaries.items()],
+            using, batch_size
+        )
+
+    bump_data_generation()
+    return rows
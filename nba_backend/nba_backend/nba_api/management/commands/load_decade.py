@@ -0,0 +1,36 @@
+import os
+import time
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+from nba_analytics.db_utils import verify_file, extract_data_from_db
+from nba_api.loaders import BULK_BATCH_SIZE, load_data_to_orm, unique_team_seasons
+from nba_api.utils.data_handler import db_path
+
+class Command(BaseCommand):
+    help = "Copy the decade database into a Django database with the bulk ORM loader, e.g. to serve it from Postgres"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--source', default=db_path, help="Decade SQLite file to copy")
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS, help="Database alias to load into")
+        parser.add_argument('--batch-size', type=int, default=BULK_BATCH_SIZE, help="Maximum rows per INSERT")
+
+    def handle(self, *args, **options):
+        try:
+            verify_file(options['source'])
+        except (FileNotFoundError, ValueError) as e:
+            raise CommandError(str(e))
+
+        # The loader deletes and rewrites the target in place, which the live decade file must never be:
+        # it is only ever replaced whole by a shadow build
+        target = connections[options['database']].settings_dict
+        if target['ENGINE'].endswith('sqlite3') and os.path.exists(str(target['NAME'])) \
+                and os.path.samefile(options['source'], target['NAME']):
+            raise CommandError(
+                f"'{options['database']}' is the source file {options['source']}, pick another --database or --source"
+            )
+
+        data = unique_team_seasons(extract_data_from_db(options['source']))
+        started = time.perf_counter()
+        rows = load_data_to_orm(data, using=options['database'], batch_size=options['batch_size'])
+        seconds = time.perf_counter() - started
+        self.stdout.write(f"Loaded {rows} rows into '{options['database']}' in {seconds:.3f}s ({rows / seconds:,.0f} rows/s)")
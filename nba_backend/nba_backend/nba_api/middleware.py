@@ -0,0 +1,46 @@
+import os
+import time
+from django.conf import settings
+from nba_analytics.instrumentation import metrics, profile_to
+
+PROFILE_HEADER = 'X-Profile'
+
+def should_profile(request):
+    """
+    Whether a request is run under cProfile: NBA_PROFILE = 'always' profiles every request,
+    'header' only those sending a X-Profile header and 'off' (the default) none
+    """
+    mode = getattr(settings, 'NBA_PROFILE', 'off')
+    return mode == 'always' or (mode == 'header' and bool(request.headers.get(PROFILE_HEADER)))
+
+class InstrumentationMiddleware:
+    """
+    Times every request into the 'request' metrics, labelled by view, method and status,
+    and dumps a cProfile of the requests selected by should_profile
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        started = time.perf_counter()
+        status_code = 500
+        try:
+            if should_profile(request):
+                with profile_to(f"{request.method}-{request.path}") as profile_path:
+                    response = self.get_response(request)
+                if profile_path is not None:
+                    response['X-Profile-File'] = os.path.basename(profile_path)
+            else:
+                response = self.get_response(request)
+            status_code = response.status_code
+            return response
+        finally:
+            match = getattr(request, 'resolver_match', None)
+            metrics.record(
+                'request',
+                time.perf_counter() - started,
+                error=status_code >= 500,
+                view=match.url_name if match and match.url_name else 'unmatched',
+                method=request.method,
+                status=str(status_code)
+            )
@@ -0,0 +1,55 @@
+# Generated by Django 5.0 on 2026-10-17 22:35
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('nba_api', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SeasonSummary',
+            fields=[
+                ('season', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, serialize=False, to='nba_api.season')),
+                ('team_count', models.IntegerField()),
+                ('mean_offensive_rating', models.FloatField()),
+                ('mean_defensive_rating', models.FloatField()),
+                ('mean_net_rating', models.FloatField()),
+                ('std_offensive_rating', models.FloatField(null=True)),
+                ('std_defensive_rating', models.FloatField(null=True)),
+                ('std_net_rating', models.FloatField(null=True)),
+                ('min_relative_offensive_rating', models.FloatField()),
+                ('max_relative_offensive_rating', models.FloatField()),
+                ('min_relative_defensive_rating', models.FloatField()),
+                ('max_relative_defensive_rating', models.FloatField()),
+                ('min_relative_net_rating', models.FloatField()),
+                ('max_relative_net_rating', models.FloatField()),
+            ],
+            options={
+                'db_table': 'SeasonSummary',
+            },
+        ),
+        migrations.CreateModel(
+            name='ConferenceSeasonSummary',
+            fields=[
+                ('summary_id', models.AutoField(primary_key=True, serialize=False)),
+                ('team_count', models.IntegerField()),
+                ('mean_relative_offensive_rating', models.FloatField()),
+                ('mean_relative_defensive_rating', models.FloatField()),
+                ('mean_relative_net_rating', models.FloatField()),
+                ('std_relative_offensive_rating', models.FloatField(null=True)),
+                ('std_relative_defensive_rating', models.FloatField(null=True)),
+                ('std_relative_net_rating', models.FloatField(null=True)),
+                ('conference', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='nba_api.conference')),
+                ('season', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='nba_api.season')),
+            ],
+            options={
+                'db_table': 'ConferenceSeasonSummary',
+                'unique_together': {('season', 'conference')},
+            },
+        ),
+    ]
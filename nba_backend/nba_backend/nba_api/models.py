@@ -37,4 +37,39 @@ class TeamStats(models.Model):
 
     class Meta:
         db_table = 'TeamStats'
-        unique_together = ('team', 'season')
\ No newline at end of file
+        unique_together = ('team', 'season')
+
+class SeasonSummary(models.Model):
+    season = models.OneToOneField(Season, on_delete=models.CASCADE, primary_key=True)
+    team_count = models.IntegerField()
+    mean_offensive_rating = models.FloatField()
+    mean_defensive_rating = models.FloatField()
+    mean_net_rating = models.FloatField()
+    std_offensive_rating = models.FloatField(null=True)
+    std_defensive_rating = models.FloatField(null=True)
+    std_net_rating = models.FloatField(null=True)
+    min_relative_offensive_rating = models.FloatField()
+    max_relative_offensive_rating = models.FloatField()
+    min_relative_defensive_rating = models.FloatField()
+    max_relative_defensive_rating = models.FloatField()
+    min_relative_net_rating = models.FloatField()
+    max_relative_net_rating = models.FloatField()
+
+    class Meta:
+        db_table = 'SeasonSummary'
+
+class ConferenceSeasonSummary(models.Model):
+    summary_id = models.AutoField(primary_key=True)
+    season = models.ForeignKey(Season, on_delete=models.CASCADE)
+    conference = models.ForeignKey(Conference, on_delete=models.CASCADE)
+    team_count = models.IntegerField()
+    mean_relative_offensive_rating = models.FloatField()
+    mean_relative_defensive_rating = models.FloatField()
+    mean_relative_net_rating = models.FloatField()
+    std_relative_offensive_rating = models.FloatField(null=True)
+    std_relative_defensive_rating = models.FloatField(null=True)
+    std_relative_net_rating = models.FloatField(null=True)
+
+    class Meta:
+        db_table = 'ConferenceSeasonSummary'
+        unique_together = ('season', 'conference')
@@ -0,0 +1,121 @@
+"""
+Read layer over the Django models, the database-agnostic counterpart of the sqlite3 readers in
+nba_analytics.db_utils. Rows are projected with values_list in TEAM_STATS_QUERY column order and
+encoded by the same plain functions as the sqlite3 path, so both paths return identical data and
+no model instance or ModelSerializer is built per row.
+"""
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.models import Count, Exists, Max, OuterRef
+from nba_analytics.db_utils import (
+    team_stats_row_to_dict,
+    get_data_generation,
+    conference_ratings_from_rows,
+    format_season_summary,
+    summarize_season
+)
+from nba_analytics.decade_table import DecadeTable
+from nba_analytics.seasons import CONFERENCE_NAMES, SEASON_SUMMARY_COLUMNS, CONFERENCE_SUMMARY_COLUMNS
+from .models import Season, TeamStats, SeasonSummary, ConferenceSeasonSummary
+
+# TeamStats fields in TEAM_STATS_QUERY column order
+TEAM_STATS_FIELDS = (
+    'season_id',
+    'team__team_name',
+    'team__conference_id',
+    'average_offensive_rating',
+    'average_defensive_rating',
+    'average_net_rating',
+    'average_plus_minus',
+    'relative_net_rating',
+    'relative_offensive_rating',
+    'relative_defensive_rating'
+)
+
+def team_stats_queryset(using=DEFAULT_DB_ALIAS):
+    """TeamStats with their team, conference and season joined in, ordered like /data/"""
+    return TeamStats.objects.using(using).select_related('team__conference', 'season').order_by(
+        'season_id', 'team__team_name'
+    )
+
+def team_stats_rows(queryset):
+    """Project a TeamStats queryset to TEAM_STATS_QUERY row tuples"""
+    return queryset.values_list(*TEAM_STATS_FIELDS)
+
+def decade_table(using=DEFAULT_DB_ALIAS):
+    """The ORM equivalent of extract_decade_table"""
+    return DecadeTable.from_rows(
+        (season_id, team_name, CONFERENCE_NAMES[conf_id], *stats)
+        for season_id, team_name, conf_id, *stats in team_stats_rows(team_stats_queryset(using)).iterator()
+    )
+
+def iter_decade_seasons(using=DEFAULT_DB_ALIAS, chunk_size=256):
+    """The ORM equivalent of iter_decade_seasons, reading chunk_size rows at a time"""
+    season_id, season_data = None, []
+    for row in team_stats_rows(team_stats_queryset(using)).iterator(chunk_size=chunk_size):
+        if row[0] != season_id and season_data:
+            yield season_id, season_data
+            season_data = []
+        season_id = row[0]
+        season_data.append(team_stats_row_to_dict(row))
+    if season_data:
+        yield season_id, season_data
+
+def season_data(season_id, using=DEFAULT_DB_ALIAS):
+    """The ORM equivalent of extract_season_from_db, None when the season has no stats"""
+    rows = team_stats_rows(team_stats_queryset(using).filter(season_id=season_id))
+    return [team_stats_row_to_dict(row) for row in rows] or None
+
+def season_list(using=DEFAULT_DB_ALIAS):
+    """The ORM equivalent of extract_seasons_from_db"""
+    has_stats = Exists(TeamStats.objects.using(using).filter(season_id=OuterRef('pk')))
+    return list(
+        Season.objects.using(using).filter(has_stats).order_by('start_year', 'end_year')
+        .values_list('season_id', flat=True)
+    )
+
+def season_summary(season_id, using=DEFAULT_DB_ALIAS):
+    """The ORM equivalent of extract_season_summary, aggregating the season's stats when no summary is stored"""
+    summary = SeasonSummary.objects.using(using).filter(season_id=season_id).values_list(*SEASON_SUMMARY_COLUMNS).first()
+    if summary is None:
+        return summarize_season(season_id, season_data(season_id, using))
+    conference_summaries = {
+        conference_id: row
+        for conference_id, *row in ConferenceSeasonSummary.objects.using(using).filter(season_id=season_id)
+        .values_list('conference_id', *CONFERENCE_SUMMARY_COLUMNS)
+    }
+    return format_season_summary(season_id, summary, conference_summaries)
+
+def conference_ratings(using=DEFAULT_DB_ALIAS):
+    """The ORM equivalent of extract_conference_ratings"""
+    return conference_ratings_from_rows(list(
+        TeamStats.objects.using(using)
+        .order_by('season__start_year', 'season__end_year', 'season_id', 'team__team_name')
+        .values_list('season_id', 'team__conference_id', 'relative_offensive_rating',
+                     'relative_defensive_rating', 'relative_net_rating')
+    ))
+
+def cluster_rows(seasons=None, using=DEFAULT_DB_ALIAS):
+    """The ORM equivalent of extract_cluster_rows"""
+    queryset = team_stats_queryset(using)
+    if seasons:
+        queryset = queryset.filter(season_id__in=seasons)
+    return [
+        (season_id, team_name, CONFERENCE_NAMES[conf_id], offensive, defensive)
+        for season_id, team_name, conf_id, offensive, defensive in queryset.values_list(
+            'season_id', 'team__team_name', 'team__conference_id', 'relative_offensive_rating', 'relative_defensive_rating'
+        )
+    ]
+
+def data_version(using=DEFAULT_DB_ALIAS):
+    """
+    The ORM equivalent of data_version, keying the response and cluster caches in ORM mode.
+    load_data_to_orm replaces every TeamStats row, and the new rows get new primary keys,
+    so a reload by any process changes it
+    """
+    stats = TeamStats.objects.using(using).aggregate(rows=Count('pk'), last=Max('pk'))
+    return ('orm', get_data_generation(), stats['rows'], stats['last'])
+
+def cluster_input(seasons=None, using=DEFAULT_DB_ALIAS):
+    """(data_version, cluster_rows) read in one transaction, so the rows belong to the version"""
+    with transaction.atomic(using=using):
+        return data_version(using), cluster_rows(seasons, using)
@@ -0,0 +1,17 @@
+import json
+from rest_framework.renderers import BaseRenderer
+
+class NDJSONRenderer(BaseRenderer):
+    """
+    Newline-delimited JSON, selected with ?format=ndjson or Accept: application/x-ndjson.
+    Views stream their successful responses line by line; anything rendered through this
+    class (errors included) becomes a single line.
+    """
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return json.dumps(data).encode() + b'\n'
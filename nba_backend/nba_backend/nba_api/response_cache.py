@@ -0,0 +1,92 @@
+import hashlib
+import threading
+import time
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.http import http_date, parse_etags, quote_etag
+from rest_framework.renderers import JSONRenderer
+from .utils import data_handler
+from .utils.data_handler import db_path
+from nba_analytics.db_utils import data_version
+
+class CachedBody:
+    __slots__ = ('version', 'body', 'etag', 'last_modified')
+
+    def __init__(self, version, body, last_modified):
+        self.version = version
+        self.body = body
+        self.etag = quote_etag(hashlib.sha256(body).hexdigest()[:32])
+        self.last_modified = last_modified
+
+class ResponseCache:
+    """
+    JSON response bodies rendered once per data version and served as bytes.
+    Conditional GETs are answered from the stored ETag without reading the database.
+    """
+    def __init__(self, path=db_path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries = {}
+
+    def current_version(self):
+        # In ORM mode the bodies come from the configured database, not from the decade file
+        if data_handler.read_backend == 'orm':
+            return data_handler.fetch_orm_version()
+        try:
+            return data_version(self.path)
+        except FileNotFoundError:
+            return None
+
+    def lookup(self, request, key):
+        """
+        Returns (version, response). The response is None when the body still has to be built,
+        in which case the version must be handed back to store() along with the data.
+        """
+        version = self.current_version()
+        entry = self._entries.get(key)
+        if version is None or entry is None or entry.version != version:
+            return version, None
+        return version, self._respond(request, entry)
+
+    def store(self, request, key, version, data):
+        # Data that knows how to encode itself is handed over as ready JSON bytes
+        body = data if isinstance(data, bytes) else JSONRenderer().render(data)
+        if version is None:
+            return HttpResponse(body, content_type='application/json')
+
+        entry = CachedBody(version, body, http_date(version_mtime(version)))
+        with self._lock:
+            # Entries from older data versions can never be served again
+            self._entries = {
+                cached_key: cached for cached_key, cached in self._entries.items() if cached.version == version
+            }
+            self._entries[key] = entry
+        return self._respond(request, entry)
+
+    def invalidate(self):
+        with self._lock:
+            self._entries = {}
+
+    @staticmethod
+    def _respond(request, entry):
+        if_none_match = request.headers.get('If-None-Match')
+        if if_none_match:
+            etags = parse_etags(if_none_match)
+            if '*' in etags or entry.etag in [etag.removeprefix('W/') for etag in etags]:
+                response = HttpResponseNotModified()
+                response['ETag'] = entry.etag
+                response['Last-Modified'] = entry.last_modified
+                return response
+
+        response = HttpResponse(entry.body, content_type='application/json')
+        response['ETag'] = entry.etag
+        response['Last-Modified'] = entry.last_modified
+        return response
+
+def version_mtime(version):
+    # data_version() is (generation, inode, mtime_ns, size). ORM versions carry no file time,
+    # so their bodies are stamped when first rendered
+    if version[0] == 'orm':
+        return time.time()
+    return version[2] / 1e9
+
+response_cache = ResponseCache()
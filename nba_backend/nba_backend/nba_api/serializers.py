@@ -1,5 +1,5 @@
 from rest_framework import serializers
-from .models import Season, Conference, Team, TeamStats
+from .models import Season, Conference, Team, TeamStats, SeasonSummary, ConferenceSeasonSummary
 
 class SeasonSerializer(serializers.ModelSerializer):
     class Meta:
@@ -19,4 +19,14 @@ class TeamSerializer(serializers.ModelSerializer):
 class TeamStatsSerializer(serializers.ModelSerializer):
     class Meta:
         model = TeamStats
-        fields = '__all__'
\ No newline at end of file
+        fields = '__all__'
+
+class SeasonSummarySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = SeasonSummary
+        fields = '__all__'
+
+class ConferenceSeasonSummarySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ConferenceSeasonSummary
+        fields = '__all__'
@@ -1,6 +1,92 @@
-from django.test import TestCase, Client
+from django.test import TestCase, Client, override_settings
 from django.urls import reverse
 from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+import io
+import os
+import sqlite3
+import tempfile
+import json
+import threading
+import time
+import subprocess
+import sys
+import zipfile
+from unittest import mock
+import numpy as np
+import pandas as pd
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connections
+from . import queries, views
+from .loaders import load_data_to_orm, unique_team_seasons
+from .models import Season, Conference, Team, TeamStats
+from .response_cache import response_cache
+from .utils import data_handler
+from .utils.data_handler import update_decade_database
+from nba_analytics.db_utils import (
+    read_game_table,
+    extract_zip_member,
+    bump_data_generation,
+    extract_data_from_db,
+    extract_decade_table,
+    extract_season_from_db,
+    extract_seasons_from_db,
+    iter_decade_seasons,
+    extract_season_summary,
+    extract_conference_ratings,
+    extract_cluster_rows,
+    load_data_to_db,
+    ReadConnectionPool,
+    TEAM_STATS_QUERY
+)
+from nba_analytics import clustering
+from nba_analytics.cache import LRUCache
+from nba_analytics.clustering import kmeans
+from nba_analytics.jobs import JobStore, start_job
+from nba_analytics.artifacts import (
+    LocalObjectStore,
+    install_latest_artifact,
+    installed_artifact_version,
+    precompute_and_publish
+)
+from nba_analytics import instrumentation
+from nba_analytics.instrumentation import MetricsRegistry, metrics, render_prometheus
+from nba_analytics.conference_stats import COMPARISON_METRICS, student_t_two_sided_p
+from nba_analytics.seasons import DEFAULT_SEASON_DATES, get_conference_id
+from nba_analytics.decade_parser import (
+    TeamObject,
+    compute_team_game_ratings,
+    generate_dataframe_metrics,
+    generate_individual_season_metrics,
+    parse_decade_data,
+    parse_range_data,
+    process_filter_db
+)
+
+def make_games(rows):
+    """Build a minimal 'game' table frame from (date, home, away, home_box, away_box) tuples"""
+    box_columns = ['fga', 'fgm', 'fta', 'oreb', 'dreb', 'tov', 'pts', 'plus_minus']
+    records = []
+    for game_date, home, away, home_box, away_box in rows:
+        record = {
+            'game_date': game_date,
+            'team_id_home': home[0], 'team_name_home': home[1],
+            'team_id_away': away[0], 'team_name_away': away[1],
+        }
+        record.update({f'{column}_home': value for column, value in zip(box_columns, home_box)})
+        record.update({f'{column}_away': value for column, value in zip(box_columns, away_box)})
+        records.append(record)
+    return pd.DataFrame(records)
+
+LAKERS = (1, 'Los Angeles Lakers')
+CELTICS = (2, 'Boston Celtics')
+HEAT = (3, 'Miami Heat')
+SAMPLE_GAMES = [
+    ('2010-11-02', LAKERS, CELTICS, (85, 40, 20, 10, 30, 12, 100, 5), (80, 38, 25, 8, 32, 15, 95, -5)),
+    ('2010-11-05', CELTICS, HEAT, (90, 42, 18, 12, 28, 10, 104, -2), (82, 41, 22, 9, 35, 13, 106, 2)),
+    ('2011-01-10', HEAT, LAKERS, (88, 45, 24, 11, 31, 14, 110, 12), (86, 39, 20, 7, 29, 16, 98, -12)),
+]
 
 class APITests(TestCase):
     def setUp(self):
@@ -20,4 +106,804 @@ class APITests(TestCase):
     
     def test_get_season_stats(self):
         response = self.client.get(reverse('season-stats', kwargs={'season_id': '2009-10'}))
-        self.assertEqual(response.status_code, status.HTTP_200_OK)
\ No newline at end of file
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+class GameRatingTests(TestCase):
+    def test_team_game_frame_has_two_rows_per_game(self):
+        team_games = compute_team_game_ratings(make_games(SAMPLE_GAMES))
+        self.assertEqual(len(team_games), 2 * len(SAMPLE_GAMES))
+        self.assertEqual(list(team_games['team_id'][:2]), [1, 2])
+        self.assertEqual(list(team_games['is_home'][:2]), [True, False])
+
+    def test_ratings_match_scalar_formula(self):
+        team_games = compute_team_game_ratings(make_games(SAMPLE_GAMES[:1]))
+        # Lakers at home: fga 85, fgm 40, fta 20, oreb 10, tov 12 against 32 defensive rebounds
+        lakers_poss = np.sum([85, 0.4 * 20, -1.07 * (10 / 42) * (85 - 40), 12])
+        celtics_poss = np.sum([80, 0.4 * 25, -1.07 * (8 / 38) * (80 - 38), 15])
+        home, away = team_games.iloc[0], team_games.iloc[1]
+        self.assertEqual(home['offensive_rating'], 100 / lakers_poss * 100)
+        self.assertEqual(home['defensive_rating'], 95 / celtics_poss * 100)
+        self.assertEqual(away['offensive_rating'], home['defensive_rating'])
+        self.assertEqual(away['net_rating'], -home['net_rating'])
+        self.assertEqual(home['possessions'], np.mean([lakers_poss, celtics_poss]))
+        self.assertEqual(away['plus_minus'], -5)
+
+    def test_season_averages_group_games_by_season_and_team(self):
+        range_dataframe, team_objects, season_dates = process_filter_db(make_games(SAMPLE_GAMES))
+        team_games = generate_dataframe_metrics(range_dataframe, team_objects, season_dates)
+        seasons_dict = generate_individual_season_metrics(team_games, season_dates)
+        self.assertEqual([team['team'] for team in seasons_dict['2010-11']],
+                         ['Los Angeles Lakers', 'Boston Celtics', 'Miami Heat'])
+        lakers = seasons_dict['2010-11'][0]
+        lakers_games = team_games[team_games['team'] == 'Los Angeles Lakers']
+        self.assertAlmostEqual(lakers['average_net_rating'], np.mean(lakers_games['net_rating']))
+        self.assertEqual(lakers['average_plus_minus'], np.mean([5, -12]))
+
+    def test_season_lookup_uses_inclusive_boundaries(self):
+        dates = ['2010-06-17', '2010-06-18', '2010-10-26', '2009-01-01']
+        self.assertEqual(list(TeamObject.get_season_indices(dates, DEFAULT_SEASON_DATES)), [0, -1, 1, -1])
+        self.assertTrue(TeamObject.is_date_in_season('2011-12-25', '2011-12', DEFAULT_SEASON_DATES))
+
+class IncrementalUpdateTests(TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmp_dir.name, 'decade.sqlite')
+        self.games = SAMPLE_GAMES + [
+            ('2012-01-05', LAKERS, HEAT, (84, 41, 21, 9, 30, 13, 101, 3), (83, 40, 19, 10, 31, 12, 98, -3)),
+        ]
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def read_stats(self):
+        with sqlite3.connect(self.db_path) as conn:
+            return conn.execute(
+                "SELECT stat_id, season_id, average_offensive_rating FROM TeamStats ORDER BY stat_id"
+            ).fetchall()
+
+    def test_only_changed_seasons_are_rewritten(self):
+        update_decade_database(make_games(self.games), path=self.db_path)
+        before = self.read_stats()
+        self.assertEqual(update_decade_database(make_games(self.games), incremental=True, path=self.db_path), [])
+
+        self.games[-1] = self.games[-1][:3] + ((84, 41, 21, 9, 30, 13, 110, 12), self.games[-1][4])
+        self.assertEqual(update_decade_database(make_games(self.games), incremental=True, path=self.db_path), ['2011-12'])
+        after = self.read_stats()
+        self.assertEqual([row for row in after if row[1] == '2010-11'], [row for row in before if row[1] == '2010-11'])
+        self.assertNotEqual([row[2] for row in after if row[1] == '2011-12'], [row[2] for row in before if row[1] == '2011-12'])
+
+def season_start(game_date):
+    """Start year of the season a 'YYYY-MM-DD' date belongs to, as in the source season_id"""
+    year, month = int(game_date[:4]), int(game_date[5:7])
+    return str(year if month >= 7 else year - 1)
+
+class GameTableReadTests(TestCase):
+    def test_read_projects_columns_and_filters_dates_in_sql(self):
+        games = make_games(SAMPLE_GAMES + [
+            ('2005-11-02', LAKERS, CELTICS, (85, 40, 20, 10, 30, 12, 100, 5), (80, 38, 25, 8, 32, 15, 95, -5)),
+        ])
+        games['season_id'] = '2' + games['game_date'].map(season_start)
+        games['game_date'] = games['game_date'] + ' 00:00:00'
+        games['season_type'] = 'Regular Season'
+        with sqlite3.connect(':memory:') as conn:
+            games.to_sql('game', conn, index=False)
+            dataframe = read_game_table(conn)
+
+        self.assertEqual(len(dataframe), len(SAMPLE_GAMES))
+        self.assertNotIn('season_type', dataframe.columns)
+        self.assertEqual(dataframe['pts_home'].dtype, np.float32)
+        self.assertIsInstance(dataframe['team_name_home'].dtype, pd.CategoricalDtype)
+        # The calendar derived from season_id only holds seasons that have games
+        expected = {season: teams for season, teams in parse_decade_data(make_games(SAMPLE_GAMES)).items() if teams}
+        self.assertEqual(parse_decade_data(dataframe), expected)
+
+class SeasonCalendarTests(TestCase):
+    def test_calendar_is_derived_from_season_ids(self):
+        games = make_games([
+            ('1996-11-01', LAKERS, CELTICS, (85, 40, 20, 10, 30, 12, 100, 5), (80, 38, 25, 8, 32, 15, 95, -5)),
+            ('1997-06-13', CELTICS, LAKERS, (90, 42, 18, 12, 28, 10, 104, -2), (82, 41, 22, 9, 35, 13, 106, 2)),
+            ('1997-07-20', CELTICS, LAKERS, (90, 42, 18, 12, 28, 10, 104, -2), (82, 41, 22, 9, 35, 13, 106, 2)),
+            ('1997-10-31', HEAT, LAKERS, (88, 45, 24, 11, 31, 14, 110, 12), (86, 39, 20, 7, 29, 16, 98, -12)),
+        ])
+        # A playoff game, a summer league game and a game of the following season
+        games['season_id'] = ['21996', '41996', '11997', '21997']
+        range_dataframe, team_objects, season_dates = process_filter_db(games, 1996, 1997)
+
+        self.assertEqual(season_dates, {
+            '1996-97': {'start': '1996-11-01', 'end': '1997-06-13'},
+            '1997-98': {'start': '1997-10-31', 'end': '1997-10-31'},
+        })
+        seasons_dict = parse_range_data(range_dataframe, team_objects, season_dates)
+        self.assertEqual(sorted(seasons_dict), ['1996-97', '1997-98'])
+        self.assertEqual([team['team'] for team in seasons_dict['1996-97']], ['Los Angeles Lakers', 'Boston Celtics'])
+
+    def test_teams_are_named_and_placed_per_season(self):
+        nets = (4, 'New Jersey Nets')
+        brooklyn = (4, 'Brooklyn Nets')
+        games = make_games([
+            ('2011-12-26', nets, CELTICS, (85, 40, 20, 10, 30, 12, 100, 5), (80, 38, 25, 8, 32, 15, 95, -5)),
+            ('2012-11-03', CELTICS, brooklyn, (90, 42, 18, 12, 28, 10, 104, -2), (82, 41, 22, 9, 35, 13, 106, 2)),
+        ])
+        seasons_dict = parse_decade_data(games)
+        self.assertEqual(sorted(team['team'] for team in seasons_dict['2011-12']), ['Boston Celtics', 'New Jersey Nets'])
+        self.assertEqual(sorted(team['team'] for team in seasons_dict['2012-13']), ['Boston Celtics', 'Brooklyn Nets'])
+        self.assertEqual(get_conference_id('Miami Heat', 2003), 'E')
+        self.assertEqual(get_conference_id('Houston Rockets', 1971), 'W')
+        self.assertEqual(get_conference_id('Houston Rockets', 1972), 'E')
+
+class DecadeCacheTests(TestCase):
+    def setUp(self):
+        data_handler.decade_cache.clear()
+
+    def tearDown(self):
+        data_handler.decade_cache.clear()
+
+    def test_concurrent_cold_requests_extract_once(self):
+        def slow_extract(path):
+            time.sleep(0.05)
+            return {'2009-10': []}
+
+        with mock.patch.object(data_handler, 'extract_decade_table', side_effect=slow_extract) as extract:
+            threads = [threading.Thread(target=data_handler.fetch_decade_data) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            self.assertEqual(data_handler.fetch_decade_data(), ({'2009-10': []}, False))
+            self.assertEqual(extract.call_count, 1)
+
+            bump_data_generation()
+            data_handler.fetch_decade_data()
+            self.assertEqual(extract.call_count, 2)
+
+class ResponseCacheTests(TestCase):
+    def setUp(self):
+        self.client = Client()
+        response_cache.invalidate()
+
+    def tearDown(self):
+        response_cache.invalidate()
+
+    def test_conditional_get_returns_304_without_reading_data(self):
+        response = self.client.get(reverse('season-list'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('Last-Modified', response)
+        etag = response['ETag']
+
+        with mock.patch.object(views, 'fetch_season_list') as fetch:
+            cached = self.client.get(reverse('season-list'))
+            not_modified = self.client.get(reverse('season-list'), HTTP_IF_NONE_MATCH=etag)
+            fetch.assert_not_called()
+        self.assertEqual(cached.content, response.content)
+        self.assertEqual(not_modified.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_new_data_generation_changes_the_etag(self):
+        with mock.patch.object(views, 'fetch_season_list', return_value=(['2009-10'], False)):
+            etag = self.client.get(reverse('season-list'))['ETag']
+            bump_data_generation()
+            with mock.patch.object(views, 'fetch_season_list', return_value=(['2010-11'], False)):
+                response = self.client.get(reverse('season-list'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+
+class SeasonQueryTests(TestCase):
+    def test_season_queries_match_full_extraction(self):
+        decade = extract_data_from_db(data_handler.db_path)
+        self.assertEqual(extract_seasons_from_db(data_handler.db_path), list(decade.keys()))
+        self.assertEqual(extract_season_from_db(data_handler.db_path, '2012-13'), decade['2012-13'])
+        self.assertIsNone(extract_season_from_db(data_handler.db_path, '1999-00'))
+
+    def test_season_query_uses_season_index(self):
+        with sqlite3.connect(data_handler.db_path) as conn:
+            plan = conn.execute(
+                "EXPLAIN QUERY PLAN " + TEAM_STATS_QUERY + "WHERE ts.season_id = ?", ('2012-13',)
+            ).fetchall()
+        self.assertIn('idx_teamstats_season', ' '.join(row[-1] for row in plan))
+
+def copy_decade_to_orm(path):
+    """Load the tables of a decade file into the test database through the models"""
+    with sqlite3.connect(path) as conn:
+        Season.objects.bulk_create(
+            Season(season_id=row[0], start_year=row[1], end_year=row[2])
+            for row in conn.execute("SELECT season_id, start_year, end_year FROM Seasons")
+        )
+        Conference.objects.bulk_create(
+            Conference(conference_id=row[0], conference_name=row[1])
+            for row in conn.execute("SELECT conference_id, conference_name FROM Conferences")
+        )
+        Team.objects.bulk_create(
+            Team(team_id=row[0], team_name=row[1], conference_id=row[2])
+            for row in conn.execute("SELECT team_id, team_name, conference_id FROM Teams")
+        )
+        stat_columns = queries.TEAM_STATS_FIELDS[3:]
+        TeamStats.objects.bulk_create(
+            TeamStats(team_id=row[0], season_id=row[1], **dict(zip(stat_columns, row[2:])))
+            for row in conn.execute(f"SELECT team_id, season_id, {', '.join(stat_columns)} FROM TeamStats")
+        )
+
+class ORMReadTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        copy_decade_to_orm(data_handler.db_path)
+
+    def tearDown(self):
+        response_cache.invalidate()
+        data_handler.cluster_cache.clear()
+
+    def test_orm_readers_match_sqlite_readers(self):
+        path = data_handler.db_path
+        self.assertEqual(queries.decade_table().to_json(), extract_decade_table(path).to_json())
+        self.assertEqual(queries.season_list(), extract_seasons_from_db(path))
+        self.assertEqual(list(queries.iter_decade_seasons()), list(iter_decade_seasons(path)))
+        with self.assertNumQueries(1):
+            self.assertEqual(queries.season_data('2012-13'), extract_season_from_db(path, '2012-13'))
+        self.assertIsNone(queries.season_data('1999-00'))
+
+    def test_orm_data_changes_invalidate_cached_responses(self):
+        url = reverse('season-stats', kwargs={'season_id': '2015-16'})
+        with mock.patch.object(data_handler, 'read_backend', 'orm'):
+            first = self.client.get(url)
+            self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=first['ETag']).status_code, status.HTTP_304_NOT_MODIFIED)
+            # As a load from another process would, without invalidating this process's caches
+            TeamStats.objects.filter(season_id='2015-16').order_by('-pk').first().delete()
+            second = self.client.get(url, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(second.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(second['ETag'], first['ETag'])
+        self.assertEqual(len(second.json()), len(first.json()) - 1)
+
+    def test_views_serve_the_same_bodies_from_the_orm(self):
+        urls = [
+            reverse('nba-data'), reverse('season-list'), reverse('season-stats', kwargs={'season_id': '2015-16'}),
+            reverse('season-summary', kwargs={'season_id': '2015-16'}), reverse('conference-comparison'),
+            reverse('cluster-analysis') + '?k=3&seasons=2014-15,2015-16'
+        ]
+        responses = [self.client.get(url) for url in urls]
+        self.assertEqual([response.status_code for response in responses], [status.HTTP_200_OK] * len(urls))
+        response_cache.invalidate()
+        with mock.patch.object(data_handler, 'read_backend', 'orm'), \
+                mock.patch.object(data_handler, 'db_path', os.path.join(tempfile.gettempdir(), 'missing.sqlite')):
+            # Nothing is read from the decade file
+            self.assertEqual([self.client.get(url).content for url in urls], [response.content for response in responses])
+
+class BulkLoadTests(TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmp_dir.name, 'decade.sqlite')
+        self.data = unique_team_seasons(extract_data_from_db(data_handler.db_path))
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_load_builds_indexes_after_inserting_every_row(self):
+        rows = load_data_to_db(self.data, self.db_path)
+        self.assertEqual(len(extract_data_from_db(self.db_path)['2015-16']), 30)
+        with sqlite3.connect(self.db_path) as conn:
+            indexes = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+            counted = sum(
+                conn.execute(f"SELECT count(*) FROM {table}").fetchone()[0]
+                for table in ('Seasons', 'Teams', 'TeamStats', 'SeasonSummary', 'ConferenceSeasonSummary')
+            )
+        self.assertTrue({'idx_teamstats_season', 'idx_teamstats_team', 'idx_teams_conference'} <= indexes)
+        self.assertEqual(rows, counted)
+
+    def test_orm_loader_matches_the_sqlite_loader(self):
+        load_data_to_orm(self.data, batch_size=7)
+        # Loading again replaces the rows instead of adding to them
+        call_command('load_decade', source=data_handler.db_path, stdout=io.StringIO())
+        with mock.patch.dict(connections['default'].settings_dict, NAME=data_handler.db_path), \
+                self.assertRaises(CommandError):
+            call_command('load_decade', source=data_handler.db_path, stdout=io.StringIO())
+        load_data_to_db(self.data, self.db_path)
+        self.assertEqual(queries.decade_table().to_json(), extract_decade_table(self.db_path).to_json())
+        self.assertEqual(queries.season_list(), extract_seasons_from_db(self.db_path))
+        self.assertEqual(TeamStats.objects.count(), sum(len(teams) for teams in self.data.values()))
+        # Both loaders materialize the summaries the ORM readers serve
+        self.assertEqual(queries.season_summary('2015-16'), extract_season_summary(self.db_path, '2015-16'))
+        self.assertEqual(queries.conference_ratings(), extract_conference_ratings(self.db_path))
+        self.assertEqual(queries.cluster_rows(['2015-16']), extract_cluster_rows(self.db_path, ['2015-16']))
+
+class ShadowSwapTests(TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmp_dir.name, 'decade.sqlite')
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_rebuild_is_published_atomically_and_open_readers_keep_their_data(self):
+        update_decade_database(make_games(SAMPLE_GAMES), path=self.db_path)
+        reader = sqlite3.connect(self.db_path)
+        try:
+            self.assertEqual(reader.execute("SELECT count(*) FROM TeamStats").fetchone()[0], 3)
+            update_decade_database(make_games(SAMPLE_GAMES[:1]), path=self.db_path)
+
+            self.assertFalse(os.path.exists(self.db_path + '.new'))
+            self.assertEqual(extract_seasons_from_db(self.db_path), ['2010-11'])
+            self.assertEqual(len(extract_season_from_db(self.db_path, '2010-11')), 1)
+            # The connection opened before the swap is pinned to the previous file
+            self.assertEqual(reader.execute("SELECT count(*) FROM TeamStats").fetchone()[0], 3)
+        finally:
+            reader.close()
+
+    def test_failed_rebuild_leaves_live_database_untouched(self):
+        update_decade_database(make_games(SAMPLE_GAMES), path=self.db_path)
+        with mock.patch('nba_analytics.db_utils.insert_team_stats', side_effect=RuntimeError('boom')):
+            with self.assertRaises(RuntimeError):
+                update_decade_database(make_games(SAMPLE_GAMES[:1]), path=self.db_path)
+        self.assertFalse(os.path.exists(self.db_path + '.new'))
+        self.assertEqual(len(extract_season_from_db(self.db_path, '2010-11')), 3)
+
+class ReadConnectionPoolTests(TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmp_dir.name, 'decade.sqlite')
+        update_decade_database(make_games(SAMPLE_GAMES), path=self.db_path)
+        self.pool = ReadConnectionPool()
+
+    def tearDown(self):
+        self.pool.close()
+        self.tmp_dir.cleanup()
+
+    def test_connections_are_reused_until_the_file_is_replaced(self):
+        with self.pool.connection(self.db_path) as first:
+            pass
+        with self.pool.connection(self.db_path) as second:
+            self.assertIs(first, second)
+        self.assertEqual(self.pool.metrics()['hits'], 1)
+
+        update_decade_database(make_games(SAMPLE_GAMES[:1]), path=self.db_path)
+        with self.pool.connection(self.db_path) as third:
+            self.assertIsNot(third, first)
+            self.assertEqual(third.execute("SELECT count(*) FROM TeamStats").fetchone()[0], 1)
+        self.assertEqual(self.pool.metrics()['misses'], 2)
+
+    def test_connections_are_read_only(self):
+        with self.assertRaises(sqlite3.OperationalError):
+            with self.pool.connection(self.db_path) as conn:
+                conn.execute("DELETE FROM TeamStats")
+
+class StreamingDataTests(TestCase):
+    def setUp(self):
+        self.client = Client()
+
+    def test_ndjson_streams_one_line_per_season(self):
+        expected = extract_data_from_db(data_handler.db_path)
+        for response in (
+            self.client.get(reverse('nba-data'), {'format': 'ndjson'}),
+            self.client.get(reverse('nba-data'), HTTP_ACCEPT='application/x-ndjson'),
+        ):
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertTrue(response.streaming)
+            self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+            lines = [json.loads(line) for line in b''.join(response.streaming_content).splitlines()]
+            self.assertEqual({line['season']: line['teams'] for line in lines}, json.loads(json.dumps(expected)))
+
+    def test_schema_errors_are_reported_before_streaming(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'decade.sqlite')
+            # Passes verify_file but has none of the decade tables
+            sqlite3.connect(path).execute("CREATE TABLE Other (id INTEGER)").connection.close()
+            with mock.patch.object(data_handler, 'db_path', path), \
+                    mock.patch.object(views, 'start_update_job', return_value=('job', True)) as start:
+                response = self.client.get(reverse('nba-data'), {'format': 'ndjson'})
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertFalse(response.streaming)
+        start.assert_called_once()
+
+class DecadeTableTests(TestCase):
+    def test_table_matches_dictionary_extraction(self):
+        expected = extract_data_from_db(data_handler.db_path)
+        table = extract_decade_table(data_handler.db_path)
+        self.assertEqual(list(table.keys()), list(expected.keys()))
+        self.assertEqual(table.row_count, sum(len(teams) for teams in expected.values()))
+        self.assertEqual(table.to_dict(), expected)
+        self.assertEqual(table.to_json(), JSONRenderer().render(expected))
+
+    def test_row_views_read_from_the_arrays(self):
+        table = extract_decade_table(data_handler.db_path)
+        row = table['2010-11'][0]
+        self.assertEqual(row, extract_data_from_db(data_handler.db_path)['2010-11'][0])
+        self.assertEqual(row.team, row['team'])
+        with self.assertRaises(AttributeError):
+            row.extra = 1
+
+class ConferenceComparisonTests(TestCase):
+    def test_t_distribution_p_values_match_closed_forms(self):
+        # df=1 is the Cauchy distribution and df=2 has p = 1 - |t| / sqrt(t^2 + 2)
+        p_values = student_t_two_sided_p([1.0, 3.0, 0.0, 2.0], [1.0, 2.0, 5.0, 10.0])
+        np.testing.assert_allclose(p_values[:3], [0.5, 1 - 3 / np.sqrt(11), 1.0], rtol=1e-12)
+        self.assertAlmostEqual(p_values[3], 0.0733880347, places=9)
+
+    def test_endpoint_matches_per_season_welch_tests(self):
+        response = self.client.get(reverse('conference-comparison'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        body = response.json()
+        decade = extract_data_from_db(data_handler.db_path)
+        self.assertEqual([season['season'] for season in body['seasons']], extract_seasons_from_db(data_handler.db_path))
+
+        season = body['seasons'][0]
+        teams = decade[season['season']]
+        for metric in COMPARISON_METRICS:
+            west = np.array([team[metric] for team in teams if team['conference'] == 'Western'])
+            east = np.array([team[metric] for team in teams if team['conference'] == 'Eastern'])
+            se1, se2 = west.var(ddof=1) / len(west), east.var(ddof=1) / len(east)
+            t = (west.mean() - east.mean()) / np.sqrt(se1 + se2)
+            df = (se1 + se2) ** 2 / (se1 ** 2 / (len(west) - 1) + se2 ** 2 / (len(east) - 1))
+            self.assertAlmostEqual(season['metrics'][metric]['diff'], west.mean() - east.mean(), places=4)
+            self.assertAlmostEqual(season['metrics'][metric]['t'], t, places=4)
+            self.assertAlmostEqual(season['metrics'][metric]['df'], df, places=2)
+            self.assertAlmostEqual(season['metrics'][metric]['p_value'], student_t_two_sided_p(t, df), places=6)
+
+class ClusterAnalysisTests(TestCase):
+    def setUp(self):
+        data_handler.cluster_cache.clear()
+
+    def test_kmeans_recovers_separated_groups(self):
+        rng = np.random.default_rng(1)
+        centers = np.array([[-6.0, 4.0], [0.0, 0.0], [6.0, -4.0]])
+        points = np.concatenate([center + rng.normal(0, 0.5, (40, 2)) for center in centers])
+        labels, centroids, inertia = kmeans(points, 3)
+        for group in range(3):
+            self.assertEqual(len(set(labels[group * 40:(group + 1) * 40])), 1)
+        np.testing.assert_allclose(sorted(centroids.tolist()), centers, atol=0.3)
+        self.assertEqual(kmeans(points, 3)[2], inertia)
+
+    def test_results_are_memoized_per_k_and_seasons(self):
+        with mock.patch.object(clustering, 'cluster_team_seasons', wraps=clustering.cluster_team_seasons) as cluster:
+            first = self.client.get(reverse('cluster-analysis'), {'k': 3, 'seasons': '2010-11,2009-10'})
+            second = self.client.get(reverse('cluster-analysis'), {'k': 3, 'seasons': '2009-10,2010-11'})
+            self.client.get(reverse('cluster-analysis'), {'k': 4, 'seasons': '2009-10,2010-11'})
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertEqual(first.content, second.content)
+        self.assertEqual(cluster.call_count, 2)
+
+        body = first.json()
+        self.assertEqual({point['season'] for point in body['points']}, {'2009-10', '2010-11'})
+        self.assertEqual(sum(centroid['size'] for centroid in body['centroids']), len(body['points']))
+        offensive = [point['relative_offensive_rating'] for point in body['points']]
+        self.assertLessEqual(body['extents']['relative_offensive_rating'][0], min(offensive))
+
+    def test_concurrent_cold_requests_share_one_computation(self):
+        cache, calls, started = LRUCache(maxsize=2), [], threading.Event()
+
+        def compute():
+            calls.append(1)
+            started.set()
+            time.sleep(0.1)
+            return 'clusters'
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(cache.get_or_compute('k3', compute))) for _ in range(4)]
+        threads[0].start()
+        started.wait()
+        for thread in threads[1:]:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(calls, [1])
+        self.assertEqual(results, ['clusters'] * 4)
+
+    def test_invalid_k_is_rejected(self):
+        response = self.client.get(reverse('cluster-analysis'), {'k': 'many'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+class SeasonSummaryTests(TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmp_dir.name, 'decade.sqlite')
+        self.games = SAMPLE_GAMES + [
+            ('2012-01-05', LAKERS, HEAT, (84, 41, 21, 9, 30, 13, 101, 3), (83, 40, 19, 10, 31, 12, 98, -3)),
+        ]
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_summaries_are_materialized_and_follow_incremental_updates(self):
+        update_decade_database(make_games(self.games), path=self.db_path)
+        with mock.patch('nba_analytics.db_utils.extract_season_from_db') as scan:
+            summary = extract_season_summary(self.db_path, '2010-11')
+        scan.assert_not_called()
+
+        teams = extract_season_from_db(self.db_path, '2010-11')
+        self.assertEqual(summary['team_count'], len(teams))
+        self.assertAlmostEqual(summary['mean_net_rating'], np.mean([team['average_net_rating'] for team in teams]))
+        self.assertAlmostEqual(summary['max_relative_offensive_rating'], max(team['relative_offensive_rating'] for team in teams))
+        self.assertEqual(sum(conference['team_count'] for conference in summary['conferences'].values()), len(teams))
+
+        before = extract_season_summary(self.db_path, '2011-12')
+        self.games[-1] = self.games[-1][:3] + ((84, 41, 21, 9, 30, 13, 110, 12), self.games[-1][4])
+        update_decade_database(make_games(self.games), incremental=True, path=self.db_path)
+        after = extract_season_summary(self.db_path, '2011-12')
+        self.assertNotEqual(after['mean_offensive_rating'], before['mean_offensive_rating'])
+        self.assertEqual(extract_season_summary(self.db_path, '2010-11'), summary)
+
+    def test_endpoint_falls_back_to_team_stats_without_summary_tables(self):
+        # The checked-in database predates the summary tables
+        response = self.client.get(reverse('season-summary', kwargs={'season_id': '2010-11'}))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        teams = extract_season_from_db(data_handler.db_path, '2010-11')
+        self.assertEqual(response.json()['team_count'], len(teams))
+        self.assertEqual(
+            self.client.get(reverse('season-summary', kwargs={'season_id': '1900-01'})).status_code,
+            status.HTTP_404_NOT_FOUND
+        )
+
+class UpdateJobTests(TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.store = JobStore(os.path.join(self.tmp_dir.name, 'jobs.sqlite'))
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_concurrent_starts_share_one_job(self):
+        results = []
+        barrier = threading.Barrier(8)
+        def acquire():
+            barrier.wait()
+            results.append(JobStore(self.store.path).acquire('kaggle-update'))
+        threads = [threading.Thread(target=acquire) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(sum(created for _, created in results), 1)
+        self.assertEqual(len({job_id for job_id, _ in results}), 1)
+
+    def test_stages_are_timed_and_failures_recorded(self):
+        def target(progress):
+            for stage in ('download', 'extract'):
+                with progress.stage(stage):
+                    pass
+            with progress.stage('parse'):
+                raise ValueError('bad data')
+
+        finished = threading.Event()
+        job_id, created = start_job(self.store, 'kaggle-update', target, on_finish=finished.set)
+        self.assertTrue(created)
+        self.assertTrue(finished.wait(5))
+
+        job = self.store.get(job_id)
+        self.assertEqual(job['status'], 'failed')
+        self.assertEqual(job['error'], 'ValueError: bad data')
+        self.assertEqual(job['stages_completed'], 2)
+        self.assertEqual([stage['status'] for stage in job['stages']], ['succeeded', 'succeeded', 'failed'])
+        self.assertTrue(all(stage['seconds'] >= 0 for stage in job['stages']))
+        # A finished job no longer blocks the next update
+        self.assertTrue(self.store.acquire('kaggle-update')[1])
+
+    def test_job_of_a_dead_worker_stops_blocking_updates(self):
+        job_id, _ = self.store.acquire('kaggle-update')
+        exited = subprocess.run([sys.executable, '-c', 'import os; print(os.getpid())'], capture_output=True, text=True)
+        with sqlite3.connect(self.store.path) as conn:
+            conn.execute("UPDATE Jobs SET owner_pid = ? WHERE job_id = ?", (int(exited.stdout), job_id))
+
+        self.assertFalse(self.store.is_running())
+        self.assertEqual(self.store.get(job_id)['error'], f"Abandoned: owner process {int(exited.stdout)} exited")
+        new_job_id, created = self.store.acquire('kaggle-update')
+        self.assertTrue(created)
+        # A job owned by a live process still blocks
+        self.assertEqual(self.store.acquire('kaggle-update'), (new_job_id, False))
+
+    def test_update_rejects_a_body_that_is_not_an_object(self):
+        with mock.patch.object(views, 'start_update_job') as start:
+            response = self.client.post(reverse('update-data'), '[]', content_type='application/json')
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            start.assert_not_called()
+            start.return_value = ('job', True)
+            self.assertEqual(
+                self.client.post(reverse('update-data') + '?mode=incremental', '[]', content_type='application/json').status_code,
+                status.HTTP_202_ACCEPTED
+            )
+        self.assertTrue(start.call_args.kwargs['incremental'])
+
+    def test_update_endpoint_deduplicates_and_reports_progress(self):
+        release = threading.Event()
+        def fake_update(incremental=False, progress=None):
+            with progress.stage('download'):
+                release.wait(5)
+
+        with mock.patch.object(data_handler, 'job_store', self.store), \
+                mock.patch.object(views, 'job_store', self.store), \
+                mock.patch.object(data_handler, 'force_kaggle_update', fake_update):
+            started = self.client.post(reverse('update-data'))
+            duplicate = self.client.post(reverse('update-data'))
+            self.assertEqual(started.status_code, status.HTTP_202_ACCEPTED)
+            self.assertEqual(duplicate.status_code, status.HTTP_409_CONFLICT)
+            self.assertEqual(duplicate.json()['job_id'], started.json()['job_id'])
+
+            progress = self.client.get(reverse('update-status'), {'job_id': started.json()['job_id']}).json()
+            self.assertTrue(progress['updating'])
+            self.assertEqual(progress['job']['status'], 'running')
+            release.set()
+            deadline = time.monotonic() + 5
+            while self.store.is_running() and time.monotonic() < deadline:
+                time.sleep(0.01)
+        self.assertEqual(self.store.get()['status'], 'succeeded')
+
+class ParallelParseTests(TestCase):
+    def test_parallel_parse_matches_serial_parse(self):
+        games = SAMPLE_GAMES + [
+            ('2012-01-05', LAKERS, HEAT, (84, 41, 21, 9, 30, 13, 101, 3), (83, 40, 19, 10, 31, 12, 98, -3)),
+            ('2012-01-05', LAKERS, CELTICS, (80, 40, 20, 9, 30, 13, 99, 1), (83, 40, 19, 10, 31, 12, 98, -1)),
+            ('2013-02-01', CELTICS, HEAT, (86, 42, 22, 11, 33, 12, 103, 7), (84, 39, 21, 8, 30, 15, 96, -7)),
+        ]
+        range_dataframe, team_objects, season_dates = process_filter_db(make_games(games))
+        serial = parse_range_data(range_dataframe, team_objects, season_dates)
+        self.assertEqual(parse_range_data(range_dataframe, team_objects, season_dates, workers=2), serial)
+        self.assertEqual(
+            parse_range_data(range_dataframe, team_objects, season_dates, seasons=['2012-13', '2011-12'], workers=2),
+            {season: serial[season] for season in ['2012-13', '2011-12']}
+        )
+
+class PipelineBenchmarkTests(TestCase):
+    def test_pipeline_benchmark_reports_every_stage_and_view(self):
+        from benchmarks.pipeline import run_pipeline, view_requests
+        with mock.patch('sys.stderr'):
+            results = run_pipeline(1000, repeat=1, memory=False)
+
+        json.dumps(results)
+        self.assertEqual(results['meta']['games_in_range'], 1000)
+        self.assertEqual(list(results['stages']), [
+            'process_filter_db', 'generate_dataframe_metrics', 'generate_individual_season_metrics',
+            'generate_relative_metrics', 'load_data_to_db', 'extract_data_from_db'
+        ])
+        self.assertEqual(list(results['views']), [name for name, url in view_requests('2009-10')])
+        self.assertTrue(all(view['status'] == 200 for view in results['views'].values()))
+        # The views are pointed back at the live database afterwards
+        self.assertEqual(data_handler.db_path, response_cache.path)
+
+class StartupBenchmarkTests(TestCase):
+    def test_importtime_output_is_summed_per_package(self):
+        from benchmarks.startup import parse_importtime, package_times
+        output = (
+            "import time: self [us] | cumulative | imported package\n"
+            "import time:       120 |        120 |   numpy.core\n"
+            "import time:        30 |        150 | numpy\n"
+            "import time:        50 |         50 | nba_analytics.seasons\n"
+        )
+        imports = parse_importtime(output)
+        self.assertEqual(imports[0], ('numpy.core', 120, 120))
+        self.assertEqual(package_times(imports), {'numpy': 0.00015, 'nba_analytics': 0.00005})
+
+class InstrumentationTests(TestCase):
+    def test_timers_record_rows_failures_and_nested_peaks(self):
+        registry = MetricsRegistry(trace_memory=True)
+        with registry.timer('stage', stage='outer') as outer:
+            with registry.timer('stage', stage='inner') as inner:
+                block = bytearray(4 * 2**20)
+                inner.rows = 1000
+            del block
+        with self.assertRaises(ValueError), registry.timer('stage', stage='inner'):
+            raise ValueError('bad rows')
+
+        self.assertGreaterEqual(inner.peak_bytes, 4 * 2**20)
+        self.assertGreaterEqual(outer.peak_bytes, inner.peak_bytes)
+        series = registry.snapshot()[('stage', (('stage', 'inner'),))]
+        self.assertEqual((series['count'], series['errors'], series['rows_total']), (2, 1, 1000))
+
+        text = render_prometheus(registry)
+        self.assertIn('nba_stage_seconds_count{stage="inner"} 2', text)
+        self.assertIn('nba_stage_errors_total{stage="inner"} 1', text)
+        self.assertIn('# TYPE nba_stage_rows_per_second gauge', text)
+        self.assertNotIn('nba_stage_rows_total{stage="outer"}', text)
+
+    def test_pipeline_stages_and_requests_are_exposed_on_metrics(self):
+        metrics.clear()
+        parse_decade_data(make_games(SAMPLE_GAMES))
+        self.client.get(reverse('season-list'))
+        response = self.client.get(reverse('metrics'))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+        text = response.content.decode()
+        self.assertIn(f'nba_stage_rows_total{{stage="process_filter_db"}} {len(SAMPLE_GAMES)}', text)
+        self.assertIn('nba_stage_seconds_count{stage="generate_individual_season_metrics"} 1', text)
+        self.assertIn('nba_request_seconds_count{method="GET",status="200",view="season-list"} 1', text)
+        self.assertIn('nba_read_pool_hits_total', text)
+        self.assertIn('nba_update_running 0', text)
+
+    def test_profile_is_dumped_when_requested_by_header(self):
+        with tempfile.TemporaryDirectory() as tmp_dir, \
+                mock.patch.object(instrumentation, 'PROFILE_DIR', tmp_dir), \
+                override_settings(NBA_PROFILE='header'):
+            plain = self.client.get(reverse('team-list'))
+            profiled = self.client.get(reverse('team-list'), HTTP_X_PROFILE='1')
+            self.assertNotIn('X-Profile-File', plain)
+            self.assertEqual(os.listdir(tmp_dir), [profiled['X-Profile-File']])
+
+class ZipExtractionTests(TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.zip_path = os.path.join(self.tmp_dir.name, 'nba.sqlite.zip')
+        self.payload = os.urandom(300_000)
+        with zipfile.ZipFile(self.zip_path, 'w', zipfile.ZIP_STORED) as zip_ref:
+            zip_ref.writestr('csv/game.csv', b'unused')
+            zip_ref.writestr('nba.sqlite', self.payload)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_only_the_requested_member_is_extracted(self):
+        path, size, seconds = extract_zip_member(self.zip_path, 'nba.sqlite', self.tmp_dir.name, chunk_size=4096)
+        self.assertEqual(size, len(self.payload))
+        with open(path, 'rb') as f:
+            self.assertEqual(f.read(), self.payload)
+        self.assertEqual(sorted(os.listdir(self.tmp_dir.name)), ['nba.sqlite', 'nba.sqlite.zip'])
+
+    def test_crc_mismatch_fails_without_leaving_a_file(self):
+        with open(self.zip_path, 'r+b') as f:
+            data = f.read()
+            f.seek(data.index(self.payload[:64]) + 1000)
+            f.write(bytes([data[data.index(self.payload[:64]) + 1000] ^ 0xFF]))
+
+        with self.assertRaises(zipfile.BadZipFile):
+            extract_zip_member(self.zip_path, 'nba.sqlite', self.tmp_dir.name)
+        self.assertEqual(os.listdir(self.tmp_dir.name), ['nba.sqlite.zip'])
+
+class ArtifactTests(TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.store = LocalObjectStore(os.path.join(self.tmp_dir.name, 'bucket'))
+        self.work_dir = os.path.join(self.tmp_dir.name, 'work')
+        self.db_path = os.path.join(self.tmp_dir.name, 'decade.sqlite')
+        os.makedirs(self.work_dir)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def publish(self, games):
+        with mock.patch('sys.stdout'):
+            return precompute_and_publish(make_games(games), self.store, self.work_dir)
+
+    def test_published_artifact_is_installed_once(self):
+        manifest, published = self.publish(SAMPLE_GAMES)
+        self.assertTrue(published)
+        self.assertEqual(manifest['seasons'], ['2010-11'])
+        self.assertFalse(self.publish(SAMPLE_GAMES)[1])
+
+        with mock.patch('sys.stdout'):
+            self.assertEqual(install_latest_artifact(self.store, self.db_path)['version'], manifest['version'])
+            self.assertIsNone(install_latest_artifact(self.store, self.db_path))
+        self.assertEqual(installed_artifact_version(self.db_path), manifest['version'])
+        self.assertEqual(extract_decade_table(self.db_path).to_json(), self.store.get_bytes(manifest['files']['decade.json']['key']))
+
+    def test_local_update_forgets_the_installed_artifact(self):
+        with mock.patch('sys.stdout'):
+            manifest, _ = self.publish(SAMPLE_GAMES)
+            install_latest_artifact(self.store, self.db_path)
+            changed = update_decade_database(make_games(SAMPLE_GAMES[:2]), incremental=True, path=self.db_path)
+            self.assertEqual(changed, ['2010-11'])
+            self.assertIsNone(installed_artifact_version(self.db_path))
+            # The published version no longer matches the file, so it is installed again
+            self.assertEqual(install_latest_artifact(self.store, self.db_path)['version'], manifest['version'])
+
+    def test_corrupt_artifact_leaves_the_database_untouched(self):
+        with mock.patch('sys.stdout'):
+            first, _ = self.publish(SAMPLE_GAMES)
+            install_latest_artifact(self.store, self.db_path)
+            second, _ = self.publish(SAMPLE_GAMES + [
+                ('2012-01-05', LAKERS, HEAT, (84, 41, 21, 9, 30, 13, 101, 3), (83, 40, 19, 10, 31, 12, 98, -3)),
+            ])
+        key = second['files']['decade.sqlite']['key']
+        self.store.put_bytes(key, self.store.get_bytes(key)[:-1] + b'\x00')
+
+        with self.assertRaises(ValueError):
+            install_latest_artifact(self.store, self.db_path)
+        self.assertEqual(installed_artifact_version(self.db_path), first['version'])
+        self.assertEqual(sorted(os.listdir(self.tmp_dir.name)), ['bucket', 'decade.sqlite', 'work'])
+
+
+class AnalyticsPackageTests(TestCase):
+    def test_read_path_imports_no_engine_dependencies(self):
+        script = (
+            "import sys\n"
+            "import nba_analytics.db_utils, nba_analytics.artifacts, nba_analytics.jobs, nba_analytics.instrumentation\n"
+            "import nba_api.utils.data_handler\n"
+            "print(sorted(name for name in ('numpy', 'pandas', 'kaggle') if name in sys.modules))\n"
+        )
+        result = subprocess.run(
+            [sys.executable, '-c', script], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        )
+        self.assertEqual(result.stdout.strip(), '[]')
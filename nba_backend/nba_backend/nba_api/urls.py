@@ -6,6 +6,9 @@ urlpatterns = [
     path('update/', views.UpdateDataView.as_view(), name='update-data'),
     path('teams/', views.TeamListView.as_view(), name='team-list'),
     path('seasons/', views.SeasonListView.as_view(), name='season-list'),
+    path('stats/conference-comparison/', views.ConferenceComparisonView.as_view(), name='conference-comparison'),
     path('stats/<str:season_id>/', views.SeasonStatsView.as_view(), name='season-stats'),
+    path('clusters/', views.ClusterAnalysisView.as_view(), name='cluster-analysis'),
+    path('stats/<str:season_id>/summary/', views.SeasonSummaryView.as_view(), name='season-summary'),
     path('update/status/', views.UpdateStatusView.as_view(), name='update-status'), 
 ]
\ No newline at end of file
@@ -1,31 +1,304 @@
+import itertools
 import os
-from .decade_parser import parse_decade_data, get_team_object
-from .db_utils import verify_file, data_update_from_kaggle, load_data_to_db, extract_data_from_db
+import threading
+# The numeric modules (decade_parser, conference_stats, clustering) pull in pandas and numpy, so they
+# are imported by the functions that run them and a worker that only serves stored data never loads either
+from nba_analytics.seasons import get_team_object
+from nba_analytics.cache import LRUCache
+from nba_analytics.jobs import JobStore, NO_PROGRESS, start_job
+from nba_analytics.instrumentation import profile_to
+from nba_analytics.db_utils import (
+    verify_file,
+    data_update_from_kaggle,
+    load_data_to_db,
+    extract_decade_table,
+    extract_season_from_db,
+    extract_seasons_from_db,
+    extract_conference_ratings,
+    extract_cluster_rows,
+    extract_season_summary,
+    iter_decade_seasons,
+    data_version,
+    load_season_fingerprints,
+    upsert_season_data
+)
 
 dirname = os.path.dirname(__file__)
 db_folder_path = os.path.abspath(os.path.join(dirname, "../db"))
 db_path = os.path.join(db_folder_path, "decade.sqlite")
+jobs_db_path = os.path.join(db_folder_path, "jobs.sqlite")
 
+# Processes used to parse seasons during updates, 1 parses serially in the calling process
+parse_workers = int(os.getenv('NBA_PARSE_WORKERS', '1'))
+
+# Where the precompute Lambda publishes its artifacts ('s3://bucket/prefix' or a directory). When set, updates
+# install the latest prebuilt decade database instead of downloading and parsing the games in-process
+artifact_location = os.getenv('NBA_ARTIFACT_STORE')
+
+# Where the read endpoints read from: 'sqlite' reads the decade file directly with sqlite3, 'orm' goes through
+# the Django models and whatever DATABASES points at (the same decade file by default)
+read_backend = os.getenv('NBA_READ_BACKEND', 'sqlite')
+
+# Update jobs are tracked in their own database so job bookkeeping never touches the swapped decade file
+job_store = JobStore(jobs_db_path)
+
+
+class DecadeDataCache:
+    """
+    Process-wide cache of the decoded decade data.
+    Entries are keyed on data_version(), so a rebuild in this process or a replaced file on disk
+    invalidates them, and concurrent cold requests share a single extraction.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entry = None  # (version, content), swapped as one reference
+
+    def get(self, path, loader):
+        entry = self._entry
+        if entry is not None and entry[0] == data_version(path):
+            return entry[1]
+
+        with self._lock:
+            # Another thread may have populated the cache while this one waited
+            version = data_version(path)
+            entry = self._entry
+            if entry is not None and entry[0] == version:
+                return entry[1]
+            content = loader(path)
+            self._entry = (version, content)
+            return content
+
+    def clear(self):
+        with self._lock:
+            self._entry = None
+
+decade_cache = DecadeDataCache()
+
+# Encoded cluster analyses keyed on (k, seasons, data_version), so repeated page loads skip k-means entirely
+cluster_cache = LRUCache(maxsize=32)
+
+
+def fetch_from_orm(read):
+    """
+    Same (content, needs_update) contract as fetch_decade_data for a reader taking the nba_api.queries module.
+    A database error means the tables have not been loaded yet, so an update is needed.
+    """
+    # Imported on use: the ORM readers need the Django app registry, the sqlite3 readers do not
+    from django.db import DatabaseError
+    from nba_api import queries
+
+    try:
+        return read(queries), False
+    except DatabaseError as e:
+        return None, True
+
+def fetch_orm_version():
+    """Version of the data in the ORM database, None while its tables are not loaded"""
+    return fetch_from_orm(lambda queries: queries.data_version())[0]
 
 # THE TUPLE STRUCTURE OF FETCH_DECADE_DATA RETURNS ARE USED
 # TO INFORM THE DJANGO API HANDLER THAT AN UPDATE IS NEEDED
 # WITHOUT ANY STOPGAP IN EXECUTION
 def fetch_decade_data():
+    if read_backend == 'orm':
+        # Not kept in decade_cache, whose entries are keyed on the version of the decade file
+        return fetch_from_orm(lambda queries: queries.decade_table())
     try:
         verify_file(db_path)
     except (FileNotFoundError, ValueError) as e:
         return None, True
     try:
-        decade_content = extract_data_from_db(db_path)
+        decade_content = decade_cache.get(db_path, extract_decade_table)
         return decade_content, False
     except Exception as e:
         return None, True
 
-def force_kaggle_update():
-    game_database = data_update_from_kaggle()   
-    game_db_2010s = parse_decade_data(game_database)
-    
-    load_data_to_db(game_db_2010s, db_path)
+def read_first_season(seasons):
+    """
+    Read the first season of a lazy season iterator now, so a missing table or a file swapped
+    mid-read fails before a streaming response has sent its headers
+    """
+    seasons = iter(seasons)
+    first = next(seasons, None)
+    return seasons if first is None else itertools.chain([first], seasons)
+
+def stream_decade_data():
+    """
+    Same (content, needs_update) contract as fetch_decade_data, but the content is a lazy
+    iterator of (season_id, season data) pairs read straight from the database.
+    The first season is read before returning, see read_first_season
+    """
+    if read_backend == 'orm':
+        return fetch_from_orm(lambda queries: read_first_season(queries.iter_decade_seasons()))
+    try:
+        verify_file(db_path)
+        return read_first_season(iter_decade_seasons(db_path)), False
+    except Exception as e:
+        return None, True
+
+def fetch_season_list():
+    """Same (content, needs_update) contract as fetch_decade_data, reading only the Seasons table"""
+    if read_backend == 'orm':
+        return fetch_from_orm(lambda queries: queries.season_list())
+    try:
+        verify_file(db_path)
+        return extract_seasons_from_db(db_path), False
+    except Exception as e:
+        return None, True
+
+def fetch_season_data(season_id):
+    """Same (content, needs_update) contract as fetch_decade_data, reading only one season's rows"""
+    if read_backend == 'orm':
+        return fetch_from_orm(lambda queries: queries.season_data(season_id))
+    try:
+        verify_file(db_path)
+        return extract_season_from_db(db_path, season_id), False
+    except Exception as e:
+        return None, True
+
+def fetch_season_summary(season_id):
+    """Same (content, needs_update) contract as fetch_decade_data, reading one season's materialized summaries"""
+    if read_backend == 'orm':
+        return fetch_from_orm(lambda queries: queries.season_summary(season_id))
+    try:
+        verify_file(db_path)
+        return extract_season_summary(db_path, season_id), False
+    except Exception as e:
+        return None, True
+
+def fetch_conference_comparison():
+    """Same (content, needs_update) contract as fetch_decade_data, testing every season in one vectorized pass"""
+    from nba_analytics.conference_stats import build_conference_comparison
+
+    if read_backend == 'orm':
+        return fetch_from_orm(lambda queries: build_conference_comparison(*queries.conference_ratings()))
+    try:
+        verify_file(db_path)
+        return build_conference_comparison(*extract_conference_ratings(db_path)), False
+    except Exception as e:
+        return None, True
+
+def fetch_cluster_analysis(k, seasons=None):
+    """
+    Same (content, needs_update) contract as fetch_decade_data.
+    The content is the encoded cluster analysis, or None when no team-seasons match.
+
+    Args:
+        k: Number of clusters
+        seasons: Optional iterable of season IDs to restrict the analysis to
+    """
+    seasons = tuple(sorted(set(seasons))) if seasons else ()
+    if read_backend == 'orm':
+        # Rows are read up front with the version they belong to, k-means only runs on a cache miss
+        cluster_input, needs_update = fetch_from_orm(lambda queries: queries.cluster_input(seasons))
+        if needs_update:
+            return None, True
+        version, rows = cluster_input
+        read_rows = lambda: rows
+    else:
+        try:
+            verify_file(db_path)
+            version = data_version(db_path)
+        except Exception as e:
+            return None, True
+        read_rows = lambda: extract_cluster_rows(db_path, seasons)
+
+    def compute():
+        from nba_analytics.clustering import cluster_team_seasons, encode_cluster_analysis
+
+        rows = read_rows()
+        if len(rows) < k:
+            return None
+        return encode_cluster_analysis(cluster_team_seasons(rows, k))
+
+    return cluster_cache.get_or_compute((k, seasons, version), compute), False
+
+def force_kaggle_update(incremental=False, progress=NO_PROGRESS):
+    game_database = data_update_from_kaggle(
+        progress=progress, data_dir=os.path.join(db_folder_path, "temporary_kaggle_files")
+    )
+    update_decade_database(game_database, incremental=incremental, progress=progress)
+
+def install_artifact_update(progress=NO_PROGRESS):
+    """Swap in the latest published artifact, returns its manifest or None when already up to date"""
+    from nba_analytics.artifacts import open_object_store, install_latest_artifact
+
+    return install_latest_artifact(open_object_store(artifact_location), db_path, progress)
+
+def start_update_job(incremental=False, on_finish=None, profile=False):
+    """
+    Start an update in the background unless one is already running in any process.
+    With an artifact store configured the update installs the latest artifact, otherwise it
+    downloads and parses the Kaggle dataset.
+    Returns (job_id, created), where job_id identifies the already running job when created is False.
+    With profile set the whole update runs under cProfile, see instrumentation.profile_to.
+    """
+    if artifact_location:
+        kind, run = 'artifact-update', install_artifact_update
+    else:
+        kind, run = 'kaggle-update', lambda progress: force_kaggle_update(incremental=incremental, progress=progress)
+
+    def target(progress):
+        if not profile:
+            return run(progress)
+        with profile_to('update', wait=60) as profile_path:
+            try:
+                run(progress)
+            finally:
+                if profile_path is not None:
+                    print(f"Update profile written to {profile_path}")
+
+    return start_job(
+        job_store,
+        kind,
+        target,
+        options={'incremental': incremental},
+        on_finish=on_finish
+    )
+
+def update_decade_database(game_database, incremental=False, path=db_path, progress=NO_PROGRESS):
+    """
+    Parse the Kaggle 'game' table into the decade database.
+    In incremental mode only seasons whose source fingerprint changed are re-aggregated and upserted,
+    falling back to a full rebuild when no fingerprints are stored yet.
+    Returns the list of seasons that were written.
+    """
+    from nba_analytics.decade_parser import process_filter_db, parse_range_data, compute_season_fingerprints
+
+    with progress.stage('parse'):
+        range_dataframe, team_objects, season_dates = process_filter_db(game_database)
+        fingerprints = compute_season_fingerprints(range_dataframe, season_dates)
+        stored_fingerprints = load_season_fingerprints(path) if incremental else {}
+
+        if not stored_fingerprints:
+            changed_seasons, removed_seasons = None, []
+            changed_data = parse_range_data(range_dataframe, team_objects, season_dates, workers=parse_workers)
+        else:
+            changed_seasons = [season for season, fingerprint in fingerprints.items()
+                               if stored_fingerprints.get(season) != tuple(fingerprint)]
+            removed_seasons = [season for season in stored_fingerprints if season not in fingerprints]
+            changed_data = {}
+            if changed_seasons:
+                changed_data = parse_range_data(
+                    range_dataframe, team_objects, season_dates, seasons=changed_seasons, workers=parse_workers
+                )
+
+    with progress.stage('load'):
+        if changed_seasons is None:
+            load_data_to_db(changed_data, path, fingerprints)
+            return list(changed_data.keys())
+
+        if not changed_seasons and not removed_seasons:
+            print("All seasons are up to date")
+            return []
+
+        upsert_season_data(
+            changed_data,
+            {season: fingerprints[season] for season in changed_seasons},
+            path,
+            removed_seasons
+        )
+        return changed_seasons + removed_seasons
 
 def fetch_teams_in_year_data():
     return get_team_object()
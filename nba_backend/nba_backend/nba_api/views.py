@@ -1,56 +1,54 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
+from rest_framework.settings import api_settings
+from django.http import HttpResponse, StreamingHttpResponse
+from django.views import View
 from .utils.data_handler import (
     fetch_decade_data, 
-    force_kaggle_update, 
+    stream_decade_data,
+    start_update_job,
+    job_store,
     fetch_teams_in_year_data,
-    get_seasons_in_decade_data,
-    fetch_season_in_decade_data
+    fetch_season_list,
+    fetch_season_data,
+    fetch_season_summary,
+    fetch_conference_comparison,
+    fetch_cluster_analysis
 )
+from nba_analytics.db_utils import read_pool
+from nba_analytics.instrumentation import render_prometheus
+from .middleware import should_profile
+from .renderers import NDJSONRenderer
+from .response_cache import response_cache
 from .serializers import TeamStatsSerializer
 from .models import TeamStats, Season, Team
 from django.db import DatabaseError
 import asyncio
-import threading
-
-class AsyncUpdateManager:
-    _updating = False
-    
-    @classmethod
-    def is_updating(cls):
-        return cls._updating
-    
-    @classmethod
-    def set_updating(cls, state):
-        cls._updating = state
+import json
 
 class BaseAPIView(APIView):
-    def dispatch(self, request, *args, **kwargs):
-        if AsyncUpdateManager.is_updating() and not isinstance(self, UpdateDataView):
-            return Response(
-                {"error": "Database is currently updating. Please try again later."},
-                status=status.HTTP_503_SERVICE_UNAVAILABLE
-            )
-        return super().dispatch(request, *args, **kwargs)
+    # Updates are built in a shadow database and swapped in atomically,
+    # so every view keeps serving the previous data while one runs
+    pass
 
 class NBADataView(BaseAPIView):
+    renderer_classes = list(api_settings.DEFAULT_RENDERER_CLASSES) + [NDJSONRenderer]
+
     def get(self, request):
         try:
-            data, needs_update = fetch_decade_data()
+            streaming = request.accepted_renderer.format == NDJSONRenderer.format
+            if not streaming:
+                version, cached = response_cache.lookup(request, 'nba-data')
+                if cached is not None:
+                    return cached
+
+            data, needs_update = stream_decade_data() if streaming else fetch_decade_data()
             if needs_update:
-                # Start background update
-                def update_process():
-                    AsyncUpdateManager.set_updating(True)
-                    try:
-                        force_kaggle_update()
-                    finally:
-                        AsyncUpdateManager.set_updating(False)
-
-                threading.Thread(target=update_process).start()
-                
+                # Start a background update, or join the one already running in any worker
+                job_id, _ = start_update_job(on_finish=response_cache.invalidate)
                 return Response(
-                    {"error": "Data update in progress. Please try again later."},
+                    {"error": "Data update in progress. Please try again later.", "job_id": job_id},
                     status=status.HTTP_503_SERVICE_UNAVAILABLE
                 )
 
@@ -59,8 +57,16 @@ class NBADataView(BaseAPIView):
                     {"error": "No data available"},
                     status=status.HTTP_404_NOT_FOUND
                 )
+
+            if streaming:
+                # One line per season, written as soon as the cursor reaches the next season
+                lines = (
+                    json.dumps({"season": season_id, "teams": season_data}).encode() + b'\n'
+                    for season_id, season_data in data
+                )
+                return StreamingHttpResponse(lines, content_type=NDJSONRenderer.media_type)
                 
-            return Response(data)
+            return response_cache.store(request, 'nba-data', version, data.to_json())
         except Exception as e:
             return Response(
                 {'error': str(e)},
@@ -69,24 +75,28 @@ class NBADataView(BaseAPIView):
 
 class UpdateDataView(BaseAPIView):
     def post(self, request):
-        if AsyncUpdateManager.is_updating():
+        # Incremental updates only recompute seasons whose source games changed
+        mode = request.query_params.get('mode')
+        if mode is None:
+            if not isinstance(request.data, dict):
+                return Response(
+                    {"error": "The request body must be a JSON object"},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            mode = request.data.get('mode', '')
+        incremental = str(mode) == 'incremental'
+
+        job_id, created = start_update_job(
+            incremental=incremental, on_finish=response_cache.invalidate, profile=should_profile(request)
+        )
+        if not created:
             return Response(
-                {"error": "Update already in progress"},
+                {"error": "Update already in progress", "job_id": job_id},
                 status=status.HTTP_409_CONFLICT
             )
 
-        def update_process():
-            AsyncUpdateManager.set_updating(True)
-            try:
-                force_kaggle_update()
-            finally:
-                AsyncUpdateManager.set_updating(False)
-
-        # Start update in background
-        threading.Thread(target=update_process).start()
-
         return Response(
-            {'message': 'Update process started'},
+            {'message': 'Update process started', 'job_id': job_id},
             status=status.HTTP_202_ACCEPTED
         )
 
@@ -95,13 +105,17 @@ class TeamListView(BaseAPIView):
     # So no logic to check if the database is functioning is required
     def get(self, request):
         try:
+            version, cached = response_cache.lookup(request, 'team-list')
+            if cached is not None:
+                return cached
+
             teams = fetch_teams_in_year_data()
             if teams is None:
                 return Response(
                     {"error": "No team data available"},
                     status=status.HTTP_404_NOT_FOUND
                 )
-            return Response(teams)
+            return response_cache.store(request, 'team-list', version, teams)
         except Exception as e:
             return Response(
                 {'error': str(e)},
@@ -112,13 +126,16 @@ class SeasonListView(BaseAPIView):
     def get(self, request):
 
         try:
-            data, needs_update = fetch_decade_data()
+            version, cached = response_cache.lookup(request, 'season-list')
+            if cached is not None:
+                return cached
+
+            seasons, needs_update = fetch_season_list()
             if needs_update:
                 return Response(
                     {"error": "Data update in progress. Please try again later."},
                     status=status.HTTP_503_SERVICE_UNAVAILABLE
                 )
-            seasons = get_seasons_in_decade_data(data)
 
             if not seasons:
                 return Response(
@@ -126,7 +143,7 @@ class SeasonListView(BaseAPIView):
                     status=status.HTTP_404_NOT_FOUND
                 )
             
-            return Response(seasons)
+            return response_cache.store(request, 'season-list', version, seasons)
         except Exception as e:
             return Response(
                 {'error': str(e)},
@@ -137,28 +154,145 @@ class SeasonListView(BaseAPIView):
 class SeasonStatsView(BaseAPIView):
     def get(self, request, season_id):
         try:
-            data, needs_update = fetch_decade_data()
+            cache_key = f'season-stats:{season_id}'
+            version, cached = response_cache.lookup(request, cache_key)
+            if cached is not None:
+                return cached
+
+            stats, needs_update = fetch_season_data(season_id)
             if needs_update:
                 return Response(
                     {"error": "Data update in progress. Please try again later."},
                     status=status.HTTP_503_SERVICE_UNAVAILABLE
                 )
             
-            stats = fetch_season_in_decade_data(data, season_id)
             if stats is None:
                 return Response(
                     {"error": f"No data available for season {season_id}"},
                     status=status.HTTP_404_NOT_FOUND
                 )
-            return Response(stats)
+            return response_cache.store(request, cache_key, version, stats)
         except Exception as e:
             return Response(
                 {'error': str(e)},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
         
+class SeasonSummaryView(BaseAPIView):
+    # League and per-conference aggregates, read from the summary tables written at load time
+    def get(self, request, season_id):
+        try:
+            cache_key = f'season-summary:{season_id}'
+            version, cached = response_cache.lookup(request, cache_key)
+            if cached is not None:
+                return cached
+
+            summary, needs_update = fetch_season_summary(season_id)
+            if needs_update:
+                return Response(
+                    {"error": "Data update in progress. Please try again later."},
+                    status=status.HTTP_503_SERVICE_UNAVAILABLE
+                )
+
+            if summary is None:
+                return Response(
+                    {"error": f"No data available for season {season_id}"},
+                    status=status.HTTP_404_NOT_FOUND
+                )
+            return response_cache.store(request, cache_key, version, summary)
+        except Exception as e:
+            return Response(
+                {'error': str(e)},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+class ConferenceComparisonView(BaseAPIView):
+    # West-vs-East differences and Welch t-tests for every season, a few hundred bytes instead of /data/
+    def get(self, request):
+        try:
+            version, cached = response_cache.lookup(request, 'conference-comparison')
+            if cached is not None:
+                return cached
+
+            comparison, needs_update = fetch_conference_comparison()
+            if needs_update:
+                return Response(
+                    {"error": "Data update in progress. Please try again later."},
+                    status=status.HTTP_503_SERVICE_UNAVAILABLE
+                )
+
+            if not comparison['seasons']:
+                return Response(
+                    {"error": "No season data available"},
+                    status=status.HTTP_404_NOT_FOUND
+                )
+            return response_cache.store(request, 'conference-comparison', version, comparison)
+        except Exception as e:
+            return Response(
+                {'error': str(e)},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+class ClusterAnalysisView(BaseAPIView):
+    # k-means over relative offensive/defensive ratings, memoized per (k, seasons, data version)
+    def get(self, request):
+        # Imported here so only workers asked for clusters load numpy
+        from nba_analytics.clustering import DEFAULT_CLUSTERS, MAX_CLUSTERS
+
+        try:
+            k = int(request.query_params.get('k', DEFAULT_CLUSTERS))
+        except ValueError:
+            k = 0
+        if not 1 <= k <= MAX_CLUSTERS:
+            return Response(
+                {"error": f"k must be an integer between 1 and {MAX_CLUSTERS}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        seasons = [season for season in request.query_params.get('seasons', '').split(',') if season]
+
+        try:
+            body, needs_update = fetch_cluster_analysis(k, seasons)
+            if needs_update:
+                return Response(
+                    {"error": "Data update in progress. Please try again later."},
+                    status=status.HTTP_503_SERVICE_UNAVAILABLE
+                )
+
+            if body is None:
+                return Response(
+                    {"error": f"Not enough team-seasons to form {k} clusters"},
+                    status=status.HTTP_404_NOT_FOUND
+                )
+            return HttpResponse(body, content_type='application/json')
+        except Exception as e:
+            return Response(
+                {'error': str(e)},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
 class UpdateStatusView(BaseAPIView):
+    # Reports the requested job, or the most recent one, with per-stage progress and timings
     def get(self, request):
+        job_id = request.query_params.get('job_id')
+        job = job_store.get(job_id)
+        if job_id and job is None:
+            return Response(
+                {"error": f"No update job {job_id}"},
+                status=status.HTTP_404_NOT_FOUND
+            )
         return Response({
-            "updating": AsyncUpdateManager.is_updating()
-        })
\ No newline at end of file
+            "updating": job_store.is_running(),
+            "job": job
+        })
+
+class MetricsView(View):
+    # Stage, request and read pool metrics of this process in the Prometheus text format
+    def get(self, request):
+        pool = read_pool.metrics()
+        body = render_prometheus(extra=[
+            ('read_pool_hits_total', 'counter', "Pooled read connections reused", pool['hits']),
+            ('read_pool_misses_total', 'counter', "Pooled read connections opened", pool['misses']),
+            ('read_pool_wait_seconds_total', 'counter', "Time spent handing out read connections", pool['wait_seconds']),
+            ('update_running', 'gauge', "1 while a data update job is running", int(job_store.is_running())),
+        ])
+        return HttpResponse(body, content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -33,6 +33,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'nba_api.middleware.InstrumentationMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
@@ -125,4 +126,8 @@ SECRET_KEY = os.getenv('DJANGO_SECRET_KEY')
 # SECURITY WARNING: don't run with debug turned on in production!
 DEBUG = True
 
-ALLOWED_HOSTS = []
\ No newline at end of file
+ALLOWED_HOSTS = []
+
+# cProfile requests and update jobs: 'off', 'header' (requests sending X-Profile) or 'always'.
+# Profiles are written to NBA_PROFILE_DIR
+NBA_PROFILE = os.getenv('NBA_PROFILE', 'off')
@@ -17,9 +17,11 @@ Including another URLconf
 from django.contrib import admin
 from django.urls import path, include
 from django.views.generic import RedirectView
+from nba_api.views import MetricsView
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/', include('nba_api.urls')),
+    path('metrics', MetricsView.as_view(), name='metrics'),
     path('', RedirectView.as_view(url='api/', permanent=False)),
 ]
\ No newline at end of file
@@ -1,11 +1,17 @@
 import React from 'react';
 import { useQuery } from 'react-query';
 import { ScatterChart, Scatter, XAxis, YAxis, CartesianGrid, Tooltip, ResponsiveContainer, Legend } from 'recharts';
-import { fetchNBAData } from '../services/api';
+import { fetchClusterAnalysis } from '../services/api';
 import '../styles/analysis.css';
 
+const CLUSTER_COUNT = 4;
+const CLUSTER_COLORS = ['#2f855a', '#3182ce', '#d69e2e', '#e53e3e', '#805ad5', '#dd6b20', '#319795', '#d53f8c', '#718096', '#1a202c'];
+
 const ClusterAnalysis = () => {
-  const { data: nbaData, isLoading, error } = useQuery('nbaData', fetchNBAData);
+  const { data: clusters, isLoading, error } = useQuery(
+    ['clusterAnalysis', CLUSTER_COUNT],
+    () => fetchClusterAnalysis(CLUSTER_COUNT)
+  );
 
   if (isLoading) {
     return (
@@ -25,7 +31,7 @@ const ClusterAnalysis = () => {
     );
   }
 
-  if (!nbaData || Object.keys(nbaData).length === 0) {
+  if (!clusters || clusters.points.length === 0) {
     return (
       <div className="analysis-container">
         <div className="error">No data available</div>
@@ -33,25 +39,27 @@ const ClusterAnalysis = () => {
     );
   }
 
-  const processedData = Object.entries(nbaData).flatMap(([season, teams]) =>
-    teams.map(team => ({
-      name: team.team,
-      season,
-      conference: team.conference,
-      relativeOffensive: parseFloat(team.relative_offensive_rating),
-      relativeDefensive: -1 * parseFloat(team.relative_defensive_rating)
-    }))
-  );
+  // Clusters, centroids and extents come precomputed from the backend
+  const processedData = clusters.points.map(point => ({
+    name: point.team,
+    season: point.season,
+    conference: point.conference,
+    cluster: point.cluster,
+    relativeOffensive: point.relative_offensive_rating,
+    relativeDefensive: -1 * point.relative_defensive_rating
+  }));
 
-  const offensiveExtent = [
-    Math.floor(Math.min(...processedData.map(d => d.relativeOffensive))),
-    Math.ceil(Math.max(...processedData.map(d => d.relativeOffensive)))
-  ];
-  
-  const defensiveExtent = [
-    Math.floor(Math.min(...processedData.map(d => d.relativeDefensive))),
-    Math.ceil(Math.max(...processedData.map(d => d.relativeDefensive)))
-  ];
+  const centroids = clusters.centroids.map(centroid => ({
+    name: `Cluster ${centroid.cluster + 1} center`,
+    cluster: centroid.cluster,
+    size: centroid.size,
+    relativeOffensive: centroid.relative_offensive_rating,
+    relativeDefensive: -1 * centroid.relative_defensive_rating
+  }));
+
+  const offensiveExtent = clusters.extents.relative_offensive_rating;
+  const [defensiveLow, defensiveHigh] = clusters.extents.relative_defensive_rating;
+  const defensiveExtent = [-defensiveHigh, -defensiveLow];
 
   const tooltipStyle = {
     backgroundColor: '#fff',
@@ -97,11 +105,20 @@ const ClusterAnalysis = () => {
               content={({ payload }) => {
                 if (payload && payload.length) {
                   const data = payload[0].payload;
+                  if (data.season === undefined) {
+                    return (
+                      <div style={tooltipStyle}>
+                        <p style={{ fontWeight: 'bold', marginBottom: '8px' }}>{data.name}</p>
+                        <p>Team-seasons: {data.size}</p>
+                      </div>
+                    );
+                  }
                   return (
                     <div style={tooltipStyle}>
                       <p style={{ fontWeight: 'bold', marginBottom: '8px' }}>{data.name}</p>
                       <p style={{ marginBottom: '4px' }}>Season: {data.season}</p>
                       <p style={{ marginBottom: '4px' }}>Conference: {data.conference}</p>
+                      <p style={{ marginBottom: '4px' }}>Cluster: {data.cluster + 1}</p>
                       <p style={{ marginBottom: '4px' }}>Relative Off. Rating: {data.relativeOffensive.toFixed(2)}</p>
                       <p>Relative Def. Rating: {data.relativeDefensive.toFixed(2)}</p>
                     </div>
@@ -111,21 +128,26 @@ const ClusterAnalysis = () => {
               }}
             />
             <Legend />
+            {clusters.centroids.map(centroid => (
+              <Scatter
+                key={centroid.cluster}
+                name={`Cluster ${centroid.cluster + 1}`}
+                data={processedData.filter(d => d.cluster === centroid.cluster)}
+                fill={CLUSTER_COLORS[centroid.cluster % CLUSTER_COLORS.length]}
+              />
+            ))}
             <Scatter
-              name="Western Conference"
-              data={processedData.filter(d => d.conference === 'Western')}
-              fill="#3182ce"
-            />
-            <Scatter
-              name="Eastern Conference"
-              data={processedData.filter(d => d.conference === 'Eastern')}
-              fill="#e53e3e"
+              name="Cluster Centers"
+              data={centroids}
+              fill="#1a202c"
+              shape="cross"
             />
           </ScatterChart>
         </ResponsiveContainer>
       </div>
       <div style={{ paddingTop: '4rem' }}>
         <p>* Each point represents a team's relative performance in a specific season</p>
+        <p>* Colors are k-means clusters ({clusters.k}), numbered from the best relative net rating down</p>
         <p>* Higher offensive rating and lower defensive rating indicate better performance</p>
         <p>* Defensive Rating is Inverted for Scatterplot Inutivity</p>
       </div>
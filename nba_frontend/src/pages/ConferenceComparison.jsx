@@ -1,21 +1,29 @@
 import React from 'react';
 import { useQuery } from 'react-query';
-import { fetchNBAData } from '../services/api';
-import { calculateStats } from '../utils/statistics';
+import { fetchConferenceComparison } from '../services/api';
 import '../styles/comparison.css';
 
 const ConferenceComparison = () => {
-  const { data: nbaData, isLoading, error } = useQuery('nbaData', fetchNBAData);
+  const { data: comparison, isLoading, error } = useQuery('conferenceComparison', fetchConferenceComparison);
 
   if (isLoading) return <div className="loading">Loading data...</div>;
   if (error) return <div className="error">Error loading data: {error.message}</div>;
 
-  const seasons = Object.keys(nbaData);
+  // Differences and Welch t-test p-values are computed server-side for every season;
+  // both are null when a season could not be tested, so keep them null here
+  const seasons = comparison.seasons.map(season => season.season);
   const metrics = ['Offensive Rating', 'Defensive Rating', 'Net Rating'];
-  const data = seasons.map(season => calculateStats(nbaData[season]));
+  const data = comparison.seasons.map(season =>
+    comparison.metrics.map(metric => ({
+      diff: season.metrics[metric].diff ?? null,
+      pValue: season.metrics[metric].p_value ?? null
+    }))
+  );
 
   // Function to format the cell value based on metric type
   const formatCellValue = (value, metricIndex) => {
+    if (value === null) return 'n/a';
+
     // For defensive rating (index 1), invert the sign since lower is better
     const adjustedValue = metricIndex === 1 ? -value : value;
     return `${adjustedValue > 0 ? '+' : ''}${adjustedValue.toFixed(2)}`;
@@ -23,7 +31,7 @@ const ConferenceComparison = () => {
 
   // Function to determine cell class based on metric type
   const getCellClass = (cellData, metricIndex) => {
-    if (cellData.pValue >= 0.05) return '';
+    if (cellData.diff === null || cellData.pValue === null || cellData.pValue >= 0.05) return '';
     
     // For defensive rating (index 1), invert the logic since lower is better
     if (metricIndex === 1) {
@@ -58,4 +58,26 @@ export const fetchSeasonStats = async (seasonId) => {
     }
 };
 
+export const fetchConferenceComparison = async () => {
+    try {
+        const { data } = await api.get('/stats/conference-comparison/');
+        return data;
+    } catch (error) {
+        console.error('Error fetching conference comparison:', error);
+        throw error;
+    }
+};
+
+export const fetchClusterAnalysis = async (k = 4, seasons = []) => {
+    try {
+        const params = { k };
+        if (seasons.length) params.seasons = seasons.join(',');
+        const { data } = await api.get('/clusters/', { params });
+        return data;
+    } catch (error) {
+        console.error('Error fetching cluster analysis:', error);
+        throw error;
+    }
+};
+
 export default api;
\ No newline at end of file